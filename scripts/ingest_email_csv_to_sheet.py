@@ -160,18 +160,23 @@ class ProcessedEmail:
     timestamp: datetime
 
 
-async def fetch_csvs(env: dict[str, str], logger: logging.Logger) -> list[ProcessedEmail]:
+def build_email_service(env: dict[str, str]) -> EmailIntegrationService:
     download_dir = Path(env["CSV_DOWNLOAD_DIR"])
     download_dir.mkdir(parents=True, exist_ok=True)
 
-    service = EmailIntegrationService(
+    return EmailIntegrationService(
         imap_server=env["EMAIL_IMAP_SERVER"],
         imap_port=as_int(env["EMAIL_IMAP_PORT"], 993),
         email_address=env["EMAIL_ADDRESS"],
         email_password=env["EMAIL_PASSWORD"],
         download_dir=download_dir,
+        consumer="sheet_ingest",
     )
 
+
+async def fetch_csvs(
+    service: EmailIntegrationService, env: dict[str, str], logger: logging.Logger
+) -> list[ProcessedEmail]:
     if not await service.connect():
         raise RuntimeError("Failed to connect to IMAP server")
 
@@ -182,17 +187,16 @@ async def fetch_csvs(env: dict[str, str], logger: logging.Logger) -> list[Proces
         csvs = await service.check_for_new_csvs(since_date=since_date)
         processed: list[ProcessedEmail] = []
         for csv_meta in csvs:
-            batch_id = csv_meta["batch_id"]
-            file_path = Path(csv_meta["file_path"])
-            timestamp = csv_meta["timestamp"]
-            email_id = csv_meta.get("email_id", "")
+            batch_id = csv_meta.batch_id
+            file_path = csv_meta.file_path
+            timestamp = csv_meta.timestamp
+            email_id = csv_meta.email_id or ""
             processed.append(ProcessedEmail(email_id=email_id, csv_path=file_path, batch_id=batch_id, timestamp=timestamp))
-            # prevent duplicate handling within single run
-            service.monitor.mark_processed(batch_id)
         logger.info("Downloaded %d CSV attachment(s)", len(processed))
         return processed
     finally:
         service.disconnect()
+        service.pool.close()
 
 
 def select_latest(processed_csvs: list[ProcessedEmail]) -> ProcessedEmail | None:
@@ -205,8 +209,16 @@ async def main() -> None:
     env = get_env()
     logger = setup_logger()
 
+    service = build_email_service(env)
+    try:
+        await ingest(service, env, logger)
+    finally:
+        service.close()
+
+
+async def ingest(service: EmailIntegrationService, env: dict[str, str], logger: logging.Logger) -> None:
     try:
-        processed_csvs = await fetch_csvs(env, logger)
+        processed_csvs = await fetch_csvs(service, env, logger)
     except Exception as exc:  # noqa: BLE001
         logger.exception("Email fetch failed: %s", exc)
         raise SystemExit(1) from exc
@@ -249,6 +261,11 @@ async def main() -> None:
         logger.exception("Failed to update sheet: %s", exc)
         raise SystemExit(1) from exc
 
+    # Only a successful sheet update settles the batches; the latest one
+    # replaced the sheet, so the older ones in this run are superseded
+    for csv_meta in processed_csvs:
+        service.monitor.mark_processed(csv_meta.batch_id)
+
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -554,14 +554,17 @@ async def process_rows(
     outcomes: list[RowOutcome] = []
     processed = 0
 
-    for task in asyncio.as_completed(tasks):
-        result = await task
-        processed += 1
-        if result:
-            outcomes.append(result)
-
-        if processed % 100 == 0:
-            logger.info("Processed %d/%d rows", processed, total_rows)
+    try:
+        for task in asyncio.as_completed(tasks):
+            result = await task
+            processed += 1
+            if result:
+                outcomes.append(result)
+
+            if processed % 100 == 0:
+                logger.info("Processed %d/%d rows", processed, total_rows)
+    finally:
+        await outbound.close()
 
     logger.info("Completed processing %d rows (%d outcomes to persist)", processed, len(outcomes))
 
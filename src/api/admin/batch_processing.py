@@ -104,10 +104,12 @@ async def check_email_for_csvs(
         imap_port=settings.email_imap_port,
         email_address=settings.email_address,
         email_password=settings.email_password,
-        download_dir=csv_download_dir
+        download_dir=csv_download_dir,
+        consumer="batch_processing"
     )
     
     batches_processed = []
+    processed_email_ids = []
     errors = []
     csv_files_found = 0
     csv_files_processed = 0
@@ -135,13 +137,14 @@ async def check_email_for_csvs(
         
         # Process each CSV file
         for csv_file_info in csv_files:
-            batch_id = csv_file_info["batch_id"]
-            file_path = csv_file_info["file_path"]
+            batch_id = csv_file_info.batch_id
+            file_path = csv_file_info.file_path
             
             try:
                 # Check if batch already processed (via database)
                 if orchestrator.db.is_batch_processed(batch_id):
                     logger.info("batch_already_processed", batch_id=batch_id)
+                    email_service.monitor.mark_processed(batch_id)
                     continue
                 
                 # Process CSV
@@ -149,13 +152,14 @@ async def check_email_for_csvs(
                 result = await orchestrator.process_batch_csv(file_path, batch_id)
                 
                 if result.get("success"):
+                    # Failed batches stay unmarked and are found again next check
+                    email_service.monitor.mark_processed(batch_id)
                     batches_processed.append(batch_id)
                     csv_files_processed += 1
                     
-                    # Mark email as read (optional)
-                    email_id = csv_file_info.get("email_id")
-                    if email_id:
-                        await email_service.mark_email_read(email_id, folder)
+                    # Mark email as read once all batches are done (optional)
+                    if csv_file_info.email_id:
+                        processed_email_ids.append(csv_file_info.email_id)
                     
                     logger.info("csv_processed_successfully", batch_id=batch_id)
                 else:
@@ -166,8 +170,10 @@ async def check_email_for_csvs(
                 logger.error("csv_processing_error", batch_id=batch_id, error=str(e), exc_info=True)
                 errors.append(error_msg)
         
-        # Disconnect from email
-        email_service.disconnect()
+        await email_service.mark_emails_read(processed_email_ids, folder)
+        
+        # Disconnect from email and release the processed-batches database
+        email_service.close()
         
         return EmailCheckResponse(
             success=True,
@@ -179,7 +185,7 @@ async def check_email_for_csvs(
         )
     
     except Exception as e:
-        email_service.disconnect()
+        email_service.close()
         logger.error("email_check_failed", error=str(e), exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -295,6 +301,7 @@ async def process_single_customer(
     customer_phone: str = Form(..., description="Customer phone (E.164 format)"),
     delivery_id: Optional[str] = Form(None, description="Delivery ID (optional)"),
     is_repeat_decline: bool = Form(False, description="Is this a repeat decline?"),
+    batch_id: Optional[str] = Form(None, description="Batch the decline belongs to (optional)"),
     fontis: FontisClient = Depends(get_fontis_client),
     _: str = Depends(verify_api_key)
 ):
@@ -302,7 +309,9 @@ async def process_single_customer(
     Process outreach for a single customer.
     
     Calculates priority and triggers appropriate outreach (call/SMS/email)
-    based on current account status and delivery schedule.
+    based on current account status and delivery schedule. Calls and SMS
+    are recorded in outreach history (under batch "unknown" without a
+    batch_id); a customer who has already paid is marked resolved.
     """
     logger.info("processing_single_customer", customer_id=customer_id)
     
@@ -315,8 +324,9 @@ async def process_single_customer(
             customer_name=customer_name,
             customer_phone=customer_phone,
             is_repeat_decline=is_repeat_decline,
-            batch_id=None
+            batch_id=batch_id
         )
+        orchestrator.record_outreach_result(customer_id, batch_id or "unknown", result)
         
         return {
             "success": True,
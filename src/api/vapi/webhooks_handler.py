@@ -9,6 +9,8 @@ to the appropriate internal tool endpoints. It provides:
 - Response formatting for Vapi
 """
 
+from collections import Counter
+from collections.abc import Awaitable, Callable
 from datetime import datetime
 from typing import Any
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request, Request as FastAPIRequest
@@ -18,6 +20,8 @@ from src.core.deps import get_fontis_client
 from src.services.fontis_client import FontisClient
 from src.services.outbound_call_service import get_outbound_service
 from src.core.exceptions import FontisAPIError
+from src.core.security import verify_api_key
+from src.schemas.tools import validate_tool_call
 from src.schemas.vapi import VapiFunctionCall, VapiWebhookEvent
 from src.services.outbound_tracking_service import OutboundTrackingService
 from src.services.twilio_service import TwilioService
@@ -33,6 +37,9 @@ router = APIRouter(prefix="/vapi", tags=["vapi"])
 # In-memory call context store (replace with Redis in production)
 call_contexts: dict[str, dict[str, Any]] = {}
 
+# Per-process dispatch counts by function name, used to find the hot tools
+function_call_counts: Counter[str] = Counter()
+
 
 @router.get("/webhooks/test")
 async def test_webhook_endpoint():
@@ -43,6 +50,17 @@ async def test_webhook_endpoint():
         "endpoint": "/vapi/webhooks",
         "timestamp": datetime.utcnow().isoformat()
     }
+
+
+@router.get("/function-calls/stats", dependencies=[Depends(verify_api_key)])
+async def function_call_stats():
+    """Return function-call dispatch counts since process start, busiest first."""
+    return {
+        "total": sum(function_call_counts.values()),
+        "functions": dict(function_call_counts.most_common())
+    }
+
+
 def store_call_context(call_id: str, key: str, value: Any) -> None:
     """Store context data for a call session."""
     if call_id not in call_contexts:
@@ -87,7 +105,7 @@ async def handle_vapi_webhook(
     
     # Try to parse as VapiWebhookEvent, but handle gracefully if it fails
     try:
-        event = VapiWebhookEvent(**body)
+        event = VapiWebhookEvent.model_validate(body)
     except Exception as event_parse_err:
         logger.warning("webhook_event_parse_failed", error=str(event_parse_err), body=body)
         # Create a fallback event object from raw body
@@ -231,7 +249,7 @@ async def handle_vapi_webhook(
             background_tasks.add_task(clear_call_context, call_id)
         return {"success": True, "message": "Call ended"}
     
-    elif event_type in ["transcript", "speech-update"]:
+    elif event_type in ("transcript", "speech-update"):
         # Log transcript for debugging
         logger.debug(
             "transcript_received",
@@ -345,150 +363,17 @@ async def route_function_call(
     Route function call to appropriate internal tool endpoint.
     
     This acts as a dispatcher, matching Vapi function names to your
-    internal FastAPI tool endpoints.
+    internal FastAPI tool endpoints via a single FUNCTION_HANDLERS lookup
+    and one validation call through the cached TOOL_MODELS adapter.
     """
-    
-    # Customer tools
-    if function_name == "customer_search":
-        from src.schemas.tools import CustomerSearchTool
-        params = CustomerSearchTool(**parameters)
-        return await customer_search_handler(params, fontis)
-    
-    elif function_name == "customer_details":
-        from src.schemas.tools import CustomerDetailsTool
-        params = CustomerDetailsTool(**parameters)
-        return await customer_details_handler(params, fontis)
-    
-    elif function_name == "finance_info":
-        from src.schemas.tools import FinanceDeliveryInfoTool
-        params = FinanceDeliveryInfoTool(**parameters)
-        return await finance_info_handler(params, fontis)
-    
-    # Delivery tools
-    elif function_name == "delivery_stops":
-        from src.schemas.tools import DeliveryStopsTool
-        params = DeliveryStopsTool(**parameters)
-        return await delivery_stops_handler(params, fontis)
-    
-    elif function_name == "next_delivery":
-        from src.schemas.tools import NextScheduledDeliveryTool
-        params = NextScheduledDeliveryTool(**parameters)
-        return await next_delivery_handler(params, fontis)
-    
-    elif function_name == "default_products":
-        from src.schemas.tools import DefaultProductsTool
-        params = DefaultProductsTool(**parameters)
-        return await default_products_handler(params, fontis)
-    
-    elif function_name == "delivery_summary":
-        from src.schemas.tools import DeliverySummaryTool
-        from src.api.tools.delivery import get_delivery_summary
-        params = DeliverySummaryTool(**parameters)
-        return await get_delivery_summary(params, fontis)
-    
-    elif function_name == "delivery_schedule":
-        from src.schemas.tools import DeliveryScheduleTool
-        from src.api.tools.delivery import get_delivery_schedule
-        params = DeliveryScheduleTool(**parameters)
-        return await get_delivery_schedule(params, fontis)
-    
-    elif function_name == "work_order_status":
-        from src.schemas.tools import WorkOrderStatusTool
-        from src.api.tools.delivery import get_work_order_status
-        params = WorkOrderStatusTool(**parameters)
-        return await get_work_order_status(params, fontis)
-    
-    elif function_name == "pricing_breakdown":
-        from src.schemas.tools import PricingBreakdownTool
-        from src.api.tools.delivery import get_pricing_breakdown
-        params = PricingBreakdownTool(**parameters)
-        return await get_pricing_breakdown(params, fontis)
-    
-    elif function_name == "order_change_status":
-        from src.schemas.tools import OrderChangeStatusTool
-        from src.api.tools.delivery import get_order_change_status
-        params = OrderChangeStatusTool(**parameters)
-        return await get_order_change_status(params, fontis)
-    
-    elif function_name == "orders_search":
-        from src.schemas.tools import OrdersSearchTool
-        params = OrdersSearchTool(**parameters)
-        return await orders_search_handler(params, fontis)
-    
-    # Billing tools
-    elif function_name == "account_balance":
-        from src.schemas.tools import AccountBalanceTool
-        params = AccountBalanceTool(**parameters)
-        return await account_balance_handler(params, fontis)
-    
-    elif function_name == "invoice_history":
-        from src.schemas.tools import InvoiceHistoryTool
-        params = InvoiceHistoryTool(**parameters)
-        return await invoice_history_handler(params, fontis)
-    
-    elif function_name == "invoice_detail":
-        from src.schemas.tools import InvoiceDetailTool
-        params = InvoiceDetailTool(**parameters)
-        return await invoice_detail_handler(params, fontis)
-    
-    elif function_name == "payment_methods":
-        from src.schemas.tools import BillingMethodsTool
-        params = BillingMethodsTool(**parameters)
-        return await payment_methods_handler(params, fontis)
-    
-    elif function_name == "payment_expiry_alerts":
-        from src.schemas.tools import PaymentExpiryAlertTool
-        from src.api.tools.billing import get_payment_expiry_alerts
-        params = PaymentExpiryAlertTool(**parameters)
-        return await get_payment_expiry_alerts(params, fontis)
-    
-    elif function_name == "products_catalog" or function_name == "products":
-        from src.schemas.tools import ProductsTool
-        params = ProductsTool(**parameters)
-        return await products_catalog_handler(params, fontis)
-    
-    # Contract tools
-    elif function_name == "customer_contracts":
-        from src.schemas.tools import ContractsTool
-        params = ContractsTool(**parameters)
-        return await customer_contracts_handler(params, fontis)
-    
-    # Route tools
-    elif function_name == "route_stops":
-        from src.schemas.tools import RouteStopsTool
-        params = RouteStopsTool(**parameters)
-        return await route_stops_handler(params, fontis)
-    
-    # Onboarding tools (JotForm)
-    elif function_name == "send_contract":
-        from src.schemas.tools import SendContractTool
-        params = SendContractTool(**parameters)
-        return await send_contract_handler(params)
-    
-    elif function_name == "contract_status":
-        from src.schemas.tools import ContractStatusTool
-        params = ContractStatusTool(**parameters)
-        return await contract_status_handler(params)
-
-    # Outbound call tools
-    elif function_name == "declined_payment_call":
-        from src.schemas.tools import DeclinedPaymentCallTool
-        params = DeclinedPaymentCallTool(**parameters)
-        return await declined_payment_call_handler(params)
-
-    elif function_name == "collections_call":
-        from src.schemas.tools import CollectionsCallTool
-        params = CollectionsCallTool(**parameters)
-        return await collections_call_handler(params)
-
-    elif function_name == "delivery_reminder_call":
-        from src.schemas.tools import DeliveryReminderCallTool
-        params = DeliveryReminderCallTool(**parameters)
-        return await delivery_reminder_call_handler(params)
-    
-    else:
+    handler = FUNCTION_HANDLERS.get(function_name)
+    if handler is None:
         raise ValueError(f"Unknown function: {function_name}")
 
+    function_call_counts[function_name] += 1
+    params = validate_tool_call(function_name, parameters)
+    return await handler(params, fontis)
+
 
 # Individual tool handlers (simplified wrappers around your existing tools)
 
@@ -1318,3 +1203,42 @@ async def delivery_reminder_call_handler(params) -> dict[str, Any]:
         "message": f"Delivery reminder call initiated to {params.customer_name}"
     }
 
+
+# Vapi function name -> handler; parameter models live in TOOL_MODELS.
+# Handlers that do not talk to Fontis are wrapped so every route shares
+# one call signature.
+FUNCTION_HANDLERS: dict[str, Callable[[Any, FontisClient], Awaitable[dict[str, Any]]]] = {
+    # Customer tools
+    "customer_search": customer_search_handler,
+    "customer_details": customer_details_handler,
+    "finance_info": finance_info_handler,
+    # Delivery tools
+    "delivery_stops": delivery_stops_handler,
+    "next_delivery": next_delivery_handler,
+    "default_products": default_products_handler,
+    "delivery_summary": delivery.get_delivery_summary,
+    "delivery_schedule": delivery.get_delivery_schedule,
+    "work_order_status": delivery.get_work_order_status,
+    "pricing_breakdown": delivery.get_pricing_breakdown,
+    "order_change_status": delivery.get_order_change_status,
+    "orders_search": orders_search_handler,
+    # Billing tools
+    "account_balance": account_balance_handler,
+    "invoice_history": invoice_history_handler,
+    "invoice_detail": invoice_detail_handler,
+    "payment_methods": payment_methods_handler,
+    "payment_expiry_alerts": billing.get_payment_expiry_alerts,
+    "products_catalog": products_catalog_handler,
+    "products": products_catalog_handler,
+    # Contract tools
+    "customer_contracts": customer_contracts_handler,
+    # Route tools
+    "route_stops": route_stops_handler,
+    # Onboarding tools (JotForm)
+    "send_contract": lambda params, _fontis: send_contract_handler(params),
+    "contract_status": lambda params, _fontis: contract_status_handler(params),
+    # Outbound call tools
+    "declined_payment_call": lambda params, _fontis: declined_payment_call_handler(params),
+    "collections_call": lambda params, _fontis: collections_call_handler(params),
+    "delivery_reminder_call": lambda params, _fontis: delivery_reminder_call_handler(params),
+}
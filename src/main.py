@@ -31,6 +31,9 @@ from src.api.tools import billing, contracts, customer, delivery, onboarding, ro
 from src.config import settings
 from src.core.deps import close_fontis_client
 from src.core.exceptions import FontisAPIError, JotFormError, VapiError
+from src.services.batch_database import close_batch_database
+from src.services.email_integration import close_imap_pools
+from src.services.outbound_call_service import close_outbound_service
 
 # ===== Structured Logging Configuration =====
 
@@ -91,6 +94,9 @@ async def lifespan(app: FastAPI):
     # ===== Shutdown =====
     logger.info("application_shutting_down")
     await close_fontis_client()
+    await close_outbound_service()
+    close_imap_pools()
+    close_batch_database()
     logger.info("shutdown_complete")
 
 
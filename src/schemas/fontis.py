@@ -235,7 +235,7 @@ class CustomerInfo(BaseModel):
     master: str
     majorAccountCode: str = ""
     lastPayment: LastPayment
-    creditFlags: list[str] = []
+    creditFlags: list[str] = Field(default_factory=list)
     hasPastDue: bool
     formattedCurrentBalance: str
     formattedPastDue: str
@@ -263,8 +263,8 @@ class DeliveryInfo(BaseModel):
     schedulingSubArea: str = ""
     alertMessage: str = ""
     tankInformation: str = ""
-    stopImages: list[str] = []
-    equipment: list[dict[str, Any]] = []
+    stopImages: list[str] = Field(default_factory=list)
+    equipment: list[dict[str, Any]] = Field(default_factory=list)
     hasScheduledDeliveries: bool
 
 
@@ -309,7 +309,7 @@ class WebClassification(BaseModel):
     id: str = ""
     description: str = ""
     displayLevel: int = 0
-    displayOrder: list[int] = []
+    displayOrder: list[int] = Field(default_factory=list)
     parent: str = ""
 
 
@@ -363,9 +363,9 @@ class Product(BaseModel):
     productClass: str = ""
     internet: bool = False
     webClassification: WebClassification | None = None
-    relatedCodes: list[str] = []
+    relatedCodes: list[str] = Field(default_factory=list)
     depositType: str = ""
-    depositProductList: list[str] = []
+    depositProductList: list[str] = Field(default_factory=list)
     depositProduct: str = ""
     taxCategory: str = ""
     allowGratis: bool = False
@@ -373,7 +373,7 @@ class Product(BaseModel):
     quantityOnHand: int = 0
     quantityAtWarehouse: int = 0
     recurring: bool = False
-    branchBlackList: list[str] = []
+    branchBlackList: list[str] = Field(default_factory=list)
     defaultPrice: float = 0
     webSpecial: bool = False
     banner: ProductBanner | None = None
@@ -429,7 +429,7 @@ class ContractDocument(BaseModel):
     DocumentGuid: str
     DocumentDate: str | None = None
     FromEmail: str = ""
-    ToEmails: list[str] = []
+    ToEmails: list[str] = Field(default_factory=list)
     DocumentComplete: bool = False
 
 
@@ -454,8 +454,8 @@ class Contract(BaseModel):
     UnitsUsed: int = 0
     MonthlyPayments: float = 0
     GallonsType: int = 0
-    Equipment: list[dict[str, Any]] = []
-    Documents: list[ContractDocument] = []
+    Equipment: list[dict[str, Any]] = Field(default_factory=list)
+    Documents: list[ContractDocument] = Field(default_factory=list)
 
 
 class ContractsResponse(BaseModel):
@@ -575,7 +575,7 @@ class InvoiceDetail(BaseModel):
     SigneeName: str = ""
     PurchaseOrderNumber: str = ""
     InvoiceDetails: list[InvoiceDetailItem]
-    InvoicePayments: list[dict[str, Any]] = []
+    InvoicePayments: list[dict[str, Any]] = Field(default_factory=list)
 
 
 class InvoiceDetailResponse(BaseModel):
@@ -616,7 +616,7 @@ class DeliveryOrder(BaseModel):
     Branch: str
     Route: str
     Products: list[OrderProduct]
-    Equipment: list[dict[str, Any]] = []
+    Equipment: list[dict[str, Any]] = Field(default_factory=list)
     WebCoupon: dict[str, Any] | None = None
     ExactType: int = 0
     ExactDate: str = ""
@@ -6,49 +6,189 @@ Each tool corresponds to a Vapi function that can be called
 during voice conversations.
 
 Design decisions:
-- Use Field aliases for flexible parameter names (camelCase/snake_case)
+- camelCase validation aliases with snake_case fallbacks (AliasChoices),
+  generated once per field by AliasedModel's alias generator, so
+  pydantic-core resolves each field without a separate populate_by_name pass
+- camelCase serialization aliases for payloads echoed back to Vapi
 - Comprehensive descriptions for Vapi function definitions
 - Type validation at API boundary
 """
 
 import re
-from typing import Any
+from dataclasses import field
+from datetime import date
+from functools import lru_cache
+from typing import Annotated, Any, Literal
 
-from pydantic import BaseModel, ConfigDict, Field, model_validator
+from pydantic import (
+    AliasChoices,
+    AliasGenerator,
+    BaseModel,
+    BeforeValidator,
+    ConfigDict,
+    EmailStr,
+    Field,
+    TypeAdapter,
+)
+from pydantic.alias_generators import to_camel
+from pydantic.dataclasses import dataclass
+from typing_extensions import NotRequired, TypedDict
 
+_NON_DIGITS_RE = re.compile(r"\D")
 
-class ToolParameter(BaseModel):
-    """Tool parameter definition for Vapi function schemas."""
+
+class ToolParameter(TypedDict):
+    """
+    Tool parameter definition for Vapi function schemas.
+    
+    Plain dict shape (no model instance); validate untrusted input with
+    TOOL_PARAMETER_ADAPTER.
+    """
     type: str
     description: str
-    enum: list[str] | None = None
-    required: bool = False
+    enum: NotRequired[list[str] | None]
+    required: NotRequired[bool]
+
+
+TOOL_PARAMETER_ADAPTER: TypeAdapter[ToolParameter] = TypeAdapter(ToolParameter)
+
 
+# Template for ToolDefinition.function. Instances receive a shallow copy, so
+# the nested "parameters" dict is shared: overwrite it, don't mutate it.
+_EMPTY_FUNCTION_SCHEMA: dict[str, Any] = {
+    "name": "",
+    "description": "",
+    "parameters": {
+        "type": "object",
+        "properties": {},
+        "required": []
+    }
+}
 
-class ToolDefinition(BaseModel):
+
+@dataclass(frozen=True, slots=True)
+class ToolDefinition:
     """
     Vapi tool/function definition schema.
     
-    Used to register functions with Vapi assistant.
-    """
-    type: str = "function"
-    function: dict[str, Any] = Field(
-        default_factory=lambda: {
-            "name": "",
-            "description": "",
-            "parameters": {
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
-        }
+    Used to register functions with Vapi assistant. A slotted, frozen
+    pydantic dataclass: validated on construction, no per-instance
+    ``__dict__``; serialize with ``dataclasses.asdict``.
+    """
+    type: Literal["function"] = "function"
+    function: dict[str, Any] = field(default_factory=_EMPTY_FUNCTION_SCHEMA.copy)
+
+
+# ===== Shared Field Declarations =====
+# One FieldInfo per recurring parameter; pydantic copies it into each model,
+# so the description literals are declared (and interned) once.
+
+CUSTOMER_ID_FIELD = Field(
+    ...,
+    description="Customer account number"
+)
+DELIVERY_ID_FIELD = Field(
+    ...,
+    description="Delivery stop ID (from get_delivery_stops)"
+)
+OPTIONAL_DELIVERY_ID_FIELD = Field(
+    default=None,
+    description="Delivery stop ID (optional, resolved automatically when omitted)"
+)
+OFFSET_FIELD = Field(
+    default=0,
+    ge=0,
+    description="Pagination offset"
+)
+TAKE_FIELD = Field(
+    default=25,
+    ge=1,
+    le=100,
+    description="Number of results to return (max 100)"
+)
+
+
+def _camel_or_snake(name: str) -> AliasChoices | str:
+    """Accept the camelCase key Vapi sends, falling back to the field name."""
+    camel = to_camel(name)
+    return AliasChoices(camel, name) if camel != name else name
+
+
+class AliasedModel(BaseModel):
+    """
+    Shared base for tool parameter models.
+    
+    The alias generator gives every field a camelCase/snake_case
+    ``AliasChoices`` validation alias and a camelCase serialization alias
+    at class creation, so fields carry no per-field ``alias`` kwargs and no
+    ``populate_by_name`` fallback is configured here. Tool parameters are read-only once
+    validated, so instances are frozen and never re-validated (copied)
+    when nested in another model. Core schemas are built on first use
+    (``defer_build``) so importing this module does not compile validators
+    for tools a process never calls.
+    
+    Keep this a direct ``BaseModel`` child with no mixins, custom
+    ``__init_subclass__`` or pydantic validator decorators: anything defined
+    here is re-collected by pydantic for every tool subclass.
+    """
+
+    model_config = ConfigDict(
+        alias_generator=AliasGenerator(
+            validation_alias=_camel_or_snake,
+            serialization_alias=to_camel,
+        ),
+        frozen=True,
+        revalidate_instances="never",
+        defer_build=True,
     )
 
+    @classmethod
+    def from_trusted(cls, data: dict[str, Any]) -> "AliasedModel":
+        """
+        Build an instance from data that has already been validated.
+
+        Skips pydantic-core validation via ``model_construct``. Only use for
+        payloads produced by this app (cache hydration, re-forwarding a
+        validated request); external request bodies must still go through
+        ``model_validate`` or ``tool_adapter``.
+        """
+        return cls.model_construct(**data)
+
+
+# ===== Shared Parameter Bases =====
+
+
+class CustomerRef(AliasedModel):
+    """Base for tools keyed by a single customer account."""
+    customer_id: str = CUSTOMER_ID_FIELD
+
+
+class CustomerOptionalDeliveryRef(CustomerRef):
+    """Base for tools that resolve the delivery stop when it is omitted."""
+    delivery_id: str | None = OPTIONAL_DELIVERY_ID_FIELD
+
+
+class CustomerDeliveryRef(CustomerRef):
+    """
+    Canonical (customerId, deliveryId) parameter pair.
+    
+    Shared by every tool that only needs a customer and delivery stop, so
+    a single core schema serves all of them:
+    - Tool ID: 92e47d19800cfe7724e27d11b0ec4f1a (next delivery)
+    - Tool ID: f24e6d2bc336153c076f0220b45f86b6 (default products)
+    - Tool ID: 13e223880330066e44c1f2119c0c5aba (contracts)
+    
+    Endpoints:
+    - POST /tools/delivery/default-products
+    - POST /tools/contracts/get-contracts
+    """
+    delivery_id: str = DELIVERY_ID_FIELD
+
 
 # ===== Customer Tool Parameters =====
 
 
-class CustomerSearchTool(BaseModel):
+class CustomerSearchTool(AliasedModel):
     """
     Parameters for customer search tool.
     
@@ -62,22 +202,11 @@ class CustomerSearchTool(BaseModel):
         min_length=1,
         description="Customer name, address, phone, or account number to search for"
     )
-    offset: int = Field(
-        default=0,
-        ge=0,
-        description="Pagination offset"
-    )
-    take: int = Field(
-        default=25,
-        ge=1,
-        le=100,
-        description="Number of results to return (max 100)"
-    )
-    
-    model_config = ConfigDict(populate_by_name=True)
+    offset: int = OFFSET_FIELD
+    take: int = TAKE_FIELD
 
 
-class CustomerSearchCompatTool(BaseModel):
+class CustomerSearchCompatTool(AliasedModel):
     """
     Compatibility schema for VAPI dashboard tests that may send
     {"query", "pageLimit", "locationId"}. We map query→lookup.
@@ -89,57 +218,34 @@ class CustomerSearchCompatTool(BaseModel):
     offset: int = Field(default=0, ge=0, description="Pagination offset")
     take: int = Field(default=25, ge=1, le=100, description="Page size")
 
-    model_config = ConfigDict(populate_by_name=True, extra="allow")
+    model_config = ConfigDict(extra="ignore")
 
 
-class CustomerDetailsTool(BaseModel):
+class CustomerDetailsTool(CustomerRef):
     """
     Parameters for customer details tool.
     
     Tool ID: b3846a9ea8aee18743363699e0aaa399
     Endpoint: POST /tools/customer/details
     """
-    customer_id: str = Field(
-        ...,
-        alias="customerId",
-        description="Customer account number"
-    )
     include_inactive: bool = Field(
         default=False,
         description="Include inactive customers in results"
     )
-    
-    model_config = ConfigDict(populate_by_name=True)
 
 
-class DeliveryStopsTool(BaseModel):
+class DeliveryStopsTool(CustomerRef):
     """
     Parameters for delivery stops tool.
     
     Tool ID: a8ff151f77354ae30d328f4042b7ab15
     Endpoint: POST /tools/delivery/stops
     """
-    customer_id: str = Field(
-        ...,
-        alias="customerId",
-        description="Customer account number"
-    )
-    offset: int = Field(
-        default=0,
-        ge=0,
-        description="Pagination offset"
-    )
-    take: int = Field(
-        default=25,
-        ge=1,
-        le=100,
-        description="Number of results to return (max 100)"
-    )
-    
-    model_config = ConfigDict(populate_by_name=True)
+    offset: int = OFFSET_FIELD
+    take: int = TAKE_FIELD
 
 
-class FinanceDeliveryInfoTool(BaseModel):
+class FinanceDeliveryInfoTool(CustomerDeliveryRef):
     """
     Parameters for finance and delivery info tool.
     
@@ -149,104 +255,56 @@ class FinanceDeliveryInfoTool(BaseModel):
     NOTE: Both customerId and deliveryId are REQUIRED per Fontis API documentation.
     Use delivery_stops tool first to obtain deliveryId.
     """
-    customer_id: str = Field(
-        ...,
-        alias="customerId",
-        description="Customer account number"
-    )
     delivery_id: str = Field(
         ...,
-        alias="deliveryId",
         description="Delivery stop ID (REQUIRED - use delivery_stops tool to obtain)"
     )
-    
-    model_config = ConfigDict(populate_by_name=True)
 
 
 # ===== Delivery Tool Parameters =====
 
 
-class DeliverySummaryTool(BaseModel):
+class DeliverySummaryTool(CustomerOptionalDeliveryRef):
     """Parameters for delivery summary aggregator tool."""
 
-    customer_id: str = Field(
-        ...,
-        alias="customerId",
-        description="Customer account number"
-    )
-    delivery_id: str | None = Field(
-        default=None,
-        alias="deliveryId",
-        description="Delivery stop ID (optional, resolved automatically when omitted)"
-    )
     include_next_delivery: bool = Field(
         default=True,
-        alias="includeNextDelivery",
         description="Include next scheduled delivery lookup"
     )
     include_defaults: bool = Field(
         default=True,
-        alias="includeDefaults",
         description="Include standing order/default product summary"
     )
 
-    model_config = ConfigDict(populate_by_name=True)
 
-
-class DeliveryScheduleTool(BaseModel):
+class DeliveryScheduleTool(CustomerOptionalDeliveryRef):
     """Parameters for delivery schedule lookup."""
 
-    customer_id: str = Field(
-        ...,
-        alias="customerId",
-        description="Customer account number"
-    )
-    delivery_id: str | None = Field(
-        default=None,
-        alias="deliveryId",
-        description="Delivery stop ID (optional, resolved automatically when omitted)"
-    )
     from_date: str | None = Field(
         default=None,
-        alias="fromDate",
         description="Start date (YYYY-MM-DD). Default: 30 days ago when omitted"
     )
     to_date: str | None = Field(
         default=None,
-        alias="toDate",
         description="End date (YYYY-MM-DD). Default: 45 days ahead when omitted"
     )
     history_days: int = Field(
         default=30,
-        alias="historyDays",
         ge=0,
         le=120,
         description="Days in the past to include when fromDate not supplied"
     )
     future_days: int = Field(
         default=45,
-        alias="futureDays",
         ge=1,
         le=120,
         description="Days in the future to include when toDate not supplied"
     )
 
-    model_config = ConfigDict(populate_by_name=True)
-
 
-class WorkOrderStatusTool(BaseModel):
+class WorkOrderStatusTool(CustomerOptionalDeliveryRef):
     """Parameters for recent work/off-route order status lookup."""
 
-    customer_id: str = Field(
-        ...,
-        alias="customerId",
-        description="Customer account number"
-    )
-    delivery_id: str | None = Field(
-        default=None,
-        alias="deliveryId",
-        description="Delivery stop ID (optional, resolved automatically when omitted)"
-    )
     limit: int = Field(
         default=5,
         ge=1,
@@ -254,208 +312,107 @@ class WorkOrderStatusTool(BaseModel):
         description="Number of recent orders to return"
     )
 
-    model_config = ConfigDict(populate_by_name=True)
-
 
-class PricingBreakdownTool(BaseModel):
+class PricingBreakdownTool(CustomerOptionalDeliveryRef):
     """Parameters for pricing breakdown across standing orders/products."""
 
-    customer_id: str = Field(
-        ...,
-        alias="customerId",
-        description="Customer account number"
-    )
-    delivery_id: str | None = Field(
-        default=None,
-        alias="deliveryId",
-        description="Delivery stop ID (optional, resolved automatically when omitted)"
-    )
     postal_code: str = Field(
         ...,
-        alias="postalCode",
         min_length=3,
         description="Postal code for price lookup"
     )
     internet_only: bool = Field(
         default=False,
-        alias="internetOnly",
         description="Restrict catalog lookup to internet/web products"
     )
     include_catalog_excerpt: bool = Field(
         default=False,
-        alias="includeCatalogExcerpt",
         description="Include a small catalog excerpt alongside standing order prices"
     )
 
-    model_config = ConfigDict(populate_by_name=True)
-
 
-class OrderChangeStatusTool(BaseModel):
+class OrderChangeStatusTool(CustomerOptionalDeliveryRef):
     """Parameters for confirming pending order or change requests."""
 
-    customer_id: str = Field(
-        ...,
-        alias="customerId",
-        description="Customer account number"
-    )
-    delivery_id: str | None = Field(
-        default=None,
-        alias="deliveryId",
-        description="Delivery stop ID (optional, resolved automatically when omitted)"
-    )
     ticket_number: str | None = Field(
         default=None,
-        alias="ticketNumber",
         description="Specific ticket number to confirm"
     )
     only_open_orders: bool = Field(
         default=True,
-        alias="onlyOpenOrders",
         description="Limit search to open/pending orders"
     )
 
-    model_config = ConfigDict(populate_by_name=True)
 
-
-class NextDeliveryTool(BaseModel):
-    """
-    Parameters for next delivery and default products tools.
-    
-    Used by:
-    - Tool ID: 92e47d19800cfe7724e27d11b0ec4f1a (next delivery)
-    - Tool ID: f24e6d2bc336153c076f0220b45f86b6 (default products)
-    
-    Endpoints:
-    - POST /tools/delivery/next-scheduled
-    - POST /tools/delivery/default-products
-    """
-    customer_id: str = Field(
-        ...,
-        alias="customerId",
-        description="Customer account number"
-    )
-    delivery_id: str = Field(
-        ...,
-        alias="deliveryId",
-        description="Delivery stop ID (from get_delivery_stops)"
-    )
-    
-    model_config = ConfigDict(populate_by_name=True)
+NextDeliveryTool = CustomerDeliveryRef
 
 
 # ===== Billing Tool Parameters =====
 
 
-class InvoiceHistoryTool(BaseModel):
+class InvoiceHistoryTool(CustomerDeliveryRef):
     """
     Parameters for invoice history tool.
     
     Tool ID: aebb0c9d5881f619f77819b48aec5b53
     Endpoint: POST /tools/billing/invoice-history
     """
-    customer_id: str = Field(
-        ...,
-        alias="customerId",
-        description="Customer account number"
-    )
-    delivery_id: str = Field(
-        ...,
-        alias="deliveryId",
-        description="Delivery stop ID"
-    )
     number_of_months: int = Field(
         default=12,
-        alias="numberOfMonths",
         ge=1,
         le=24,
         description="Number of months of history to retrieve (max 24)"
     )
-    offset: int = Field(
-        default=0,
-        ge=0,
-        description="Pagination offset"
-    )
-    take: int = Field(
-        default=25,
-        ge=1,
-        le=100,
-        description="Number of results to return (max 100)"
-    )
+    offset: int = OFFSET_FIELD
+    take: int = TAKE_FIELD
     descending: bool = Field(
         default=True,
         description="Sort order (True = newest first)"
     )
-    
-    model_config = ConfigDict(populate_by_name=True)
 
 
-class AccountBalanceTool(BaseModel):
+class AccountBalanceTool(CustomerRef):
     """
     Parameters for account balance tool.
     
     Tool ID: cce52d0c5e5f4faa1b0e9cbc8eb420e0
     Endpoint: POST /tools/billing/balance
     """
-    customer_id: str = Field(
-        ...,
-        alias="customerId",
-        description="Customer account number"
-    )
     include_inactive: bool = Field(
         default=False,
-        alias="includeInactive",
         description="Include inactive accounts"
     )
-    
-    model_config = ConfigDict(populate_by_name=True)
 
 
-class BillingMethodsTool(BaseModel):
+class BillingMethodsTool(CustomerRef):
     """
     Parameters for billing methods tool.
     
     Tool ID: f9b9a1ff6729cf4f69d28d188301b32e
     Endpoint: POST /tools/billing/payment-methods
     """
-    customer_id: str = Field(
-        ...,
-        alias="customerId",
-        description="Customer account number"
-    )
     include_inactive: bool = Field(
         default=False,
-        alias="includeInactive",
         description="Include inactive payment methods"
     )
-    
-    model_config = ConfigDict(populate_by_name=True)
 
 
-class PaymentExpiryAlertTool(BaseModel):
+class PaymentExpiryAlertTool(CustomerRef):
     """Parameters for payment method expiry alerts tool."""
 
-    customer_id: str = Field(
-        ...,
-        alias="customerId",
-        description="Customer account number"
-    )
     days_threshold: int = Field(
         default=60,
-        alias="daysThreshold",
         ge=1,
         le=365,
         description="Number of days before expiry to treat cards as expiring soon"
     )
     include_inactive: bool = Field(
         default=False,
-        alias="includeInactive",
         description="Include inactive or disabled payment methods"
     )
-    
-    model_config = ConfigDict(populate_by_name=True)
 
 
-class ProductsTool(BaseModel):
+class ProductsTool(AliasedModel):
     """
     Parameters for products catalog tool.
     
@@ -466,170 +423,94 @@ class ProductsTool(BaseModel):
     """
     customer_id: str = Field(
         ...,
-        alias="customerId",
         description="Customer account number (required for accurate pricing)"
     )
     delivery_id: str | None = Field(
         default=None,
-        alias="deliveryId",
         description="Delivery stop ID (optional)"
     )
     postal_code: str | None = Field(
         default=None,
-        alias="postalCode",
         description="Postal code for pricing (optional)"
     )
     internet_only: bool = Field(
         default=True,
-        alias="internetOnly",
         description="Show only internet-available products"
     )
-    categories: list[str] = Field(
-        default=[],
+    categories: tuple[str, ...] = Field(
+        default=(),
         description="Filter by product categories"
     )
     default_products: bool = Field(
         default=False,
-        alias="defaultProducts",
         description="Show only default/recommended products"
     )
-    offset: int = Field(
-        default=0,
-        ge=0,
-        description="Pagination offset"
-    )
-    take: int = Field(
-        default=25,
-        ge=1,
-        le=100,
-        description="Number of results to return (max 100)"
-    )
-    
-    model_config = ConfigDict(populate_by_name=True)
+    offset: int = OFFSET_FIELD
+    take: int = TAKE_FIELD
 
 
 # ===== Contracts Tool Parameters =====
 
 
-class ContractsTool(BaseModel):
-    """
-    Parameters for contracts tool.
-    
-    Tool ID: 13e223880330066e44c1f2119c0c5aba
-    Endpoint: POST /tools/contracts/get-contracts
-    """
-    customer_id: str = Field(
-        ...,
-        alias="customerId",
-        description="Customer account number"
-    )
-    delivery_id: str = Field(
-        ...,
-        alias="deliveryId",
-        description="Delivery stop ID"
-    )
-    
-    model_config = ConfigDict(populate_by_name=True)
+ContractsTool = CustomerDeliveryRef
 
 
 # ===== Invoice Detail Tool Parameters =====
 
 
-class InvoiceDetailTool(BaseModel):
+class InvoiceDetailTool(CustomerRef):
     """
     Parameters for invoice detail tool.
     
     Tool ID: 75ef81ae69cf762ba58d74c48f18d230
     Endpoint: POST /tools/billing/invoice-detail
     """
-    customer_id: str = Field(
-        ...,
-        alias="customerId",
-        description="Customer account number"
-    )
     invoice_key: str = Field(
         ...,
-        alias="invoiceKey",
         description="Invoice key/identifier"
     )
-    invoice_date: str = Field(
+    invoice_date: date = Field(
         ...,
-        alias="invoiceDate",
         description="Invoice date (YYYY-MM-DD)"
     )
     include_signature: bool = Field(
         default=False,
-        alias="includeSignature",
         description="Include customer signature"
     )
     include_payments: bool = Field(
         default=False,
-        alias="includePayments",
         description="Include related payments"
     )
-    
-    model_config = ConfigDict(populate_by_name=True)
 
 
 # ===== Default Products Updated Tool Parameters =====
 
 
-class DefaultProductsTool(BaseModel):
-    """
-    Parameters for default products tool.
-    
-    Tool ID: f24e6d2bc336153c076f0220b45f86b6
-    Endpoint: POST /tools/delivery/default-products
-    """
-    customer_id: str = Field(
-        ...,
-        alias="customerId",
-        description="Customer account number"
-    )
-    delivery_id: str = Field(
-        ...,
-        alias="deliveryId",
-        description="Delivery stop ID"
-    )
-    
-    model_config = ConfigDict(populate_by_name=True)
+DefaultProductsTool = CustomerDeliveryRef
 
 
 # ===== Next Scheduled Delivery Updated Tool Parameters =====
 
 
-class NextScheduledDeliveryTool(BaseModel):
+class NextScheduledDeliveryTool(CustomerDeliveryRef):
     """
     Parameters for next scheduled delivery tool.
     
     Tool ID: 92e47d19800cfe7724e27d11b0ec4f1a
     Endpoint: POST /tools/delivery/next-scheduled
     """
-    customer_id: str = Field(
-        ...,
-        alias="customerId",
-        description="Customer account number"
-    )
-    delivery_id: str = Field(
-        ...,
-        alias="deliveryId",
-        description="Delivery stop ID"
-    )
     days_ahead: int = Field(
         default=45,
-        alias="daysAhead",
         ge=1,
         le=90,
         description="Number of days ahead to search (default: 45, max: 90)"
     )
-    
-    model_config = ConfigDict(populate_by_name=True)
 
 
 # ===== Orders Search Tool Parameters =====
 
 
-class OrdersSearchTool(BaseModel):
+class OrdersSearchTool(AliasedModel):
     """
     Parameters for orders search tool.
     
@@ -637,46 +518,38 @@ class OrdersSearchTool(BaseModel):
     """
     ticket_number: str | None = Field(
         default=None,
-        alias="ticketNumber",
         description="Ticket number to search for"
     )
     customer_id: str | None = Field(
         default=None,
-        alias="customerId",
         description="Customer account number"
     )
     delivery_id: str | None = Field(
         default=None,
-        alias="deliveryId",
         description="Delivery stop ID"
     )
     only_open_orders: bool = Field(
         default=True,
-        alias="onlyOpenOrders",
         description="Return only open/unposted orders"
     )
     web_products_only: bool = Field(
         default=False,
-        alias="webProductsOnly",
         description="Return only web-orderable products"
     )
-    
-    model_config = ConfigDict(populate_by_name=True)
 
 
 # ===== Route Stops Tool Parameters =====
 
 
-class RouteStopsTool(BaseModel):
+class RouteStopsTool(AliasedModel):
     """
     Parameters for route stops tool.
     
     Tool ID: b02a838764b22f83dce17e848fa63884
     Endpoint: POST /tools/routes/stops
     """
-    route_date: str = Field(
+    route_date: date = Field(
         ...,
-        alias="routeDate",
         description="Route date (YYYY-MM-DD)"
     )
     route: str = Field(
@@ -685,17 +558,31 @@ class RouteStopsTool(BaseModel):
     )
     account_number: str | None = Field(
         default=None,
-        alias="accountNumber",
         description="Optional - filter to specific customer account"
     )
-    
-    model_config = ConfigDict(populate_by_name=True)
 
 
 # ===== Onboarding Tool Parameters =====
 
 
-class SendContractTool(BaseModel):
+def _normalize_phone(value: Any) -> Any:
+    """Normalise phone numbers to E.164 when the leading '+' is missing."""
+    if isinstance(value, str):
+        digits = _NON_DIGITS_RE.sub("", value)
+        if digits and not value.strip().startswith("+"):
+            return f"+{digits}"
+    return value
+
+
+def _split_products_of_interest(value: Any) -> Any:
+    """Convert a comma-delimited productsOfInterest string to a list."""
+    if isinstance(value, str):
+        cleaned = [item.strip() for item in value.split(",") if item.strip()]
+        return cleaned or None
+    return value
+
+
+class SendContractTool(AliasedModel):
     """
     Parameters for sending onboarding contract tool.
     
@@ -704,15 +591,14 @@ class SendContractTool(BaseModel):
     """
     customer_name: str = Field(
         ...,
-        alias="customerName",
         min_length=2,
         description="Full customer name"
     )
-    email: str = Field(
+    email: EmailStr = Field(
         ...,
         description="Customer email address"
     )
-    phone: str = Field(
+    phone: Annotated[str, BeforeValidator(_normalize_phone)] = Field(
         ...,
         description="Customer phone number (E.164 format recommended)"
     )
@@ -732,72 +618,35 @@ class SendContractTool(BaseModel):
     )
     postal_code: str = Field(
         ...,
-        alias="postalCode",
         description="ZIP/Postal code"
     )
     delivery_preference: str | None = Field(
         default=None,
-        alias="deliveryPreference",
         description="Preferred delivery day (e.g., 'Tuesday')"
     )
     company_name: str | None = Field(
         default=None,
-        alias="companyName",
         description="Company or organization name for the new account"
     )
-    products_of_interest: list[str] | None = Field(
+    products_of_interest: Annotated[list[str] | None, BeforeValidator(_split_products_of_interest)] = Field(
         default=None,
-        alias="productsOfInterest",
         description="List of products the customer is interested in (e.g., ['5-Gallon Bottles'])"
     )
     special_instructions: str | None = Field(
         default=None,
-        alias="specialInstructions",
         description="Any onboarding notes or delivery instructions provided by the customer"
     )
     marketing_opt_in: bool | None = Field(
         default=None,
-        alias="marketingOptIn",
         description="Whether the customer agreed to receive marketing communications"
     )
     send_email: bool = Field(
         default=True,
-        alias="sendEmail",
         description="Whether to send contract via email (default: True)"
     )
-    
-    model_config = ConfigDict(populate_by_name=True)
 
-    @model_validator(mode="before")
-    @classmethod
-    def _normalize_payload(cls, values: dict[str, Any]) -> dict[str, Any]:
-        """Coerce flexible payload shapes coming from Vapi/Postman."""
-        if not isinstance(values, dict):
-            return values
-
-        # Convert productsOfInterest from comma-delimited string to list
-        poi_key = "productsOfInterest"
-        if poi_key in values:
-            poi_value = values[poi_key]
-            if isinstance(poi_value, str):
-                cleaned = [item.strip() for item in poi_value.split(",") if item.strip()]
-                values[poi_key] = cleaned or None
-        elif "products_of_interest" in values and isinstance(values["products_of_interest"], str):
-            cleaned = [item.strip() for item in values["products_of_interest"].split(",") if item.strip()]
-            values["products_of_interest"] = cleaned or None
-
-        # Normalise phone numbers to E.164 if missing '+'
-        phone_key = "phone"
-        phone_value = values.get(phone_key)
-        if isinstance(phone_value, str):
-            digits = re.sub(r"\D", "", phone_value)
-            if digits and not phone_value.strip().startswith("+"):
-                values[phone_key] = f"+{digits}"
-
-        return values
-
-
-class ContractStatusTool(BaseModel):
+
+class ContractStatusTool(AliasedModel):
     """
     Parameters for checking onboarding contract submission status.
     
@@ -805,112 +654,179 @@ class ContractStatusTool(BaseModel):
     """
     submission_id: str = Field(
         ...,
-        alias="submissionId",
         description="JotForm submission ID from send_contract response"
     )
-    
-    model_config = ConfigDict(populate_by_name=True)
 
 
 # ===== Outbound Call Tool Parameters =====
 
 
-class DeclinedPaymentCallTool(BaseModel):
+class DeclinedPaymentCallTool(AliasedModel):
     """Parameters for declined payment outbound call."""
 
     customer_id: str = Field(
         ...,
-        alias="customerId",
         description="Fontis customer ID"
     )
     customer_phone: str = Field(
         ...,
-        alias="customerPhone",
         description="Customer phone number (E.164 format)"
     )
     customer_name: str = Field(
         ...,
-        alias="customerName",
         description="Customer full name"
     )
     declined_amount: float | None = Field(
         default=None,
-        alias="declinedAmount",
         description="Amount that was declined"
     )
     account_balance: float | None = Field(
         default=None,
-        alias="accountBalance",
         description="Current account balance"
     )
 
-    model_config = ConfigDict(populate_by_name=True)
-
 
-class CollectionsCallTool(BaseModel):
+class CollectionsCallTool(AliasedModel):
     """Parameters for collections outbound call."""
 
     customer_id: str = Field(
         ...,
-        alias="customerId",
         description="Fontis customer ID"
     )
     customer_phone: str = Field(
         ...,
-        alias="customerPhone",
         description="Customer phone number (E.164 format)"
     )
     customer_name: str = Field(
         ...,
-        alias="customerName",
         description="Customer full name"
     )
     past_due_amount: float = Field(
         ...,
-        alias="pastDueAmount",
         description="Past due amount"
     )
     days_past_due: int | None = Field(
         default=None,
-        alias="daysPastDue",
         description="Days the account is past due"
     )
 
-    model_config = ConfigDict(populate_by_name=True)
 
-
-class DeliveryReminderCallTool(BaseModel):
+class DeliveryReminderCallTool(AliasedModel):
     """Parameters for delivery reminder outbound call or SMS."""
 
     customer_id: str = Field(
         ...,
-        alias="customerId",
         description="Fontis customer ID"
     )
     customer_phone: str = Field(
         ...,
-        alias="customerPhone",
         description="Customer phone number (E.164 format)"
     )
     customer_name: str = Field(
         ...,
-        alias="customerName",
         description="Customer full name"
     )
     delivery_date: str = Field(
         ...,
-        alias="deliveryDate",
         description="Scheduled delivery date (YYYY-MM-DD)"
     )
     send_sms: bool = Field(
         default=False,
-        alias="sendSms",
         description="Send SMS instead of placing a call"
     )
     account_on_hold: bool = Field(
         default=False,
-        alias="accountOnHold",
         description="Account is past due/on hold"
     )
+
+
+# ===== Vapi Function Registry =====
+
+
+# Vapi function name -> parameter model. Several names may share a model.
+TOOL_MODELS: dict[str, type[AliasedModel]] = {
+    # Customer tools
+    "customer_search": CustomerSearchTool,
+    "customer_details": CustomerDetailsTool,
+    "finance_info": FinanceDeliveryInfoTool,
+    # Delivery tools
+    "delivery_stops": DeliveryStopsTool,
+    "next_delivery": NextScheduledDeliveryTool,
+    "default_products": DefaultProductsTool,
+    "delivery_summary": DeliverySummaryTool,
+    "delivery_schedule": DeliveryScheduleTool,
+    "work_order_status": WorkOrderStatusTool,
+    "pricing_breakdown": PricingBreakdownTool,
+    "order_change_status": OrderChangeStatusTool,
+    "orders_search": OrdersSearchTool,
+    # Billing tools
+    "account_balance": AccountBalanceTool,
+    "invoice_history": InvoiceHistoryTool,
+    "invoice_detail": InvoiceDetailTool,
+    "payment_methods": BillingMethodsTool,
+    "payment_expiry_alerts": PaymentExpiryAlertTool,
+    "products_catalog": ProductsTool,
+    "products": ProductsTool,
+    # Contract tools
+    "customer_contracts": ContractsTool,
+    # Route tools
+    "route_stops": RouteStopsTool,
+    # Onboarding tools (JotForm)
+    "send_contract": SendContractTool,
+    "contract_status": ContractStatusTool,
+    # Outbound call tools
+    "declined_payment_call": DeclinedPaymentCallTool,
+    "collections_call": CollectionsCallTool,
+    "delivery_reminder_call": DeliveryReminderCallTool,
+}
+
+
+# ===== Cached Validators =====
+
+
+@lru_cache(maxsize=64)
+def tool_adapter(model: type[BaseModel]) -> TypeAdapter[Any]:
+    """
+    Return a process-wide TypeAdapter for a tool parameter model.
     
-    model_config = ConfigDict(populate_by_name=True)
+    The adapter is built once per model and reused, so hot paths such as
+    the Vapi webhook dispatcher validate raw argument dicts through a
+    pre-resolved pydantic-core validator.
+    """
+    return TypeAdapter(model)
+
+
+@lru_cache(maxsize=64)
+def tool_schema(model: type[BaseModel]) -> dict[str, Any]:
+    """
+    Return the JSON schema (camelCase aliases) for a tool parameter model.
+    
+    Computed on first request and cached per model rather than at import,
+    so building schemas does not undo the deferred validator compilation.
+    Treat the returned dict as read-only; it is shared between callers.
+    """
+    return model.model_json_schema(by_alias=True)
+
+
+def validate_tool_call(function_name: str, parameters: dict[str, Any]) -> AliasedModel:
+    """
+    Validate raw Vapi function arguments against the tool's parameter model.
+    
+    Raises:
+        KeyError: If the function name is not registered in TOOL_MODELS.
+        ValidationError: If the arguments do not match the model.
+    """
+    return tool_adapter(TOOL_MODELS[function_name]).validate_python(parameters)
+
+
+def tool_json_schema(function_name: str) -> dict[str, Any]:
+    """
+    Return the cached JSON schema for a registered Vapi function.
+    
+    Aliased function names (e.g. products/products_catalog) share one
+    schema because they share a model.
+    
+    Raises:
+        KeyError: If the function name is not registered in TOOL_MODELS.
+    """
+    return tool_schema(TOOL_MODELS[function_name])
@@ -8,13 +8,51 @@ This module defines models for:
 
 Design decisions:
 - Flexible schemas (dict[str, Any]) for evolving Vapi API
+- TypedDict shapes for the nested objects we read; unknown keys pass through
 - Type-safe where possible for validation
 - Default factories for optional nested objects
 """
 
-from typing import Any
+from typing import Any, Literal
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, with_config
+from typing_extensions import TypedDict
+
+
+# Event types the webhook handler routes explicitly. Vapi emits others
+# (status-update, end-of-call-report, ...), so VapiWebhookEvent.type stays a
+# plain str; this names the set dispatch code compares against.
+VapiEventType = Literal[
+    "function-call",
+    "call-start",
+    "call-end",
+    "transcript",
+    "hang",
+    "speech-update",
+]
+
+
+@with_config(ConfigDict(extra="allow"))
+class CallMeta(TypedDict, total=False):
+    """
+    Subset of the Vapi call object read by the webhook handlers.
+    
+    Remaining keys are kept as-is for logging and downstream processing.
+    """
+    id: str
+    status: str | None
+    hangReason: str | None
+    endReason: str | None
+    customer: dict[str, Any]
+    metadata: dict[str, Any]
+    assistantOverrides: dict[str, Any]
+
+
+@with_config(ConfigDict(extra="allow"))
+class ToolFunction(TypedDict, total=False):
+    """Function name and arguments of a Vapi tool call."""
+    name: str
+    arguments: Any
 
 
 class VapiMessage(BaseModel):
@@ -25,6 +63,8 @@ class VapiMessage(BaseModel):
     """
     role: str  # "assistant", "user", "system", etc.
     content: str  # Message text
+    
+    model_config = ConfigDict(frozen=True)  # Read-only inbound payload
 
 
 class VapiToolCall(BaseModel):
@@ -34,8 +74,10 @@ class VapiToolCall(BaseModel):
     Sent when Vapi AI decides to execute a function/tool.
     """
     id: str  # Unique tool call ID
-    type: str = "function"  # Always "function" for tool calls
-    function: dict[str, Any]  # Function name and arguments
+    type: Literal["function"] = "function"  # Always "function" for tool calls
+    function: ToolFunction  # Function name and arguments
+    
+    model_config = ConfigDict(frozen=True)  # Read-only inbound payload
 
 
 class VapiWebhookRequest(BaseModel):
@@ -54,10 +96,10 @@ class VapiWebhookRequest(BaseModel):
         metadata: Custom metadata passed when creating call
     """
     message: VapiMessage
-    call: dict[str, Any] = Field(default_factory=dict)
+    call: CallMeta = Field(default_factory=dict)
     metadata: dict[str, Any] = Field(default_factory=dict)
     
-    model_config = ConfigDict(extra="allow")  # Allow additional fields from Vapi
+    model_config = ConfigDict(extra="ignore")  # Drop unread fields from Vapi
 
 
 class VapiToolResponse(BaseModel):
@@ -69,7 +111,7 @@ class VapiToolResponse(BaseModel):
     """
     results: list[dict[str, Any]]
     
-    model_config = ConfigDict(extra="allow")
+    model_config = ConfigDict(extra="ignore")
 
 
 class VapiFunctionCall(BaseModel):
@@ -83,7 +125,7 @@ class VapiFunctionCall(BaseModel):
     call_id: str = Field(..., alias="callId")
     
     model_config = ConfigDict(
-        extra="allow",
+        extra="ignore",
         populate_by_name=True
     )
 
@@ -100,7 +142,7 @@ class VapiWebhookEvent(BaseModel):
     - hang: Call disconnected
     - speech-update: Partial speech recognition
     """
-    type: str
+    type: str  # A VapiEventType for routed events; others pass through
     call_id: str | None = Field(None, alias="callId")
     timestamp: str | None = None
     
@@ -112,8 +154,9 @@ class VapiWebhookEvent(BaseModel):
     transcript: str | None = None
     
     # Call metadata
-    call: dict[str, Any] | None = Field(default_factory=dict)
+    call: CallMeta | None = Field(default_factory=dict)
     
+    # Extras stay: call-start/call-end read event-level metadata and log model_dump()
     model_config = ConfigDict(
         extra="allow",
         populate_by_name=True
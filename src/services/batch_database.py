@@ -8,8 +8,11 @@ Tracks:
 - Repeat decline status
 """
 
+import queue
 import sqlite3
+import time
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 from contextlib import contextmanager
@@ -17,6 +20,134 @@ import structlog
 
 logger = structlog.get_logger(__name__)
 
+# Applied once per pooled connection (not per query)
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=5000",
+)
+
+# Bumped when a stored column format changes; tracked in PRAGMA user_version.
+# Version 1: timestamps stored as INTEGER unix seconds instead of ISO-8601 TEXT.
+SCHEMA_VERSION = 1
+
+TABLE_DDL = {
+    # Processed batches table
+    "processed_batches": """
+        CREATE TABLE IF NOT EXISTS processed_batches (
+            batch_id TEXT PRIMARY KEY,
+            processed_at INTEGER NOT NULL,
+            total_records INTEGER NOT NULL,
+            declined_count INTEGER NOT NULL,
+            matched_count INTEGER NOT NULL,
+            sms_sent INTEGER NOT NULL,
+            csv_filename TEXT NOT NULL
+        )
+    """,
+    # Customer outreach tracking table
+    "customer_outreach": """
+        CREATE TABLE IF NOT EXISTS customer_outreach (
+            customer_id TEXT NOT NULL,
+            batch_id TEXT NOT NULL,
+            declined_amount REAL NOT NULL,
+            first_declined_at INTEGER NOT NULL,
+            last_outreach_at INTEGER,
+            last_outreach_type TEXT,
+            current_priority TEXT NOT NULL,
+            is_resolved INTEGER NOT NULL DEFAULT 0,
+            repeat_decline_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (customer_id, batch_id),
+            FOREIGN KEY (batch_id) REFERENCES processed_batches(batch_id)
+        )
+    """,
+    # Outreach history table (for detailed tracking)
+    "outreach_history": """
+        CREATE TABLE IF NOT EXISTS outreach_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            customer_id TEXT NOT NULL,
+            batch_id TEXT NOT NULL,
+            outreach_type TEXT NOT NULL,
+            outreach_date INTEGER NOT NULL,
+            priority TEXT NOT NULL,
+            call_id TEXT,
+            sms_id TEXT,
+            success INTEGER NOT NULL DEFAULT 1,
+            error_message TEXT
+        )
+    """,
+}
+
+TIMESTAMP_COLUMNS = {
+    "processed_batches": ("processed_at",),
+    "customer_outreach": ("first_declined_at", "last_outreach_at"),
+    "outreach_history": ("outreach_date",),
+}
+
+
+def _iso_to_unix(value: Optional[str]) -> Optional[int]:
+    """Convert a stored local-time ISO-8601 string to unix seconds."""
+    if value is None:
+        return None
+    return int(datetime.fromisoformat(value).timestamp())
+
+
+# Write statements shared by the single-row and bulk paths. Reusing the same
+# SQL text lets each pooled connection's statement cache skip re-preparing.
+# Upserts (SQLite >= 3.24) update rows in place instead of INSERT OR REPLACE's
+# delete + reinsert, which rewrote every index entry and nulled the columns
+# not listed (last_outreach_at/last_outreach_type on a re-recorded decline).
+SQL_INSERT_BATCH = """
+    INSERT INTO processed_batches
+    (batch_id, processed_at, total_records, declined_count, matched_count, sms_sent, csv_filename)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(batch_id) DO UPDATE SET
+        processed_at = excluded.processed_at,
+        total_records = excluded.total_records,
+        declined_count = excluded.declined_count,
+        matched_count = excluded.matched_count,
+        sms_sent = excluded.sms_sent,
+        csv_filename = excluded.csv_filename
+"""
+SQL_INSERT_DECLINE = """
+    INSERT INTO customer_outreach
+    (customer_id, batch_id, declined_amount, first_declined_at, current_priority, is_resolved, repeat_decline_count)
+    VALUES (?, ?, ?, ?, ?, 0, ?)
+    ON CONFLICT(customer_id, batch_id) DO UPDATE SET
+        declined_amount = excluded.declined_amount,
+        current_priority = excluded.current_priority,
+        repeat_decline_count = excluded.repeat_decline_count
+"""
+SQL_INSERT_HISTORY = """
+    INSERT INTO outreach_history
+    (customer_id, batch_id, outreach_type, outreach_date, priority, call_id, sms_id, success, error_message)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+# Single-row insert that hands back the new history id (SQLite >= 3.35)
+SQL_INSERT_HISTORY_RETURNING = SQL_INSERT_HISTORY.rstrip() + " RETURNING id\n"
+SQL_UPDATE_OUTREACH = """
+    UPDATE customer_outreach
+    SET last_outreach_at = ?, last_outreach_type = ?, current_priority = ?
+    WHERE customer_id = ? AND batch_id = ?
+"""
+
+# Max customer IDs bound into one IN (...) list
+IN_CHUNK_SIZE = 500
+
+
+@lru_cache(maxsize=32)
+def _prior_decline_counts_sql(n: int) -> str:
+    """Build the prior-decline lookup for n customer IDs (cached per size)."""
+    placeholders = ", ".join("?" * n)
+    return f"""
+        SELECT customer_id, MAX(repeat_decline_count) AS repeat_decline_count
+        FROM customer_outreach
+        WHERE customer_id IN ({placeholders}) AND batch_id != ?
+        GROUP BY customer_id
+    """
+
 
 class BatchRecord:
     """Processed batch record."""
@@ -69,99 +200,125 @@ class CustomerOutreachRecord:
 class BatchDatabase:
     """SQLite database for batch processing tracking."""
     
-    def __init__(self, db_path: Path):
+    def __init__(self, db_path: Path, pool_size: int = 4):
         """
         Initialize database.
         
         Args:
             db_path: Path to SQLite database file
+            pool_size: Number of persistent connections kept open
         """
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._pool: queue.Queue[sqlite3.Connection] = queue.Queue(maxsize=pool_size)
+        for _ in range(pool_size):
+            self._pool.put(self._connect())
         self._init_schema()
     
-    @contextmanager
-    def _get_connection(self):
-        """Get database connection with proper cleanup."""
-        conn = sqlite3.connect(str(self.db_path))
+    def _connect(self) -> sqlite3.Connection:
+        """Open a pooled connection and apply WAL/cache PRAGMAs once."""
+        # Autocommit mode: transactions are opened explicitly in _get_connection
+        conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
         conn.row_factory = sqlite3.Row
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
+    @contextmanager
+    def _get_connection(self, immediate: bool = False):
+        """
+        Borrow a pooled connection inside an explicit transaction.
+        
+        Commits on success and rolls back on error. Pass ``immediate=True``
+        for writes so the write lock is taken up front instead of being
+        upgraded mid-transaction.
+        """
+        conn = self._pool.get()
         try:
+            conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
             yield conn
-            conn.commit()
+            conn.execute("COMMIT")
         except Exception:
-            conn.rollback()
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
             raise
         finally:
+            self._pool.put(conn)
+    
+    def close(self):
+        """Close all pooled connections."""
+        while True:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                break
             conn.close()
     
     def _init_schema(self):
         """Initialize database schema."""
-        with self._get_connection() as conn:
+        with self._get_connection(immediate=True) as conn:
             cursor = conn.cursor()
             
-            # Processed batches table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS processed_batches (
-                    batch_id TEXT PRIMARY KEY,
-                    processed_at TEXT NOT NULL,
-                    total_records INTEGER NOT NULL,
-                    declined_count INTEGER NOT NULL,
-                    matched_count INTEGER NOT NULL,
-                    sms_sent INTEGER NOT NULL,
-                    csv_filename TEXT NOT NULL
-                )
-            """)
+            cursor.execute("PRAGMA user_version")
+            needs_migration = cursor.fetchone()[0] < SCHEMA_VERSION
+            if needs_migration:
+                legacy_tables = self._rename_legacy_tables(cursor)
             
-            # Customer outreach tracking table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS customer_outreach (
-                    customer_id TEXT NOT NULL,
-                    batch_id TEXT NOT NULL,
-                    declined_amount REAL NOT NULL,
-                    first_declined_at TEXT NOT NULL,
-                    last_outreach_at TEXT,
-                    last_outreach_type TEXT,
-                    current_priority TEXT NOT NULL,
-                    is_resolved INTEGER NOT NULL DEFAULT 0,
-                    repeat_decline_count INTEGER NOT NULL DEFAULT 0,
-                    PRIMARY KEY (customer_id, batch_id),
-                    FOREIGN KEY (batch_id) REFERENCES processed_batches(batch_id)
-                )
-            """)
+            for ddl in TABLE_DDL.values():
+                cursor.execute(ddl)
             
-            # Outreach history table (for detailed tracking)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS outreach_history (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    customer_id TEXT NOT NULL,
-                    batch_id TEXT NOT NULL,
-                    outreach_type TEXT NOT NULL,
-                    outreach_date TEXT NOT NULL,
-                    priority TEXT NOT NULL,
-                    call_id TEXT,
-                    sms_id TEXT,
-                    success INTEGER NOT NULL DEFAULT 1,
-                    error_message TEXT
-                )
-            """)
+            if needs_migration:
+                self._copy_legacy_tables(conn, legacy_tables)
+                cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
             
-            # Create indexes
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_customer_outreach_customer_id 
-                ON customer_outreach(customer_id)
-            """)
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_customer_outreach_priority 
-                ON customer_outreach(current_priority)
-            """)
+            # Single-column indexes superseded by the primary key
+            # (customer_id, batch_id) and idx_co_active below
+            for index_name in (
+                "idx_customer_outreach_customer_id",
+                "idx_customer_outreach_priority",
+                "idx_customer_outreach_resolved",
+            ):
+                cursor.execute(f"DROP INDEX IF EXISTS {index_name}")
+            
+            # Covers get_active_declined_customers' filter and sort order
             cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_customer_outreach_resolved 
-                ON customer_outreach(is_resolved)
+                CREATE INDEX IF NOT EXISTS idx_co_active
+                ON customer_outreach(is_resolved, batch_id, current_priority DESC, first_declined_at ASC)
             """)
             
-            conn.commit()
             logger.info("database_schema_initialized", db_path=str(self.db_path))
     
+    @staticmethod
+    def _rename_legacy_tables(cursor: sqlite3.Cursor) -> List[str]:
+        """Move tables that still store ISO-8601 TEXT timestamps out of the way."""
+        legacy_tables = []
+        for table, columns in TIMESTAMP_COLUMNS.items():
+            column_types = {
+                row["name"]: row["type"]
+                for row in cursor.execute(f"PRAGMA table_info({table})")
+            }
+            if any(column_types.get(column) == "TEXT" for column in columns):
+                cursor.execute(f"ALTER TABLE {table} RENAME TO {table}_v0")
+                legacy_tables.append(table)
+        return legacy_tables
+    
+    @staticmethod
+    def _copy_legacy_tables(conn: sqlite3.Connection, legacy_tables: List[str]):
+        """Copy renamed tables into the INTEGER schema, converting timestamps."""
+        conn.create_function("iso_to_unix", 1, _iso_to_unix, deterministic=True)
+        for table in legacy_tables:
+            columns = [row["name"] for row in conn.execute(f"PRAGMA table_info({table}_v0)")]
+            select_list = ", ".join(
+                f"iso_to_unix({column})" if column in TIMESTAMP_COLUMNS[table] else column
+                for column in columns
+            )
+            conn.execute(f"""
+                INSERT INTO {table} ({", ".join(columns)})
+                SELECT {select_list} FROM {table}_v0
+            """)
+            conn.execute(f"DROP TABLE {table}_v0")
+            logger.info("batch_table_migrated", table=table, schema_version=SCHEMA_VERSION)
+    
     def record_batch_processed(
         self,
         batch_id: str,
@@ -172,15 +329,11 @@ class BatchDatabase:
         csv_filename: str
     ):
         """Record that a batch has been processed."""
-        with self._get_connection() as conn:
+        with self._get_connection(immediate=True) as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                INSERT OR REPLACE INTO processed_batches
-                (batch_id, processed_at, total_records, declined_count, matched_count, sms_sent, csv_filename)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
+            cursor.execute(SQL_INSERT_BATCH, (
                 batch_id,
-                datetime.now().isoformat(),
+                int(time.time()),
                 total_records,
                 declined_count,
                 matched_count,
@@ -204,7 +357,7 @@ class BatchDatabase:
         priority: str
     ):
         """Record customer decline and check for repeat."""
-        with self._get_connection() as conn:
+        with self._get_connection(immediate=True) as conn:
             cursor = conn.cursor()
             
             # Check if customer has declined before
@@ -218,15 +371,11 @@ class BatchDatabase:
             repeat_count = (existing["repeat_decline_count"] + 1) if existing else 0
             
             # Insert or update customer record
-            cursor.execute("""
-                INSERT OR REPLACE INTO customer_outreach
-                (customer_id, batch_id, declined_amount, first_declined_at, current_priority, is_resolved, repeat_decline_count)
-                VALUES (?, ?, ?, ?, ?, 0, ?)
-            """, (
+            cursor.execute(SQL_INSERT_DECLINE, (
                 customer_id,
                 batch_id,
                 declined_amount,
-                datetime.now().isoformat(),
+                int(time.time()),
                 priority,
                 repeat_count
             ))
@@ -238,6 +387,64 @@ class BatchDatabase:
                 repeat_count=repeat_count
             )
     
+    def get_prior_decline_counts(
+        self,
+        customer_ids: List[str],
+        exclude_batch_id: str
+    ) -> Dict[str, int]:
+        """
+        Get the highest repeat_decline_count per customer from other batches.
+        
+        Customers missing from the result have never declined before.
+        """
+        counts: Dict[str, int] = {}
+        unique_ids = list(dict.fromkeys(customer_ids))
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            # Chunked to stay under SQLite's bound-parameter limit
+            for start in range(0, len(unique_ids), IN_CHUNK_SIZE):
+                chunk = unique_ids[start:start + IN_CHUNK_SIZE]
+                cursor.execute(
+                    _prior_decline_counts_sql(len(chunk)),
+                    (*chunk, exclude_batch_id)
+                )
+                for row in cursor.fetchall():
+                    counts[row["customer_id"]] = row["repeat_decline_count"]
+        return counts
+    
+    def bulk_record_customer_declines(
+        self,
+        batch_id: str,
+        records: List[Dict[str, Any]]
+    ):
+        """
+        Record many customer declines for a batch in one transaction.
+        
+        Args:
+            batch_id: Batch identifier
+            records: Dicts with customer_id, declined_amount, priority and
+                repeat_decline_count
+        """
+        if not records:
+            return
+        
+        now = int(time.time())
+        with self._get_connection(immediate=True) as conn:
+            cursor = conn.cursor()
+            cursor.executemany(SQL_INSERT_DECLINE, [
+                (
+                    record["customer_id"],
+                    batch_id,
+                    record["declined_amount"],
+                    now,
+                    record["priority"],
+                    record["repeat_decline_count"]
+                )
+                for record in records
+            ])
+        
+        logger.info("customer_declines_recorded", batch_id=batch_id, count=len(records))
+    
     def record_outreach(
         self,
         customer_id: str,
@@ -248,64 +455,98 @@ class BatchDatabase:
         sms_id: Optional[str] = None,
         success: bool = True,
         error_message: Optional[str] = None
-    ):
-        """Record outreach attempt."""
-        with self._get_connection() as conn:
+    ) -> int:
+        """
+        Record outreach attempt.
+        
+        Returns:
+            ID of the new outreach_history row
+        """
+        now = int(time.time())
+        
+        with self._get_connection(immediate=True) as conn:
             cursor = conn.cursor()
             
-            # Insert into history
-            cursor.execute("""
-                INSERT INTO outreach_history
-                (customer_id, batch_id, outreach_type, outreach_date, priority, call_id, sms_id, success, error_message)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                customer_id,
-                batch_id,
-                outreach_type,
-                datetime.now().isoformat(),
-                priority,
-                call_id,
-                sms_id,
-                1 if success else 0,
-                error_message
-            ))
+            # Insert into history and read back the id in one statement
+            cursor.execute(
+                SQL_INSERT_HISTORY_RETURNING,
+                (customer_id, batch_id, outreach_type, now, priority, call_id, sms_id, 1 if success else 0, error_message)
+            )
+            outreach_id = cursor.fetchone()[0]
             
-            # Update customer record
-            cursor.execute("""
-                UPDATE customer_outreach
-                SET last_outreach_at = ?, last_outreach_type = ?, current_priority = ?
-                WHERE customer_id = ? AND batch_id = ?
-            """, (
-                datetime.now().isoformat(),
-                outreach_type,
-                priority,
-                customer_id,
-                batch_id
-            ))
+            cursor.execute(SQL_UPDATE_OUTREACH, (now, outreach_type, priority, customer_id, batch_id))
+        
+        logger.info(
+            "outreach_recorded",
+            customer_id=customer_id,
+            outreach_type=outreach_type,
+            success=success
+        )
+        return outreach_id
+    
+    def bulk_record_outreach(self, rows: List[tuple]):
+        """
+        Record many outreach attempts in a single transaction.
+        
+        Args:
+            rows: (customer_id, batch_id, outreach_type, priority, call_id,
+                sms_id, success, error_message) tuples
+        """
+        if not rows:
+            return
+        
+        now = int(time.time())
+        history_rows = [
+            (customer_id, batch_id, outreach_type, now, priority, call_id, sms_id, 1 if success else 0, error_message)
+            for customer_id, batch_id, outreach_type, priority, call_id, sms_id, success, error_message in rows
+        ]
+        update_rows = [
+            (now, outreach_type, priority, customer_id, batch_id)
+            for customer_id, batch_id, outreach_type, priority, *_ in rows
+        ]
+        
+        with self._get_connection(immediate=True) as conn:
+            cursor = conn.cursor()
             
-            logger.info(
-                "outreach_recorded",
-                customer_id=customer_id,
-                outreach_type=outreach_type,
-                success=success
-            )
+            # Insert into history
+            cursor.executemany(SQL_INSERT_HISTORY, history_rows)
+            
+            # Update customer records
+            cursor.executemany(SQL_UPDATE_OUTREACH, update_rows)
     
     def mark_customer_resolved(self, customer_id: str, batch_id: str):
         """Mark customer as resolved (payment received)."""
-        with self._get_connection() as conn:
+        self.bulk_mark_resolved([(customer_id, batch_id)])
+        logger.info("customer_marked_resolved", customer_id=customer_id, batch_id=batch_id)
+    
+    def bulk_mark_resolved(self, customers: List[tuple]):
+        """
+        Mark many customers as resolved in a single transaction.
+        
+        Args:
+            customers: (customer_id, batch_id) pairs
+        """
+        if not customers:
+            return
+        
+        with self._get_connection(immediate=True) as conn:
             cursor = conn.cursor()
-            cursor.execute("""
+            cursor.executemany("""
                 UPDATE customer_outreach
                 SET is_resolved = 1
                 WHERE customer_id = ? AND batch_id = ?
-            """, (customer_id, batch_id))
-            logger.info("customer_marked_resolved", customer_id=customer_id, batch_id=batch_id)
+            """, customers)
     
     def get_active_declined_customers(
         self,
         batch_id: Optional[str] = None
-    ) -> List[Dict[str, Any]]:
-        """Get all active (unresolved) declined customers."""
+    ) -> List[sqlite3.Row]:
+        """
+        Get all active (unresolved) declined customers.
+        
+        Rows are returned as fetched (``sqlite3.Row``: index by column name
+        or call ``dict(row)``) rather than copied into dicts.
+        """
         with self._get_connection() as conn:
             cursor = conn.cursor()
             
@@ -322,8 +563,7 @@ class BatchDatabase:
                     ORDER BY current_priority DESC, first_declined_at ASC
                 """)
             
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
+            return cursor.fetchall()
     
     def is_repeat_decline(self, customer_id: str, batch_id: str) -> bool:
         """Check if customer has declined before."""
@@ -340,8 +580,8 @@ class BatchDatabase:
         self,
         customer_id: str,
         batch_id: Optional[str] = None
-    ) -> List[Dict[str, Any]]:
-        """Get outreach history for a customer."""
+    ) -> List[sqlite3.Row]:
+        """Get outreach history for a customer (``sqlite3.Row`` per entry)."""
         with self._get_connection() as conn:
             cursor = conn.cursor()
             
@@ -358,7 +598,26 @@ class BatchDatabase:
                     ORDER BY outreach_date DESC
                 """, (customer_id,))
             
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
+            return cursor.fetchall()
+
+
+# Shared batch tracking database; one connection pool serves every orchestrator
+_batch_database: Optional[BatchDatabase] = None
+
+
+def get_batch_database() -> BatchDatabase:
+    """Get or create the shared batch tracking database."""
+    global _batch_database
+    if _batch_database is None:
+        _batch_database = BatchDatabase(Path("data/batch_tracking.db"))
+    return _batch_database
+
+
+def close_batch_database() -> None:
+    """Close the shared batch tracking database on application shutdown."""
+    global _batch_database
+    if _batch_database is not None:
+        _batch_database.close()
+        _batch_database = None
 
 
@@ -9,8 +9,9 @@ Coordinates:
 - Daily priority-based outreach (calls, SMS, email)
 """
 
+import asyncio
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 from pathlib import Path
 import structlog
 
@@ -18,10 +19,26 @@ from src.services.declined_payment_processor import DeclinedPaymentProcessor
 from src.services.priority_calculator import PriorityCalculator, OutreachPriority
 from src.services.fontis_client import FontisClient
 from src.services.outbound_call_service import get_outbound_service
-from src.services.batch_database import BatchDatabase
+from src.services.batch_database import BatchDatabase, get_batch_database
+from src.services.cache import memoize
 
 logger = structlog.get_logger(__name__)
 
+# Outreach rows buffered before a single-transaction write
+OUTREACH_FLUSH_SIZE = 500
+
+# Customers whose Fontis lookups and outreach run at the same time
+OUTREACH_CONCURRENCY = 20
+
+# Outreach action -> (outreach_type, success, default priority, results bucket, counter).
+# Successful outreach keeps the priority reported by the result when present.
+ACTION_MAP: Dict[str, Tuple[str, bool, str, str, str]] = {
+    "call_initiated": ("call", True, "high", "high_priority", "calls_initiated"),
+    "call_failed": ("call", False, "high", "high_priority", "calls_failed"),
+    "sms_sent": ("sms", True, "medium", "medium_priority", "sms_sent"),
+    "sms_failed": ("sms", False, "medium", "medium_priority", "sms_failed"),
+}
+
 
 class BatchOrchestrator:
     """Orchestrate declined payment batch processing and outreach."""
@@ -31,7 +48,7 @@ class BatchOrchestrator:
         self.processor = DeclinedPaymentProcessor(fontis_client)
         self.priority_calc = PriorityCalculator(fontis_client)
         self.outbound_service = get_outbound_service()
-        self.db = BatchDatabase(db_path or Path("data/batch_tracking.db"))
+        self.db = BatchDatabase(db_path) if db_path else get_batch_database()
     
     async def process_batch_csv(
         self,
@@ -63,19 +80,23 @@ class BatchOrchestrator:
             csv_filename=csv_path.name
         )
         
-        # Record customer declines in database
+        # Record customer declines in database (one lookup, one write)
         matched_customers = result.get("matched_customers", [])
+        prior_counts = self.db.get_prior_decline_counts(
+            [customer["customer_id"] for customer in matched_customers],
+            exclude_batch_id=batch_id
+        )
+        decline_records = []
         for customer in matched_customers:
-            # Check if repeat decline
-            is_repeat = self.db.is_repeat_decline(customer["customer_id"], batch_id)
-            priority = "high" if is_repeat else "medium"  # Initial priority
-            
-            self.db.record_customer_decline(
-                customer_id=customer["customer_id"],
-                batch_id=batch_id,
-                declined_amount=customer["declined_amount"],
-                priority=priority
-            )
+            prior_count = prior_counts.get(customer["customer_id"])
+            is_repeat = prior_count is not None
+            decline_records.append({
+                "customer_id": customer["customer_id"],
+                "declined_amount": customer["declined_amount"],
+                "priority": "high" if is_repeat else "medium",  # Initial priority
+                "repeat_decline_count": prior_count + 1 if is_repeat else 0
+            })
+        self.db.bulk_record_customer_declines(batch_id, decline_records)
         
         return {
             **result,
@@ -128,95 +149,127 @@ class BatchOrchestrator:
             },
             "total_processed": 0
         }
+        pending_outreach: List[tuple] = []
+        paid_customers: List[tuple] = []
         
-        for customer_record in active_customers:
-            customer_id = customer_record["customer_id"]
-            batch_id_record = customer_record["batch_id"]
-            declined_amount = customer_record["declined_amount"]
-            is_repeat = customer_record["repeat_decline_count"] > 0
-            
-            # Get customer details for outreach
-            try:
-                customer_details = await self.fontis.get_customer_details(customer_id)
-                if not customer_details.get("success"):
-                    continue
-                
-                customer_data = customer_details.get("data", {})
-                customer_name = customer_data.get("name", "Customer")
-                customer_phone = customer_data.get("contact", {}).get("phoneNumber")
-                
-                if not customer_phone:
-                    continue
-                
-                # Get delivery ID
-                delivery_id = await self.priority_calc._get_primary_delivery_id(customer_id)
-                
-                # Process outreach
-                outreach_result = await self.process_customer_outreach(
-                    customer_id=customer_id,
-                    delivery_id=delivery_id,
-                    declined_amount=declined_amount,
-                    customer_name=customer_name,
-                    customer_phone=customer_phone,
-                    is_repeat_decline=is_repeat,
-                    batch_id=batch_id_record
-                )
-                
-                # Record outreach in database
-                if outreach_result.get("action") == "call_initiated":
-                    self.db.record_outreach(
-                        customer_id=customer_id,
-                        batch_id=batch_id_record,
-                        outreach_type="call",
-                        priority=outreach_result.get("priority", "high"),
-                        call_id=outreach_result.get("call_id"),
-                        success=True
-                    )
-                    results["high_priority"]["calls_initiated"] += 1
-                elif outreach_result.get("action") == "call_failed":
-                    self.db.record_outreach(
-                        customer_id=customer_id,
-                        batch_id=batch_id_record,
-                        outreach_type="call",
-                        priority="high",
-                        success=False,
-                        error_message=outreach_result.get("error")
-                    )
-                    results["high_priority"]["calls_failed"] += 1
-                elif outreach_result.get("action") == "sms_sent":
-                    self.db.record_outreach(
-                        customer_id=customer_id,
-                        batch_id=batch_id_record,
-                        outreach_type="sms",
-                        priority=outreach_result.get("priority", "medium"),
-                        sms_id=outreach_result.get("sms_id"),
-                        success=True
-                    )
-                    results["medium_priority"]["sms_sent"] += 1
-                elif outreach_result.get("action") == "sms_failed":
-                    self.db.record_outreach(
-                        customer_id=customer_id,
-                        batch_id=batch_id_record,
-                        outreach_type="sms",
-                        priority="medium",
-                        success=False,
-                        error_message=outreach_result.get("error")
-                    )
-                    results["medium_priority"]["sms_failed"] += 1
-                elif outreach_result.get("action") == "skipped":
-                    if outreach_result.get("reason") == "payment_already_received":
+        # Fetch details and run outreach for many customers concurrently;
+        # results are recorded as each customer finishes and database writes
+        # stay in this task, flushed every OUTREACH_FLUSH_SIZE rows.
+        semaphore = asyncio.Semaphore(OUTREACH_CONCURRENCY)
+        # Per-run memo of Fontis lookups; a customer can appear in several batches
+        lookups: Dict[tuple, asyncio.Future] = {}
+        
+        async def _bounded(customer_record: Mapping[str, Any]) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                return await self._handle_customer(customer_record, lookups)
+        
+        pending = {
+            asyncio.ensure_future(_bounded(record)): record
+            for record in active_customers
+        }
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    customer_record = pending.pop(task)
+                    customer_id = customer_record["customer_id"]
+                    batch_id_record = customer_record["batch_id"]
+                    
+                    if task.cancelled():
+                        outreach_result = asyncio.CancelledError()
+                    else:
+                        outreach_result = task.exception() or task.result()
+                    
+                    if isinstance(outreach_result, BaseException):
+                        logger.error("customer_outreach_error", customer_id=customer_id, error=repr(outreach_result))
+                        continue
+                    if outreach_result is None:
+                        continue
+                    
+                    # Record outreach in database
+                    action = outreach_result.get("action")
+                    outcome = ACTION_MAP.get(action)
+                    if outcome is not None:
+                        outreach_type, success, priority, bucket, counter = outcome
+                        if success:
+                            priority = outreach_result.get("priority", priority)
+                        pending_outreach.append((
+                            customer_id, batch_id_record, outreach_type, priority,
+                            outreach_result.get("call_id"), outreach_result.get("sms_id"),
+                            success, outreach_result.get("error")
+                        ))
+                        results[bucket][counter] += 1
+                    elif action == "skipped" and outreach_result.get("reason") == "payment_already_received":
+                        paid_customers.append((customer_id, batch_id_record))
                         results["high_priority"]["skipped_paid"] += 1
                         results["medium_priority"]["skipped_paid"] += 1
                         results["low_priority"]["skipped_paid"] += 1
+                    
+                    results["total_processed"] += 1
                 
-                results["total_processed"] += 1
-                
-            except Exception as e:
-                logger.error("customer_outreach_error", customer_id=customer_id, error=str(e))
-                continue
+                if len(pending_outreach) >= OUTREACH_FLUSH_SIZE:
+                    self.db.bulk_record_outreach(pending_outreach)
+                    pending_outreach.clear()
+        finally:
+            # Interrupted runs stop outstanding outreach but still record
+            # everything already sent; resolved customers drop out of
+            # get_active_declined_customers next run
+            for task in pending:
+                task.cancel()
+            self.db.bulk_record_outreach(pending_outreach)
+            self.db.bulk_mark_resolved(paid_customers)
         
         return results
     
+    async def _handle_customer(
+        self,
+        customer_record: Mapping[str, Any],
+        lookups: Dict[tuple, asyncio.Future]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Look up one active customer and run their outreach.
+        
+        Args:
+            customer_record: Active customer_outreach row
+            lookups: Run-scoped memo shared by all customers in the run
+        
+        Returns:
+            Outreach result, or None when the customer cannot be contacted
+        """
+        customer_id = customer_record["customer_id"]
+        
+        # Get customer details for outreach
+        customer_details = await memoize(
+            lookups, ("details", customer_id),
+            lambda: self.fontis.get_customer_details(customer_id)
+        )
+        if not customer_details.get("success"):
+            return None
+        
+        customer_data = customer_details.get("data", {})
+        customer_name = customer_data.get("name", "Customer")
+        customer_phone = customer_data.get("contact", {}).get("phoneNumber")
+        
+        if not customer_phone:
+            return None
+        
+        # Get delivery ID
+        delivery_id = await memoize(
+            lookups, ("delivery_id", customer_id),
+            lambda: self.priority_calc._get_primary_delivery_id(customer_id)
+        )
+        
+        # Process outreach
+        return await self.process_customer_outreach(
+            customer_id=customer_id,
+            delivery_id=delivery_id,
+            declined_amount=customer_record["declined_amount"],
+            customer_name=customer_name,
+            customer_phone=customer_phone,
+            is_repeat_decline=customer_record["repeat_decline_count"] > 0,
+            batch_id=customer_record["batch_id"]
+        )
+    
     async def process_customer_outreach(
         self,
         customer_id: str,
@@ -224,11 +277,15 @@ class BatchOrchestrator:
         declined_amount: float,
         customer_name: str,
         customer_phone: str,
-        is_repeat_decline: bool = False
+        is_repeat_decline: bool = False,
+        batch_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Process outreach for a single customer based on current priority.
         
+        The caller records the returned action in the database, in bulk
+        (process_daily_outreach) or with record_outreach_result().
+        
         Args:
             customer_id: Fontis customer ID
             delivery_id: Delivery ID
@@ -236,6 +293,7 @@ class BatchOrchestrator:
             customer_name: Customer name
             customer_phone: Customer phone number
             is_repeat_decline: True if repeat decline
+            batch_id: Batch the decline belongs to (for logging)
         
         Returns:
             Outreach result
@@ -247,10 +305,8 @@ class BatchOrchestrator:
             is_repeat_decline=is_repeat_decline
         )
         
-        # Skip if already paid
+        # Skip if already paid (the caller marks the customer resolved)
         if not priority_result.payment_still_due:
-            if batch_id:
-                self.db.mark_customer_resolved(customer_id, batch_id)
             return {
                 "customer_id": customer_id,
                 "action": "skipped",
@@ -267,16 +323,6 @@ class BatchOrchestrator:
                 "priority": priority_result.priority.value
             }
         
-        # Update priority in database if changed
-        if batch_id:
-            current_records = self.db.get_active_declined_customers(batch_id=batch_id)
-            for record in current_records:
-                if record["customer_id"] == customer_id:
-                    if record["current_priority"] != priority_result.priority.value:
-                        # Priority changed - will be updated in record_outreach
-                        pass
-                    break
-        
         # Execute outreach based on priority
         if priority_result.should_call():
             return await self._initiate_call(
@@ -285,7 +331,8 @@ class BatchOrchestrator:
                 customer_phone=customer_phone,
                 declined_amount=declined_amount,
                 total_due=priority_result.total_due,
-                days_until_delivery=priority_result.days_until_delivery
+                days_until_delivery=priority_result.days_until_delivery,
+                batch_id=batch_id
             )
         elif priority_result.should_sms():
             return await self._send_followup_sms(
@@ -294,7 +341,8 @@ class BatchOrchestrator:
                 customer_phone=customer_phone,
                 declined_amount=declined_amount,
                 total_due=priority_result.total_due,
-                days_until_delivery=priority_result.days_until_delivery
+                days_until_delivery=priority_result.days_until_delivery,
+                batch_id=batch_id
             )
         else:
             return {
@@ -304,6 +352,39 @@ class BatchOrchestrator:
                 "message": "Email will be sent via email service"
             }
     
+    def record_outreach_result(
+        self,
+        customer_id: str,
+        batch_id: str,
+        outreach_result: Mapping[str, Any]
+    ):
+        """
+        Record one process_customer_outreach() result outside a daily run.
+        
+        Calls and SMS go to outreach_history; a customer who has already
+        paid is marked resolved.
+        
+        Args:
+            customer_id: Fontis customer ID
+            batch_id: Batch the decline belongs to
+            outreach_result: Result returned by process_customer_outreach()
+        """
+        action = outreach_result.get("action")
+        outcome = ACTION_MAP.get(action)
+        if outcome is not None:
+            outreach_type, success, priority, _, _ = outcome
+            if success:
+                priority = outreach_result.get("priority", priority)
+            self.db.record_outreach(
+                customer_id, batch_id, outreach_type, priority,
+                call_id=outreach_result.get("call_id"),
+                sms_id=outreach_result.get("sms_id"),
+                success=success,
+                error_message=outreach_result.get("error")
+            )
+        elif action == "skipped" and outreach_result.get("reason") == "payment_already_received":
+            self.db.mark_customer_resolved(customer_id, batch_id)
+    
     async def _initiate_call(
         self,
         customer_id: str,
@@ -311,7 +392,8 @@ class BatchOrchestrator:
         customer_phone: str,
         declined_amount: float,
         total_due: float,
-        days_until_delivery: Optional[int]
+        days_until_delivery: Optional[int],
+        batch_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """Initiate AI call for high-priority customer."""
         try:
@@ -331,16 +413,6 @@ class BatchOrchestrator:
                 customer_data=customer_data
             )
             
-            # Record outreach
-            self.db.record_outreach(
-                customer_id=customer_id,
-                batch_id=batch_id or "unknown",
-                outreach_type="call",
-                priority="high",
-                call_id=call_result.get("id"),
-                success=True
-            )
-            
             return {
                 "customer_id": customer_id,
                 "action": "call_initiated",
@@ -349,7 +421,7 @@ class BatchOrchestrator:
                 "priority": "high"
             }
         except Exception as e:
-            logger.error("call_initiation_failed", customer_id=customer_id, error=str(e))
+            logger.error("call_initiation_failed", customer_id=customer_id, batch_id=batch_id, error=str(e))
             return {
                 "customer_id": customer_id,
                 "action": "call_failed",
@@ -364,7 +436,8 @@ class BatchOrchestrator:
         customer_phone: str,
         declined_amount: float,
         total_due: float,
-        days_until_delivery: Optional[int]
+        days_until_delivery: Optional[int],
+        batch_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """Send follow-up SMS for medium-priority customer."""
         try:
@@ -391,16 +464,6 @@ class BatchOrchestrator:
                 }
             )
             
-            # Record outreach
-            self.db.record_outreach(
-                customer_id=customer_id,
-                batch_id=batch_id or "unknown",
-                outreach_type="sms",
-                priority="medium",
-                sms_id=sms_result.get("id"),
-                success=True
-            )
-            
             return {
                 "customer_id": customer_id,
                 "action": "sms_sent",
@@ -408,7 +471,7 @@ class BatchOrchestrator:
                 "priority": "medium"
             }
         except Exception as e:
-            logger.error("sms_send_failed", customer_id=customer_id, error=str(e))
+            logger.error("sms_send_failed", customer_id=customer_id, batch_id=batch_id, error=str(e))
             return {
                 "customer_id": customer_id,
                 "action": "sms_failed",
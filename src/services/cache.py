@@ -3,12 +3,31 @@ Simple in-memory cache for Fontis API responses.
 Reduces response time from 4-6s to < 1s for repeated searches.
 """
 
+import asyncio
+import heapq
+import threading
 import time
-from typing import Any, Optional
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+# Expired entries evicted proactively per get/set call
+EVICTIONS_PER_CALL = 4
+
+NS_PER_SECOND = 1_000_000_000
+
+
+class _Entry:
+    """Cached value with its absolute expiry time (time.monotonic_ns())."""
+    
+    __slots__ = ("value", "expiry", "negative")
+    
+    def __init__(self, value: Any, expiry: int, negative: bool = False):
+        self.value = value
+        self.expiry = expiry
+        self.negative = negative
 
 
 class SimpleCache:
-    """Thread-safe in-memory cache with TTL."""
+    """Thread-safe in-memory cache with TTL; get_or_compute() is asyncio-only."""
     
     def __init__(self, ttl_seconds: int = 300):
         """
@@ -17,8 +36,14 @@ class SimpleCache:
         Args:
             ttl_seconds: Time to live for cache entries (default 5 minutes)
         """
-        self._cache: dict[str, tuple[Any, float]] = {}
+        self._cache: dict[str, _Entry] = {}
         self._ttl = ttl_seconds
+        # (expiry, key) min-heap so one-shot keys are evicted without a read
+        self._heap: list[tuple[int, str]] = []
+        # Guards _cache and _heap; held only for dict/heap updates, never across awaits
+        self._lock = threading.Lock()
+        # key -> fetch currently running in get_or_compute()
+        self._inflight: dict[str, asyncio.Future] = {}
     
     def get(self, key: str) -> Optional[Any]:
         """
@@ -30,17 +55,51 @@ class SimpleCache:
         Returns:
             Cached value or None if not found/expired
         """
-        if key not in self._cache:
-            return None
-        
-        value, timestamp = self._cache[key]
-        
-        # Check if expired
-        if time.time() - timestamp > self._ttl:
-            del self._cache[key]
-            return None
-        
-        return value
+        entry = self._lookup(key)
+        return None if entry is None else entry.value
+    
+    def is_negative(self, key: str) -> bool:
+        """Check whether key holds an unexpired negative (known-missing) entry."""
+        entry = self._lookup(key)
+        return entry is not None and entry.negative
+    
+    def _lookup(self, key: str) -> Optional[_Entry]:
+        """Return the unexpired entry for key, evicting it if expired."""
+        now = time.monotonic_ns()
+        with self._lock:
+            self._evict_expired(now)
+            
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            
+            # Check if expired
+            if entry.expiry < now:
+                self._cache.pop(key, None)
+                return None
+            
+            return entry
+    
+    def _store(self, key: str, value: Any, ttl: float, negative: bool) -> None:
+        """Store an entry expiring ttl seconds from now."""
+        now = time.monotonic_ns()
+        expiry = now + int(ttl * NS_PER_SECOND)
+        with self._lock:
+            self._evict_expired(now)
+            self._cache[key] = _Entry(value, expiry, negative)
+            heapq.heappush(self._heap, (expiry, key))
+    
+    def _evict_expired(self, now: int) -> None:
+        """Evict a bounded number of entries whose expiry has passed (lock held)."""
+        heap = self._heap
+        for _ in range(EVICTIONS_PER_CALL):
+            if not heap or heap[0][0] >= now:
+                return
+            _, key = heapq.heappop(heap)
+            # The key may have been set again since this heap entry was pushed
+            entry = self._cache.get(key)
+            if entry is not None and entry.expiry < now:
+                self._cache.pop(key, None)
     
     def set(self, key: str, value: Any) -> None:
         """
@@ -50,17 +109,103 @@ class SimpleCache:
             key: Cache key
             value: Value to cache
         """
-        self._cache[key] = (value, time.time())
+        self._store(key, value, self._ttl, False)
+    
+    def set_negative(self, key: str, short_ttl: int = 10) -> None:
+        """
+        Remember that key has no value, for a shorter TTL than normal entries.
+        
+        Args:
+            key: Cache key
+            short_ttl: Seconds before the lookup may be retried
+        """
+        self._store(key, None, short_ttl, True)
+    
+    async def get_or_compute(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[Any]],
+        is_negative: Callable[[Any], bool] = lambda value: value is None,
+        negative_ttl: int = 10
+    ) -> Optional[Any]:
+        """
+        Get value from cache, computing it with factory() on a miss.
+        
+        Concurrent callers for the same key share one in-flight factory()
+        call, which runs to completion even if a caller is cancelled.
+        Results for which is_negative() is true are cached as negative
+        entries and returned as None. Exceptions are not cached. Coalescing
+        applies to callers on the same event loop.
+        
+        Args:
+            key: Cache key
+            factory: Coroutine function producing the value
+            is_negative: Whether a computed value means "not found"
+            negative_ttl: TTL for negative entries
+            
+        Returns:
+            Cached or computed value, or None for a negative entry
+        """
+        entry = self._lookup(key)
+        if entry is not None:
+            return entry.value
+        
+        future = self._inflight.get(key)
+        if future is None:
+            future = self._inflight[key] = asyncio.ensure_future(
+                self._compute(key, factory, is_negative, negative_ttl)
+            )
+        # A cancelled caller must not cancel the fetch the others wait on
+        return await asyncio.shield(future)
+    
+    async def _compute(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[Any]],
+        is_negative: Callable[[Any], bool],
+        negative_ttl: int
+    ) -> Optional[Any]:
+        """Run factory() for get_or_compute() and cache its result."""
+        try:
+            value = await factory()
+        finally:
+            self._inflight.pop(key, None)
+        
+        if is_negative(value):
+            self.set_negative(key, negative_ttl)
+            return None
+        self.set(key, value)
+        return value
     
     def clear(self) -> None:
         """Clear all cache entries."""
-        self._cache.clear()
+        with self._lock:
+            self._cache.clear()
+            self._heap.clear()
+        self._inflight.clear()
     
     def size(self) -> int:
         """Get number of cached entries."""
         return len(self._cache)
 
 
+def memoize(
+    cache: Dict[tuple, asyncio.Future],
+    key: tuple,
+    factory: Callable[[], Awaitable[Any]]
+) -> asyncio.Future:
+    """
+    Return the shared future for key, starting factory() on first use.
+    
+    Caching the future rather than the result also deduplicates lookups
+    that are still in flight in concurrent tasks.
+    """
+    future = cache.get(key)
+    if future is None:
+        future = cache[key] = asyncio.ensure_future(factory())
+    return future
+
+
 # Global cache instance
 # TTL of 60 seconds for customer searches (balance between freshness and speed)
 customer_search_cache = SimpleCache(ttl_seconds=60)
@@ -15,50 +15,159 @@ Workflow:
 8. Pre-call validation → Check account active, delivery date, payment status
 """
 
+import asyncio
 import csv
+import operator
 import re
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 from pathlib import Path
 import structlog
 
+from src.services.cache import customer_search_cache, memoize
 from src.services.fontis_client import FontisClient
 from src.services.outbound_call_service import get_outbound_service
 from src.core.exceptions import FontisAPIError
 
 logger = structlog.get_logger(__name__)
 
+# Everything that is not a digit, stripped from CSV phone numbers
+_NON_DIGIT = re.compile(r'\D')
+
+# CSV columns read into a DeclinedPaymentRecord, in DeclinedPaymentRecord._assign order
+CSV_COLUMNS = (
+    "id",
+    "customer_id",
+    "amount",
+    "status",
+    "response_code",
+    "processor_response_text",
+    "billing_first_name",
+    "billing_last_name",
+    "billing_phone",
+    "billing_email",
+    "billing_address_line_1",
+    "billing_city",
+    "billing_state",
+    "billing_postal_code",
+    "created_at",
+)
+
+# Gateway response codes that mark a transaction as declined
+DECLINED_RESPONSE_CODES = frozenset({"200", "201", "202", "222", "223"})
+
+# Records matched against Fontis at the same time (each match makes several API calls)
+MATCH_CONCURRENCY = 10
+
+# Day 0 SMS messages sent at the same time
+SMS_CONCURRENCY = 20
+
+DAY_ZERO_SMS_TEMPLATE = (
+    "Hi {name}, this is Fontis Water. "
+    "We had an issue processing a payment of ${amount:.2f}. "
+    "Your current balance is ${total_due:.2f}. "
+    "Please update your payment method at fontisweb.com or call us at "
+    "(678) 303-4022 to avoid service interruption."
+)
+
 
 class DeclinedPaymentRecord:
     """Parsed declined payment record from CSV."""
     
+    __slots__ = (
+        "transaction_id",
+        "customer_id_csv",
+        "amount",
+        "status",
+        "response_code",
+        "processor_response",
+        "billing_first_name",
+        "billing_last_name",
+        "billing_phone",
+        "billing_email",
+        "billing_address_line_1",
+        "billing_city",
+        "billing_state",
+        "billing_postal_code",
+        "created_at",
+        "batch_id",
+        "full_name",
+        "full_address",
+    )
+    
     def __init__(self, row: Dict[str, str]):
-        self.transaction_id = row.get("id", "")
-        self.customer_id_csv = row.get("customer_id", "")  # May not be Fontis ID
-        self.amount = float(row.get("amount", 0) or 0)
-        self.status = row.get("status", "").lower()
-        self.response_code = row.get("response_code", "")
-        self.processor_response = row.get("processor_response_text", "")
+        # Bound once; this runs for every CSV row
+        get = row.get
+        self._assign(*[get(name, "") for name in CSV_COLUMNS])
+    
+    @classmethod
+    def from_values(
+        cls,
+        values: Sequence[str],
+        batch_id: Optional[str] = None
+    ) -> "DeclinedPaymentRecord":
+        """Build a record from raw column values in CSV_COLUMNS order."""
+        record = cls.__new__(cls)
+        record._assign(*values)
+        record.batch_id = batch_id
+        return record
+    
+    def _assign(
+        self,
+        transaction_id: str,
+        customer_id: str,
+        amount: str,
+        status: str,
+        response_code: str,
+        processor_response: str,
+        first_name: str,
+        last_name: str,
+        phone: str,
+        email: str,
+        address_line_1: str,
+        city: str,
+        state: str,
+        postal_code: str,
+        created_at: str
+    ) -> None:
+        """Set fields from raw CSV values."""
+        self.transaction_id = transaction_id
+        self.customer_id_csv = customer_id  # May not be Fontis ID
+        self.amount = float(amount or 0)
+        self.status = status.lower()
+        self.response_code = response_code
+        self.processor_response = processor_response
         
         # Customer contact info
-        self.billing_first_name = row.get("billing_first_name", "").strip()
-        self.billing_last_name = row.get("billing_last_name", "").strip()
-        self.billing_phone = self._normalize_phone(row.get("billing_phone", ""))
-        self.billing_email = row.get("billing_email", "").strip().lower()
-        self.billing_address_line_1 = row.get("billing_address_line_1", "").strip()
-        self.billing_city = row.get("billing_city", "").strip()
-        self.billing_state = row.get("billing_state", "").strip()
-        self.billing_postal_code = row.get("billing_postal_code", "").strip()
-        
-        self.created_at = row.get("created_at", "")
+        self.billing_first_name = first_name.strip()
+        self.billing_last_name = last_name.strip()
+        self.billing_phone = self._normalize_phone(phone)
+        self.billing_email = email.strip().lower()
+        self.billing_address_line_1 = address_line_1.strip()
+        self.billing_city = city.strip()
+        self.billing_state = state.strip()
+        self.billing_postal_code = postal_code.strip()
+        
+        self.created_at = created_at
         self.batch_id = None  # Set during CSV processing
+        
+        # Derived once; used for matching and in the processing summary
+        self.full_name = f"{self.billing_first_name} {self.billing_last_name}".strip()
+        self.full_address = ", ".join(
+            p for p in (
+                self.billing_address_line_1,
+                self.billing_city,
+                self.billing_state,
+                self.billing_postal_code
+            ) if p
+        )
     
     def _normalize_phone(self, phone: str) -> str:
         """Normalize phone to E.164 format."""
         if not phone:
             return ""
         # Remove all non-digits
-        digits = re.sub(r'\D', '', phone)
+        digits = _NON_DIGIT.sub('', phone)
         # Add +1 if 10 digits, assume US
         if len(digits) == 10:
             return f"+1{digits}"
@@ -66,30 +175,25 @@ class DeclinedPaymentRecord:
             return f"+{digits}"
         return phone
     
-    @property
-    def full_name(self) -> str:
-        """Full customer name."""
-        return f"{self.billing_first_name} {self.billing_last_name}".strip()
-    
-    @property
-    def full_address(self) -> str:
-        """Full address string for matching."""
-        parts = [
-            self.billing_address_line_1,
-            self.billing_city,
-            self.billing_state,
-            self.billing_postal_code
-        ]
-        return ", ".join([p for p in parts if p])
-    
     def is_declined(self) -> bool:
         """Check if transaction is declined."""
-        return self.status == "declined" and self.response_code in ["200", "201", "202", "222", "223"]
+        return self.status == "declined" and self.response_code in DECLINED_RESPONSE_CODES
 
 
 class CustomerMatchResult:
     """Result of customer matching process."""
     
+    __slots__ = (
+        "matched",
+        "customer_id",
+        "delivery_id",
+        "match_method",
+        "confidence",
+        "total_due",
+        "customer_name",
+        "customer_phone",
+    )
+    
     def __init__(
         self,
         matched: bool,
@@ -117,6 +221,9 @@ class DeclinedPaymentProcessor:
     def __init__(self, fontis_client: FontisClient):
         self.fontis = fontis_client
         self.outbound_service = get_outbound_service()
+        self.search_cache = customer_search_cache
+        # Per-file memo of balance/delivery lookups; reset by process_csv_file
+        self._lookups: Dict[tuple, asyncio.Future] = {}
     
     async def process_csv_file(self, csv_path: Path, batch_id: str) -> Dict[str, Any]:
         """
@@ -131,14 +238,21 @@ class DeclinedPaymentProcessor:
         """
         logger.info("processing_declined_payment_csv", batch_id=batch_id, file=str(csv_path))
         
-        # Parse CSV
-        records = self._parse_csv(csv_path, batch_id)
-        declined_records = [r for r in records if r.is_declined()]
+        # A customer can match several records or search strategies in one file
+        self._lookups = {}
+        
+        # Parse CSV, keeping only declined records
+        total_records = 0
+        declined_records = []
+        for record in self._parse_csv(csv_path, batch_id):
+            total_records += 1
+            if record.is_declined():
+                declined_records.append(record)
         
         logger.info(
             "csv_parsed",
             batch_id=batch_id,
-            total_records=len(records),
+            total_records=total_records,
             declined_count=len(declined_records)
         )
         
@@ -146,19 +260,26 @@ class DeclinedPaymentProcessor:
             return {
                 "success": True,
                 "batch_id": batch_id,
-                "total_records": len(records),
+                "total_records": total_records,
                 "declined_count": 0,
                 "matched_count": 0,
                 "unmatched_count": 0,
                 "message": "No declined payments found in CSV"
             }
         
-        # Match customers
+        # Match customers concurrently; records are independent of each other
+        semaphore = asyncio.Semaphore(MATCH_CONCURRENCY)
+        
+        async def _bounded(record: DeclinedPaymentRecord) -> CustomerMatchResult:
+            async with semaphore:
+                return await self._match_customer(record)
+        
+        match_results = await asyncio.gather(*(_bounded(r) for r in declined_records))
+        
         matched_customers = []
         unmatched_records = []
         
-        for record in declined_records:
-            match_result = await self._match_customer(record)
+        for record, match_result in zip(declined_records, match_results):
             if match_result.matched:
                 matched_customers.append({
                     "record": record,
@@ -180,7 +301,7 @@ class DeclinedPaymentProcessor:
         return {
             "success": True,
             "batch_id": batch_id,
-            "total_records": len(records),
+            "total_records": total_records,
             "declined_count": len(declined_records),
             "matched_count": len(matched_customers),
             "unmatched_count": len(unmatched_records),
@@ -208,18 +329,27 @@ class DeclinedPaymentProcessor:
             ]
         }
     
-    def _parse_csv(self, csv_path: Path, batch_id: str) -> List[DeclinedPaymentRecord]:
-        """Parse CSV file and extract declined payment records."""
-        records = []
-        
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
+    def _parse_csv(self, csv_path: Path, batch_id: str) -> Iterator[DeclinedPaymentRecord]:
+        """Parse CSV file, yielding one payment record per row."""
+        with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if not header:
+                return
+            
+            # Rows are padded to the header width plus one blank cell,
+            # which columns missing from this export read from
+            width = len(header)
+            index = {name: i for i, name in enumerate(header)}
+            pick = operator.itemgetter(*(index.get(name, width) for name in CSV_COLUMNS))
+            
             for row in reader:
-                record = DeclinedPaymentRecord(row)
-                record.batch_id = batch_id
-                records.append(record)
-        
-        return records
+                if not row:
+                    continue
+                if len(row) != width:
+                    row = (row + [""] * width)[:width]
+                row.append("")
+                yield DeclinedPaymentRecord.from_values(pick(row), batch_id)
     
     async def _match_customer(
         self,
@@ -234,22 +364,39 @@ class DeclinedPaymentProcessor:
         """
         # Try phone first
         if record.billing_phone:
-            match = await self._match_by_phone(record.billing_phone, record.amount)
+            match = await self._match_by_search(
+                record.billing_phone,
+                record.amount,
+                match_method="phone",
+                confidence="high",
+                customer_phone=record.billing_phone
+            )
             if match.matched:
                 return match
         
         # Try email
         if record.billing_email:
-            match = await self._match_by_email(record.billing_email, record.amount)
+            match = await self._match_by_search(
+                record.billing_email,
+                record.amount,
+                match_method="email",
+                confidence="high"
+            )
             if match.matched:
                 return match
         
-        # Try name + address
+        # Try name + address: search by address (more specific), then filter
+        # by name; short parts (initials, "Jr") are ignored
         if record.full_name and record.full_address:
-            match = await self._match_by_name_address(
-                record.full_name,
+            name_parts = [part for part in record.full_name.lower().split() if len(part) > 2]
+            match = await self._match_by_search(
                 record.full_address,
-                record.amount
+                record.amount,
+                match_method="name_address",
+                confidence="medium",
+                post_filter=lambda customer: all(
+                    part in customer.get("name", "").lower() for part in name_parts
+                )
             )
             if match.matched:
                 return match
@@ -263,122 +410,40 @@ class DeclinedPaymentProcessor:
         )
         return CustomerMatchResult(matched=False)
     
-    async def _match_by_phone(
+    async def _match_by_search(
         self,
-        phone: str,
-        declined_amount: float
-    ) -> CustomerMatchResult:
-        """Match customer by phone number."""
-        try:
-            # Search by phone
-            response = await self.fontis.search_customers(phone)
-            if not response.get("success"):
-                return CustomerMatchResult(matched=False)
-            
-            customers = self._extract_customers(response)
-            if not customers:
-                return CustomerMatchResult(matched=False)
-            
-            # Try to match by balance validation
-            for customer in customers:
-                customer_id = customer.get("customerId")
-                if not customer_id:
-                    continue
-                
-                # Validate match via balance API
-                balance_match = await self._validate_balance_match(
-                    customer_id,
-                    declined_amount
-                )
-                if balance_match:
-                    delivery_id = await self._get_primary_delivery_id(customer_id)
-                    return CustomerMatchResult(
-                        matched=True,
-                        customer_id=customer_id,
-                        delivery_id=delivery_id,
-                        match_method="phone",
-                        confidence="high",
-                        total_due=balance_match,
-                        customer_name=customer.get("name"),
-                        customer_phone=phone
-                    )
-            
-            return CustomerMatchResult(matched=False)
-        except Exception as e:
-            logger.error("phone_match_error", phone=phone, error=str(e))
-            return CustomerMatchResult(matched=False)
-    
-    async def _match_by_email(
-        self,
-        email: str,
-        declined_amount: float
+        search_term: str,
+        declined_amount: float,
+        match_method: str,
+        confidence: str,
+        post_filter: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        customer_phone: Optional[str] = None
     ) -> CustomerMatchResult:
-        """Match customer by email address."""
+        """
+        Match customer by searching Fontis for a contact term.
+        
+        The first candidate that passes post_filter and whose balance
+        validates against the declined amount is the match.
+        
+        Args:
+            search_term: Phone, email or address to search for
+            declined_amount: Amount that was declined
+            match_method: "phone", "email" or "name_address"
+            confidence: Confidence reported for a match
+            post_filter: Optional check a candidate customer must pass
+            customer_phone: Phone to report; defaults to the customer's contact phone
+        """
         try:
-            response = await self.fontis.search_customers(email)
-            if not response.get("success"):
-                return CustomerMatchResult(matched=False)
-            
-            customers = self._extract_customers(response)
-            if not customers:
-                return CustomerMatchResult(matched=False)
+            customers = await self._search_customers(search_term)
             
             for customer in customers:
                 customer_id = customer.get("customerId")
                 if not customer_id:
                     continue
-                
-                balance_match = await self._validate_balance_match(
-                    customer_id,
-                    declined_amount
-                )
-                if balance_match:
-                    delivery_id = await self._get_primary_delivery_id(customer_id)
-                    return CustomerMatchResult(
-                        matched=True,
-                        customer_id=customer_id,
-                        delivery_id=delivery_id,
-                        match_method="email",
-                        confidence="high",
-                        total_due=balance_match,
-                        customer_name=customer.get("name"),
-                        customer_phone=customer.get("contact", {}).get("phoneNumber")
-                    )
-            
-            return CustomerMatchResult(matched=False)
-        except Exception as e:
-            logger.error("email_match_error", email=email, error=str(e))
-            return CustomerMatchResult(matched=False)
-    
-    async def _match_by_name_address(
-        self,
-        name: str,
-        address: str,
-        declined_amount: float
-    ) -> CustomerMatchResult:
-        """Match customer by name and address."""
-        try:
-            # Try searching by address first (more specific)
-            response = await self.fontis.search_customers(address)
-            if not response.get("success"):
-                return CustomerMatchResult(matched=False)
-            
-            customers = self._extract_customers(response)
-            if not customers:
-                return CustomerMatchResult(matched=False)
-            
-            # Filter by name match
-            name_parts = name.lower().split()
-            for customer in customers:
-                customer_name = customer.get("name", "").lower()
-                # Check if name parts match
-                if not all(part in customer_name for part in name_parts if len(part) > 2):
-                    continue
-                
-                customer_id = customer.get("customerId")
-                if not customer_id:
+                if post_filter is not None and not post_filter(customer):
                     continue
                 
+                # Validate match via balance API
                 balance_match = await self._validate_balance_match(
                     customer_id,
                     declined_amount
@@ -389,16 +454,16 @@ class DeclinedPaymentProcessor:
                         matched=True,
                         customer_id=customer_id,
                         delivery_id=delivery_id,
-                        match_method="name_address",
-                        confidence="medium",
+                        match_method=match_method,
+                        confidence=confidence,
                         total_due=balance_match,
                         customer_name=customer.get("name"),
-                        customer_phone=customer.get("contact", {}).get("phoneNumber")
+                        customer_phone=customer_phone or customer.get("contact", {}).get("phoneNumber")
                     )
             
             return CustomerMatchResult(matched=False)
         except Exception as e:
-            logger.error("name_address_match_error", name=name, address=address, error=str(e))
+            logger.error(f"{match_method}_match_error", search_term=search_term, error=str(e))
             return CustomerMatchResult(matched=False)
     
     async def _validate_balance_match(
@@ -412,26 +477,40 @@ class DeclinedPaymentProcessor:
         
         Returns total_due if match is valid, None otherwise.
         """
+        total_due = await memoize(
+            self._lookups, ("balance", customer_id),
+            lambda: self._get_total_due(customer_id)
+        )
+        
+        # Match if balance is within tolerance of declined amount
+        # (account may have accrued additional charges)
+        if total_due is not None and total_due >= (declined_amount - tolerance):
+            return total_due
+        
+        return None
+    
+    async def _get_total_due(self, customer_id: str) -> Optional[float]:
+        """Get customer's total due balance, or None if it cannot be fetched."""
         try:
             response = await self.fontis.get_account_balances(customer_id)
             if not response.get("success"):
                 return None
             
             data = response.get("data", {})
-            total_due = float(data.get("totalDueBalance", 0) or 0)
-            
-            # Match if balance is within tolerance of declined amount
-            # (account may have accrued additional charges)
-            if total_due >= (declined_amount - tolerance):
-                return total_due
-            
-            return None
+            return float(data.get("totalDueBalance", 0) or 0)
         except Exception as e:
             logger.error("balance_validation_error", customer_id=customer_id, error=str(e))
             return None
     
     async def _get_primary_delivery_id(self, customer_id: str) -> Optional[str]:
-        """Get primary delivery ID for customer."""
+        """Get primary delivery ID for customer (memoized per file)."""
+        return await memoize(
+            self._lookups, ("delivery_id", customer_id),
+            lambda: self._fetch_primary_delivery_id(customer_id)
+        )
+    
+    async def _fetch_primary_delivery_id(self, customer_id: str) -> Optional[str]:
+        """Fetch primary delivery ID for customer."""
         try:
             response = await self.fontis.get_delivery_stops(customer_id, take=1)
             if not response.get("success"):
@@ -446,6 +525,35 @@ class DeclinedPaymentProcessor:
             logger.error("delivery_id_fetch_error", customer_id=customer_id, error=str(e))
             return None
     
+    async def _search_customers(self, term: str) -> List[Dict[str, Any]]:
+        """
+        Search Fontis customers by term, once per unique term per file.
+        
+        Households often have several declined rows with the same phone or
+        email; the per-file memo keeps that to one search per contact key
+        even when processing outlives the shared cache's TTL.
+        """
+        return await memoize(
+            self._lookups, ("search", term),
+            lambda: self._fetch_customers(term)
+        )
+    
+    async def _fetch_customers(self, term: str) -> List[Dict[str, Any]]:
+        """
+        Search Fontis customers by term through the shared search cache.
+        
+        Failed or empty searches are cached as negative entries, so a bad
+        phone/email seen again in a later batch is not searched right away.
+        """
+        response = await self.search_cache.get_or_compute(
+            f"match:{term}",
+            lambda: self.fontis.search_customers(term),
+            is_negative=lambda r: not r.get("success") or not self._extract_customers(r)
+        )
+        if response is None:
+            return []
+        return self._extract_customers(response)
+    
     def _extract_customers(self, response: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Extract customer list from API response."""
         data_field = response.get("data", {})
@@ -460,50 +568,69 @@ class DeclinedPaymentProcessor:
         matched_customers: List[Dict[str, Any]]
     ) -> Dict[str, int]:
         """Send Day 0 SMS to all matched customers."""
-        sent = 0
-        failed = 0
+        semaphore = asyncio.Semaphore(SMS_CONCURRENCY)
         
-        for item in matched_customers:
-            record = item["record"]
-            match = item["match"]
-            
-            if not match.customer_phone:
-                failed += 1
-                continue
-            
-            message = (
-                f"Hi {match.customer_name or 'there'}, this is Fontis Water. "
-                f"We had an issue processing a payment of ${record.amount:.2f}. "
-                f"Your current balance is ${match.total_due:.2f}. "
-                f"Please update your payment method at fontisweb.com or call us at "
-                f"(678) 303-4022 to avoid service interruption."
-            )
-            
-            try:
-                await self.outbound_service.send_sms(
-                    customer_phone=match.customer_phone,
-                    message=message,
-                    customer_data={
-                        "customer_id": match.customer_id,
-                        "declined_amount": record.amount,
-                        "total_due": match.total_due
-                    }
-                )
-                sent += 1
-                logger.info(
-                    "day_zero_sms_sent",
-                    customer_id=match.customer_id,
-                    phone=match.customer_phone
-                )
-            except Exception as e:
-                failed += 1
+        async def _bounded(item: Dict[str, Any]) -> bool:
+            async with semaphore:
+                return await self._send_day_zero_sms_to(item["record"], item["match"])
+        
+        results = await asyncio.gather(
+            *(_bounded(item) for item in matched_customers),
+            return_exceptions=True
+        )
+        
+        sent = 0
+        for item, result in zip(matched_customers, results):
+            if isinstance(result, Exception):
+                # Unexpected errors count as failures without cancelling other sends
                 logger.error(
-                    "day_zero_sms_failed",
-                    customer_id=match.customer_id,
-                    phone=match.customer_phone,
-                    error=str(e)
+                    "day_zero_sms_error",
+                    customer_id=item["match"].customer_id,
+                    error=str(result)
                 )
+            elif result:
+                sent += 1
+        
+        return {"sent": sent, "failed": len(results) - sent}
+    
+    async def _send_day_zero_sms_to(
+        self,
+        record: DeclinedPaymentRecord,
+        match: CustomerMatchResult
+    ) -> bool:
+        """Send the Day 0 SMS for one matched customer; True if it was sent."""
+        if not match.customer_phone:
+            return False
+        
+        message = DAY_ZERO_SMS_TEMPLATE.format(
+            name=match.customer_name or "there",
+            amount=record.amount,
+            total_due=match.total_due
+        )
         
-        return {"sent": sent, "failed": failed}
+        try:
+            await self.outbound_service.send_sms(
+                customer_phone=match.customer_phone,
+                message=message,
+                customer_data={
+                    "customer_id": match.customer_id,
+                    "declined_amount": record.amount,
+                    "total_due": match.total_due
+                }
+            )
+            logger.info(
+                "day_zero_sms_sent",
+                customer_id=match.customer_id,
+                phone=match.customer_phone
+            )
+            return True
+        except Exception as e:
+            logger.error(
+                "day_zero_sms_failed",
+                customer_id=match.customer_id,
+                phone=match.customer_phone,
+                error=str(e)
+            )
+            return False
 
 
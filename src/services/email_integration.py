@@ -5,17 +5,326 @@ Monitors email inbox for declined payment CSV attachments.
 Supports IMAP for receiving emails.
 """
 
-import email
+import asyncio
 import imaplib
+import json
+import re
+import socket
+import time
+import weakref
+from collections import deque
+from email.header import decode_header, make_header
 from pathlib import Path
-from typing import List, Optional, Dict
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 from datetime import datetime
 import structlog
 
-from src.services.email_monitor import CSVEmailMonitor
+from src.services.email_monitor import CSVEmailMonitor, CsvAttachment
 
 logger = structlog.get_logger(__name__)
 
+# Messages requested per IMAP FETCH command
+FETCH_CHUNK_SIZE = 100
+
+# IDLE is re-issued before the server's 30 minute inactivity timeout (RFC 2177)
+IDLE_RENEW_SECONDS = 29 * 60
+
+# Seconds between checks when the server does not support IDLE
+POLL_INTERVAL_SECONDS = 300
+
+# Open IMAP connections kept per account
+IMAP_POOL_SIZE = 4
+
+# Pooled connections idle longer than this are checked with NOOP before reuse
+IMAP_KEEPALIVE_SECONDS = 25 * 60
+
+# Per-folder (UIDVALIDITY, highest settled UID) for each consumer, kept in
+# the download directory
+UID_STATE_FILENAME = ".imap_state.{consumer}.json"
+
+# UIDs per STORE/MOVE command, keeping command lines within server limits
+UID_SET_CHUNK_SIZE = 1000
+
+# Tokens of an IMAP FETCH response: parentheses, quoted strings and atoms
+_IMAP_TOKEN = re.compile(rb'\(|\)|"(?:[^"\\]|\\.)*"|[^\s()"]+')
+_LITERAL_MARKER = re.compile(rb'\{\d+\}$')
+_FETCH_START = re.compile(rb'\d+ \(')
+
+
+def _parse_fetch_items(msg_data: list) -> Iterator[Tuple[bytes, list]]:
+    """
+    Yield (message number, parsed FETCH item list) from an imaplib FETCH response.
+    
+    Strings become str, NIL becomes None and parenthesized lists become
+    lists. Literals ({n} markers, which imaplib returns as separate tuple
+    elements) are spliced back in as raw bytes.
+    """
+    groups: List[Tuple[bytes, list]] = []
+    for item in msg_data:
+        text, literal = item if isinstance(item, tuple) else (item, None)
+        if not text:
+            continue
+        if _FETCH_START.match(text):
+            number, text = text.split(None, 1)
+            groups.append((number, []))
+        elif not groups:
+            continue
+        
+        tokens = groups[-1][1]
+        tokens.extend(_IMAP_TOKEN.findall(_LITERAL_MARKER.sub(b"", text)))
+        if literal is not None:
+            # Marked so a literal "(" or "NIL" is not mistaken for syntax
+            tokens.append(_Literal(literal))
+    
+    for number, tokens in groups:
+        stack: List[list] = [[]]
+        for token in tokens:
+            if isinstance(token, _Literal):
+                stack[-1].append(bytes(token))
+            elif token == b"(":
+                stack.append([])
+            elif token == b")":
+                if len(stack) > 1:
+                    closed = stack.pop()
+                    stack[-1].append(closed)
+            elif token.upper() == b"NIL":
+                stack[-1].append(None)
+            elif token.startswith(b'"'):
+                stack[-1].append(re.sub(rb'\\(.)', rb'\1', token[1:-1]).decode("utf-8", "replace"))
+            else:
+                stack[-1].append(token.decode("ascii", "replace"))
+        
+        items = stack[0][0] if stack[0] and isinstance(stack[0][0], list) else []
+        yield number, items
+
+
+class _Literal(bytes):
+    """IMAP literal payload kept apart from parsed syntax tokens."""
+
+
+def _fetch_item(items: list, name: str) -> Optional[Any]:
+    """Return the value of a FETCH data item such as BODYSTRUCTURE."""
+    for key, value in zip(items[::2], items[1::2]):
+        if isinstance(key, str) and key.upper() == name:
+            return value
+    return None
+
+
+def _iter_attachment_parts(
+    structure: list,
+    part_number: str = ""
+) -> Iterator[Tuple[str, str, str]]:
+    """
+    Yield (part number, filename, transfer encoding) for each named leaf part.
+    
+    Args:
+        structure: Parsed BODYSTRUCTURE
+        part_number: Section number of structure ("" for the message itself)
+    """
+    if structure and isinstance(structure[0], list):
+        # Multipart: child bodies come first, then the subtype and extensions
+        index = 0
+        for child in structure:
+            if not isinstance(child, list):
+                break
+            index += 1
+            child_number = f"{part_number}.{index}" if part_number else str(index)
+            yield from _iter_attachment_parts(child, child_number)
+        return
+    
+    if len(structure) < 7:
+        return
+    
+    params = _param_dict(structure[2])
+    filename = None
+    # The disposition ("attachment" ("filename" ...)) follows the basic fields
+    for extension in structure[7:]:
+        if (
+            isinstance(extension, list)
+            and len(extension) == 2
+            and isinstance(extension[0], str)
+            and (extension[1] is None or isinstance(extension[1], list))
+        ):
+            filename = _param_dict(extension[1]).get("filename")
+            break
+    filename = filename or params.get("name")
+    if filename:
+        encoding = structure[5] if isinstance(structure[5], str) else "7bit"
+        yield part_number or "1", str(make_header(decode_header(filename))), encoding.lower()
+
+
+def _param_dict(params: Optional[list]) -> Dict[str, str]:
+    """Turn a BODYSTRUCTURE ("key" "value" ...) parameter list into a dict."""
+    if not isinstance(params, list):
+        return {}
+    return {
+        str(key).lower(): value.decode("utf-8", "replace") if isinstance(value, bytes) else value
+        for key, value in zip(params[::2], params[1::2])
+        if isinstance(value, (str, bytes))
+    }
+
+
+# Folder and UIDVALIDITY last selected on each (possibly pooled) connection
+_selected_folders: "weakref.WeakKeyDictionary[imaplib.IMAP4, Tuple[str, Optional[int]]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _ensure_selected(conn: imaplib.IMAP4, folder: str) -> Optional[int]:
+    """
+    SELECT a folder unless it is already the connection's selected folder.
+    
+    The selection is remembered per connection, so it survives the
+    connection being returned to the pool and borrowed again.
+    
+    Returns:
+        The folder's UIDVALIDITY, or None if the server did not report one
+    """
+    selected = _selected_folders.get(conn)
+    if selected and selected[0] == folder:
+        return selected[1]
+    
+    _selected_folders.pop(conn, None)
+    status, _ = conn.select(folder)
+    if status != "OK":
+        raise imaplib.IMAP4.error(f"SELECT {folder} failed: {status}")
+    _, validity_data = conn.response("UIDVALIDITY")
+    uid_validity = int(validity_data[0]) if validity_data and validity_data[0] else None
+    _selected_folders[conn] = (folder, uid_validity)
+    return uid_validity
+
+
+class ImapConnectionPool:
+    """
+    Logged-in IMAP connections kept open between checks.
+    
+    Saves the TLS handshake and LOGIN on every connect(). Connections idle
+    longer than IMAP_KEEPALIVE_SECONDS are checked with NOOP before reuse
+    and replaced if the server has dropped them.
+    """
+    
+    def __init__(
+        self,
+        imap_server: str,
+        imap_port: int,
+        email_address: str,
+        email_password: str,
+        size: int = IMAP_POOL_SIZE
+    ):
+        """
+        Initialize connection pool.
+        
+        Args:
+            imap_server: IMAP server hostname
+            imap_port: IMAP port
+            email_address: Login username
+            email_password: Login password
+            size: Maximum number of open connections
+        """
+        self.imap_server = imap_server
+        self.imap_port = imap_port
+        self.email_address = email_address
+        self.email_password = email_password
+        self.size = size
+        self._opened = 0
+        # (connection, monotonic time it was returned)
+        self._idle: asyncio.Queue = asyncio.Queue()
+    
+    def _open(self) -> imaplib.IMAP4_SSL:
+        """Open and log in a new connection."""
+        conn = imaplib.IMAP4_SSL(self.imap_server, self.imap_port)
+        try:
+            conn.login(self.email_address, self.email_password)
+        except Exception:
+            conn.shutdown()
+            raise
+        return conn
+    
+    async def acquire(self, wait: bool = True) -> Optional[imaplib.IMAP4_SSL]:
+        """
+        Borrow a connection, opening one if the pool is not yet full.
+        
+        Args:
+            wait: Wait for a connection to be released when the pool is
+                exhausted; if False, return None instead
+        """
+        while True:
+            try:
+                conn, returned_at = self._idle.get_nowait()
+            except asyncio.QueueEmpty:
+                if self._opened < self.size:
+                    self._opened += 1
+                    try:
+                        return await asyncio.to_thread(self._open)
+                    except Exception:
+                        self._opened -= 1
+                        raise
+                if not wait:
+                    return None
+                conn, returned_at = await self._idle.get()
+            
+            if time.monotonic() - returned_at < IMAP_KEEPALIVE_SECONDS:
+                return conn
+            try:
+                await asyncio.to_thread(conn.noop)
+                return conn
+            except Exception:
+                self.release(conn, discard=True)
+    
+    def release(self, conn: imaplib.IMAP4_SSL, discard: bool = False):
+        """
+        Return a borrowed connection.
+        
+        Args:
+            conn: Connection from acquire()
+            discard: Log out instead of reusing (e.g. after a protocol error)
+        """
+        if not discard:
+            self._idle.put_nowait((conn, time.monotonic()))
+            return
+        
+        self._opened -= 1
+        try:
+            conn.logout()
+        except Exception:
+            pass
+    
+    def close(self):
+        """Log out all idle connections."""
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            self.release(conn, discard=True)
+
+
+# Pools shared by all services using the same account
+_imap_pools: Dict[Tuple[str, int, str], ImapConnectionPool] = {}
+
+
+def get_imap_pool(
+    imap_server: str,
+    imap_port: int,
+    email_address: str,
+    email_password: str
+) -> ImapConnectionPool:
+    """Get or create the connection pool for an IMAP account."""
+    key = (imap_server, imap_port, email_address)
+    pool = _imap_pools.get(key)
+    if pool is None:
+        pool = _imap_pools[key] = ImapConnectionPool(
+            imap_server, imap_port, email_address, email_password
+        )
+    return pool
+
+
+def close_imap_pools() -> None:
+    """Log out all pooled IMAP connections on application shutdown."""
+    for pool in _imap_pools.values():
+        pool.close()
+    _imap_pools.clear()
+
 
 class EmailIntegrationService:
     """Email service for monitoring CSV batch files."""
@@ -26,7 +335,9 @@ class EmailIntegrationService:
         imap_port: int,
         email_address: str,
         email_password: str,
-        download_dir: Path
+        download_dir: Path,
+        pool: Optional[ImapConnectionPool] = None,
+        consumer: str = "default"
     ):
         """
         Initialize email integration service.
@@ -37,116 +348,466 @@ class EmailIntegrationService:
             email_address: Email address to monitor
             email_password: Email password or app password
             download_dir: Directory to save CSV files
+            pool: Connection pool (default: shared pool for this account)
+            consumer: Name of the caller; each consumer keeps its own UID
+                cursor and processed batches, so callers sharing a download
+                directory do not consume each other's mail
         """
         self.imap_server = imap_server
         self.imap_port = imap_port
         self.email_address = email_address
         self.email_password = email_password
-        self.monitor = CSVEmailMonitor(download_dir)
+        self.monitor = CSVEmailMonitor(download_dir, consumer)
+        self._uid_state_path = Path(download_dir) / UID_STATE_FILENAME.format(consumer=consumer)
+        self.pool = pool or get_imap_pool(imap_server, imap_port, email_address, email_password)
         self._imap_connection: Optional[imaplib.IMAP4_SSL] = None
     
     async def connect(self) -> bool:
-        """Connect to IMAP server."""
+        """Borrow a logged-in connection from the pool."""
         try:
-            self._imap_connection = imaplib.IMAP4_SSL(self.imap_server, self.imap_port)
-            self._imap_connection.login(self.email_address, self.email_password)
+            self._imap_connection = await self.pool.acquire()
             logger.info("email_connected", server=self.imap_server)
             return True
         except Exception as e:
             logger.error("email_connection_failed", error=str(e))
             return False
     
-    def disconnect(self):
-        """Disconnect from IMAP server."""
+    def disconnect(self, discard: bool = False):
+        """
+        Return the connection to the pool.
+        
+        Args:
+            discard: Log out instead of keeping the connection for reuse
+        """
         if self._imap_connection:
-            try:
-                self._imap_connection.close()
-                self._imap_connection.logout()
-            except Exception:
-                pass
-            finally:
-                self._imap_connection = None
+            self.pool.release(self._imap_connection, discard=discard)
+            self._imap_connection = None
+    
+    def close(self):
+        """Return the connection to the pool and close the monitor's database."""
+        self.disconnect()
+        self.monitor.close()
     
     async def check_for_new_csvs(
         self,
         folder: str = "INBOX",
         since_date: Optional[datetime] = None
-    ) -> List[Dict[str, any]]:
+    ) -> List[CsvAttachment]:
         """
         Check email inbox for new CSV attachments.
         
+        Only messages with a UID above the stored cursor are searched, unless
+        the folder's UIDVALIDITY has changed since. The cursor only moves past
+        messages that have no unprocessed batch CSV, so a returned batch is
+        found again until the caller marks it processed with
+        monitor.mark_processed().
+        
         Args:
             folder: Email folder to check (default: INBOX)
             since_date: Only check emails since this date
         
         Returns:
-            List of CSV file info dictionaries
+            Saved CSV attachments
         """
         if not self._imap_connection:
             if not await self.connect():
                 return []
         
         try:
-            self._imap_connection.select(folder)
+            uid_validity = _ensure_selected(self._imap_connection, folder)
             
-            # Build search criteria
-            search_criteria = "ALL"
-            if since_date:
-                date_str = since_date.strftime("%d-%b-%Y")
-                search_criteria = f'SINCE "{date_str}"'
+            last_uid = 0
+            stored = self._load_uid_state().get(folder)
+            if uid_validity is not None and stored and stored[0] == uid_validity:
+                last_uid = stored[1]
             
-            # Search for emails
-            status, message_numbers = self._imap_connection.search(None, search_criteria)
+            # Search for emails; the server ANDs the criteria
+            search_criteria = self._build_search_criteria(since_date)
+            if last_uid:
+                search_criteria = ["UID", f"{last_uid + 1}:*"] + search_criteria
+            status, message_numbers = self._imap_connection.uid("SEARCH", None, *search_criteria)
             if status != "OK":
                 logger.error("email_search_failed", status=status)
                 return []
             
-            csv_files = []
-            message_ids = message_numbers[0].split()
+            # "n:*" always matches the highest UID, even when it is below n
+            message_ids = [uid for uid in message_numbers[0].split() if int(uid) > last_uid]
+            
+            # Fetch messages in chunks: one round trip per chunk, not per message
+            chunks = [
+                message_ids[start:start + FETCH_CHUNK_SIZE]
+                for start in range(0, len(message_ids), FETCH_CHUNK_SIZE)
+            ]
+            csv_files, unsettled = await self._fetch_chunks(chunks, folder)
+            
+            # Skip settled messages next time: everything below the first
+            # message with a CSV still to be processed (or not yet read)
+            unsettled += [int(csv_file.email_id) for csv_file in csv_files]
+            if uid_validity is not None and message_ids:
+                settled_uid = min(unsettled) - 1 if unsettled else max(int(uid) for uid in message_ids)
+                if settled_uid > last_uid:
+                    self._save_uid_state(folder, uid_validity, settled_uid)
+            
+            logger.info("csv_check_complete", found_count=len(csv_files))
+            return csv_files
+        
+        except Exception as e:
+            logger.error("csv_check_failed", error=str(e))
+            if isinstance(e, (imaplib.IMAP4.abort, OSError)):
+                # Broken connection: don't hand it back to the pool
+                self.disconnect(discard=True)
+            return []
+    
+    async def _fetch_chunks(
+        self,
+        chunks: List[List[bytes]],
+        folder: str
+    ) -> Tuple[List[CsvAttachment], List[int]]:
+        """
+        Fetch message chunks concurrently over pooled connections.
+        
+        The current connection always takes part; extra connections are only
+        borrowed if the pool has one free, each selecting the folder once.
+        Workers pull chunks from a shared queue, so a connection that cannot
+        be borrowed simply leaves its share to the others. A worker whose
+        connection breaks puts its chunk back and stops; the connection is
+        discarded, and chunks no worker is left to fetch count as unread.
+        
+        Returns:
+            Saved CSV attachments in message order, and the UIDs of messages
+            that could not be read
+        """
+        results: List[List[CsvAttachment]] = [[] for _ in chunks]
+        pending = deque(enumerate(chunks))
+        failed: List[int] = []
+        
+        async def drain(conn: imaplib.IMAP4_SSL):
+            while pending:
+                index, chunk = pending.popleft()
+                try:
+                    results[index], unread = await asyncio.to_thread(self._fetch_csv_attachments, conn, chunk)
+                    failed.extend(unread)
+                except (imaplib.IMAP4.abort, OSError):
+                    # Broken connection: leave the chunk to the other workers
+                    pending.appendleft((index, chunk))
+                    raise
+                except Exception as e:
+                    failed.extend(int(uid) for uid in chunk)
+                    logger.error("email_fetch_failed", first_msg_id=chunk[0], count=len(chunk), error=str(e))
+        
+        async def drain_pooled():
+            conn = await self.pool.acquire(wait=False)
+            if conn is None:
+                return
+            discard = False
+            try:
+                await asyncio.to_thread(_ensure_selected, conn, folder)
+                await drain(conn)
+            except Exception as e:
+                logger.error("email_fetch_connection_failed", error=str(e))
+                discard = True
+            finally:
+                self.pool.release(conn, discard=discard)
+        
+        async def drain_current():
+            try:
+                await drain(self._imap_connection)
+            except (imaplib.IMAP4.abort, OSError) as e:
+                logger.error("email_fetch_connection_failed", error=str(e))
+                self.disconnect(discard=True)
+        
+        extra_workers = min(self.pool.size, len(chunks)) - 1
+        await asyncio.gather(
+            drain_current(),
+            *(drain_pooled() for _ in range(extra_workers))
+        )
+        for _, chunk in pending:
+            failed.extend(int(uid) for uid in chunk)
+        csv_files = [csv_file for chunk_files in results for csv_file in chunk_files]
+        return csv_files, failed
+    
+    def _fetch_csv_attachments(
+        self,
+        conn: imaplib.IMAP4_SSL,
+        message_ids: List[bytes]
+    ) -> Tuple[List[CsvAttachment], List[int]]:
+        """
+        Download and save the batch CSV attachments of a chunk of messages.
+        
+        BODYSTRUCTURE is fetched first to find CSV parts by filename; only
+        those parts are then downloaded, with BODY.PEEK so messages are not
+        marked as read.
+        
+        Args:
+            conn: Connection with the folder selected
+            message_ids: Message UIDs
+        
+        Returns:
+            Saved CSV attachments, and the UIDs of messages whose CSV could
+            not be saved
+        """
+        status, msg_data = conn.uid("FETCH", b",".join(message_ids), "(BODYSTRUCTURE)")
+        if status != "OK":
+            raise imaplib.IMAP4.error(f"FETCH failed: {status}")
+        
+        # part number -> [(message UID, attachment info, transfer encoding)]
+        wanted: Dict[str, List[Tuple[str, CsvAttachment, str]]] = {}
+        for _, items in _parse_fetch_items(msg_data):
+            msg_id = _fetch_item(items, "UID")
+            try:
+                structure = _fetch_item(items, "BODYSTRUCTURE")
+                if not isinstance(structure, list):
+                    continue
+                for part, filename, encoding in _iter_attachment_parts(structure):
+                    attachment = self.monitor.match_csv_attachment(filename)
+                    if attachment:
+                        wanted.setdefault(part, []).append((msg_id, attachment, encoding))
+            except Exception as e:
+                logger.error("email_processing_error", msg_id=msg_id, error=str(e))
+        
+        csv_files = []
+        unsaved: List[int] = []
+        # Messages whose CSV sits at the same section share one FETCH
+        for part, targets in wanted.items():
+            message_set = ",".join(msg_id for msg_id, _, _ in targets)
+            status, msg_data = conn.uid("FETCH", message_set, f"(BODY.PEEK[{part}])")
+            if status != "OK":
+                raise imaplib.IMAP4.error(f"FETCH failed: {status}")
             
-            for msg_id in message_ids:
+            payloads = {
+                _fetch_item(items, "UID"): _fetch_item(items, f"BODY[{part}]")
+                for _, items in _parse_fetch_items(msg_data)
+            }
+            # Leave payloads as the only reference, so each encoded part is
+            # freed as soon as it has been decoded to disk
+            del msg_data
+            for msg_id, attachment, encoding in targets:
                 try:
-                    # Fetch email
-                    status, msg_data = self._imap_connection.fetch(msg_id, "(RFC822)")
-                    if status != "OK":
+                    payload = payloads.pop(msg_id, None)
+                    if not payload:
                         continue
+                    if isinstance(payload, str):
+                        payload = payload.encode()
                     
-                    # Parse email
-                    email_body = msg_data[0][1]
-                    email_message = email.message_from_bytes(email_body)
-                    
-                    # Extract CSV attachments
-                    attachments = self.monitor.extract_csv_attachments(email_message)
-                    
-                    for attachment in attachments:
-                        # Save CSV file
-                        file_path = self.monitor.save_csv_file(attachment)
-                        csv_files.append({
-                            **attachment,
-                            "file_path": file_path,
-                            "email_id": msg_id.decode()
-                        })
-                
+                    # Save CSV file, decoding the part as it is written
+                    if self.monitor.save_csv_file(attachment, payload, encoding) is None:
+                        continue
+                    attachment.email_id = msg_id
+                    csv_files.append(attachment)
                 except Exception as e:
+                    unsaved.append(int(msg_id))
                     logger.error("email_processing_error", msg_id=msg_id, error=str(e))
+        
+        return csv_files, unsaved
+    
+    async def idle_loop(
+        self,
+        on_csvs: Callable[[List[CsvAttachment]], Awaitable[None]],
+        folder: str = "INBOX",
+        since_date: Optional[datetime] = None,
+        poll_interval: float = POLL_INTERVAL_SECONDS
+    ):
+        """
+        Watch a folder and pass newly found CSVs to a callback until cancelled.
+        
+        Uses IMAP IDLE so the mailbox is only searched when the server
+        reports new mail; falls back to polling every poll_interval seconds
+        if the server does not advertise IDLE.
+        
+        Args:
+            on_csvs: Awaited with each non-empty check_for_new_csvs result.
+                Should mark handled batches processed so they are not
+                reported again.
+            folder: Email folder to watch (default: INBOX)
+            since_date: Only check emails since this date
+            poll_interval: Seconds between checks without IDLE support
+        """
+        while True:
+            try:
+                if not self._imap_connection and not await self.connect():
+                    await asyncio.sleep(poll_interval)
                     continue
+                
+                csv_files = await self.check_for_new_csvs(folder, since_date)
+                if csv_files:
+                    await on_csvs(csv_files)
+                
+                # A broken connection was discarded by the check; reconnect now
+                if not self._imap_connection:
+                    continue
+                
+                if "IDLE" not in self._imap_connection.capabilities:
+                    await asyncio.sleep(poll_interval)
+                    continue
+                
+                # Wait for an EXISTS push, renewing the IDLE until one arrives
+                _ensure_selected(self._imap_connection, folder)
+                while not await asyncio.to_thread(self._idle, IDLE_RENEW_SECONDS):
+                    pass
             
-            logger.info("csv_check_complete", found_count=len(csv_files))
-            return csv_files
+            except asyncio.CancelledError:
+                if self._imap_connection:
+                    # Wake an _idle thread blocked on the socket; the connection
+                    # may be mid-IDLE, so it must not go back to the pool.
+                    # Closing the file first would wait for the blocked read.
+                    try:
+                        self._imap_connection.sock.shutdown(socket.SHUT_RDWR)
+                    except OSError:
+                        pass
+                    self.disconnect(discard=True)
+                raise
+            except Exception as e:
+                logger.error("email_idle_failed", error=str(e))
+                self.disconnect(discard=True)
+                await asyncio.sleep(poll_interval)
+    
+    def _idle(self, timeout: float) -> bool:
+        """
+        Run one IMAP IDLE command on the selected folder.
         
-        except Exception as e:
-            logger.error("csv_check_failed", error=str(e))
-            return []
+        Blocks until the server reports new messages or timeout elapses.
+        
+        Returns:
+            True if the server sent an EXISTS response
+        """
+        conn = self._imap_connection
+        tag = conn._new_tag()
+        conn.send(tag + b" IDLE\r\n")
+        response = conn.readline()
+        if not response.startswith(b"+"):
+            raise imaplib.IMAP4.error(f"IDLE rejected: {response!r}")
+        
+        has_new = False
+        deadline = time.monotonic() + timeout
+        previous_timeout = conn.sock.gettimeout()
+        try:
+            while not has_new:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                # readline serves lines already in the file buffer before
+                # waiting on the socket, so a pushed EXISTS is never missed
+                conn.sock.settimeout(remaining)
+                try:
+                    line = conn.readline()
+                except TimeoutError:
+                    # A socket file refuses all reads after a timeout
+                    conn.file = conn.sock.makefile("rb")
+                    break
+                if not line:
+                    raise imaplib.IMAP4.abort("connection closed during IDLE")
+                has_new = line.rstrip().upper().endswith(b" EXISTS")
+        finally:
+            conn.sock.settimeout(previous_timeout)
+        
+        conn.send(b"DONE\r\n")
+        # Drain untagged responses up to the IDLE completion
+        while True:
+            line = conn.readline()
+            if not line:
+                raise imaplib.IMAP4.abort("connection closed during IDLE")
+            if line.startswith(tag):
+                break
+        
+        return has_new
+    
+    def _load_uid_state(self) -> Dict[str, List[int]]:
+        """Read {folder: [uidvalidity, highest settled UID]} from the sidecar file."""
+        try:
+            return json.loads(self._uid_state_path.read_text())
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_uid_state(self, folder: str, uid_validity: int, max_uid: int):
+        """Record the highest settled UID in a folder."""
+        state = self._load_uid_state()
+        state[folder] = [uid_validity, max_uid]
+        tmp_path = self._uid_state_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(state))
+        tmp_path.replace(self._uid_state_path)
+    
+    @staticmethod
+    def _build_search_criteria(since_date: Optional[datetime] = None) -> List[str]:
+        """
+        Build IMAP SEARCH criteria for messages that may carry a batch CSV.
+        
+        Attachments only travel in multipart messages, so plain-text mail is
+        filtered out server-side instead of being fetched and walked.
+        """
+        criteria = ["HEADER", "Content-Type", "multipart"]
+        if since_date:
+            date_str = since_date.strftime("%d-%b-%Y")
+            criteria += ["SINCE", f'"{date_str}"']
+        return criteria
     
     async def mark_email_read(self, email_id: str, folder: str = "INBOX"):
-        """Mark email as read."""
-        if not self._imap_connection:
+        """Mark email as read by its UID (a CsvAttachment's email_id)."""
+        await self.mark_emails_read([email_id], folder)
+    
+    async def mark_emails_read(self, email_ids: Sequence[str], folder: str = "INBOX"):
+        """
+        Mark emails as read with one STORE per UID_SET_CHUNK_SIZE UIDs.
+        
+        Args:
+            email_ids: Message UIDs
+            folder: Folder containing the messages
+        """
+        if not self._imap_connection or not email_ids:
             return
         
         try:
-            self._imap_connection.select(folder)
-            self._imap_connection.store(email_id, "+FLAGS", "\\Seen")
+            _ensure_selected(self._imap_connection, folder)
+            for uid_set in self._uid_sets(email_ids):
+                status, _ = self._imap_connection.uid("STORE", uid_set, "+FLAGS", "(\\Seen)")
+                if status != "OK":
+                    raise imaplib.IMAP4.error(f"STORE failed: {status}")
         except Exception as e:
-            logger.error("mark_read_failed", email_id=email_id, error=str(e))
+            logger.error("mark_read_failed", email_ids=list(email_ids), error=str(e))
+    
+    async def move_emails(self, email_ids: Sequence[str], destination: str, folder: str = "INBOX"):
+        """
+        Move emails to another folder, one command per UID_SET_CHUNK_SIZE UIDs.
+        
+        Uses MOVE (RFC 6851) when the server supports it, otherwise
+        COPY, STORE \\Deleted and EXPUNGE (UID EXPUNGE with UIDPLUS, so
+        other deleted messages are left alone).
+        
+        Args:
+            email_ids: Message UIDs
+            destination: Folder to move the messages to
+            folder: Folder containing the messages
+        """
+        if not self._imap_connection or not email_ids:
+            return
+        
+        capabilities = self._imap_connection.capabilities
+        try:
+            _ensure_selected(self._imap_connection, folder)
+            for uid_set in self._uid_sets(email_ids):
+                if "MOVE" in capabilities:
+                    status, _ = self._imap_connection.uid("MOVE", uid_set, destination)
+                    if status != "OK":
+                        raise imaplib.IMAP4.error(f"MOVE failed: {status}")
+                    continue
+                status, _ = self._imap_connection.uid("COPY", uid_set, destination)
+                if status != "OK":
+                    raise imaplib.IMAP4.error(f"COPY failed: {status}")
+                status, _ = self._imap_connection.uid("STORE", uid_set, "+FLAGS", "(\\Deleted)")
+                if status != "OK":
+                    raise imaplib.IMAP4.error(f"STORE failed: {status}")
+                if "UIDPLUS" in capabilities:
+                    status, _ = self._imap_connection.uid("EXPUNGE", uid_set)
+                else:
+                    status, _ = self._imap_connection.expunge()
+                if status != "OK":
+                    raise imaplib.IMAP4.error(f"EXPUNGE failed: {status}")
+        except Exception as e:
+            logger.error("move_emails_failed", email_ids=list(email_ids), destination=destination, error=str(e))
+    
+    @staticmethod
+    def _uid_sets(email_ids: Sequence[str]) -> Iterator[str]:
+        """Yield comma-joined UID sets of at most UID_SET_CHUNK_SIZE UIDs."""
+        for start in range(0, len(email_ids), UID_SET_CHUNK_SIZE):
+            yield ",".join(email_ids[start:start + UID_SET_CHUNK_SIZE])
 
 
@@ -5,15 +5,91 @@ Monitors email inbox for declined payment CSV attachments.
 File pattern: Batch_{BatchID}_{YYYYMMDDHHMMSS}_result.csv
 """
 
+import binascii
+import hashlib
+import quopri
 import re
-import email
+import sqlite3
+import threading
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional, Dict
+from typing import Iterator, Optional, Dict
 from datetime import datetime
 import structlog
 
 logger = structlog.get_logger(__name__)
 
+# Processed batch IDs and content hashes for each consumer, kept in the
+# download directory. Batch IDs are numeric (CSV_PATTERN), so they are
+# stored as the integer rowid key: no separate text index and 8-byte key
+# comparisons.
+PROCESSED_DB_FILENAME = ".processed.{consumer}.db"
+
+# Bytes of encoded attachment payload decoded per write
+SAVE_CHUNK_SIZE = 64 * 1024
+
+_BASE64_WHITESPACE = b" \t\r\n"
+
+SQL_CREATE_PROCESSED = """
+CREATE TABLE IF NOT EXISTS processed_batches (
+    batch_id INTEGER PRIMARY KEY,
+    processed_at TIMESTAMP NOT NULL,
+    content_sha256 BLOB
+)
+"""
+
+SQL_CREATE_PROCESSED_HASH_INDEX = """
+CREATE INDEX IF NOT EXISTS idx_processed_batches_sha256
+ON processed_batches(content_sha256)
+"""
+
+
+def _iter_decoded(payload: bytes, encoding: str) -> Iterator[bytes]:
+    """
+    Undo a MIME part's Content-Transfer-Encoding in SAVE_CHUNK_SIZE pieces.
+    
+    Args:
+        payload: Encoded part body as sent by the server
+        encoding: Transfer encoding ("base64", "quoted-printable", ...)
+    """
+    if encoding == "base64":
+        pending = b""
+        for start in range(0, len(payload), SAVE_CHUNK_SIZE):
+            data = pending + payload[start:start + SAVE_CHUNK_SIZE].translate(None, _BASE64_WHITESPACE)
+            # Only whole 4-character groups decode independently
+            usable = len(data) - len(data) % 4
+            pending = data[usable:]
+            yield binascii.a2b_base64(data[:usable])
+        if pending:
+            # Truncated or unpadded tail: pad it as email's own decoder does;
+            # a lone leftover character holds no whole byte and is dropped
+            if len(pending) % 4 == 1:
+                pending = pending[:-1]
+            yield binascii.a2b_base64(pending + b"=" * (-len(pending) % 4))
+    elif encoding == "quoted-printable":
+        start = 0
+        while start < len(payload):
+            # Cut after a line break so soft breaks ("=\r\n") stay whole
+            end = payload.rfind(b"\n", start, start + SAVE_CHUNK_SIZE) + 1
+            if end <= start or start + SAVE_CHUNK_SIZE >= len(payload):
+                end = start + SAVE_CHUNK_SIZE
+            yield quopri.decodestring(payload[start:end])
+            start = end
+    else:
+        for start in range(0, len(payload), SAVE_CHUNK_SIZE):
+            yield payload[start:start + SAVE_CHUNK_SIZE]
+
+
+@dataclass(slots=True)
+class CsvAttachment:
+    """A batch CSV attachment; file_path and email_id are set once it is saved."""
+    
+    filename: str
+    batch_id: str
+    timestamp: datetime
+    file_path: Optional[Path] = None
+    email_id: Optional[str] = None
+
 
 class CSVEmailMonitor:
     """Monitor email for declined payment CSV attachments."""
@@ -24,103 +100,153 @@ class CSVEmailMonitor:
         re.IGNORECASE,
     )
     
-    def __init__(self, download_dir: Path):
+    # Cheap rejects for the common non-batch attachment before the regex runs
+    CSV_PREFIX = "batch_"
+    CSV_MIN_LENGTH = len("Batch_0_YYYYMMDDHHMMSS_result.csv")
+    
+    def __init__(self, download_dir: Path, consumer: str = "default"):
         """
         Initialize email monitor.
         
         Args:
             download_dir: Directory to save downloaded CSV files
+            consumer: Name of the caller whose processed batches are tracked
         """
         self.download_dir = Path(download_dir)
         self.download_dir.mkdir(parents=True, exist_ok=True)
-        self.processed_files: set[str] = set()  # Track processed batch IDs
+        
+        # Processed batches survive restarts; attachments are saved from
+        # fetch worker threads, so the connection is shared under a lock
+        self._db = sqlite3.connect(
+            str(self.download_dir / PROCESSED_DB_FILENAME.format(consumer=consumer)),
+            check_same_thread=False,
+            isolation_level=None
+        )
+        self._db.execute(SQL_CREATE_PROCESSED)
+        self._db.execute(SQL_CREATE_PROCESSED_HASH_INDEX)
+        self._db_lock = threading.Lock()
+        # SHA-256 of saved, not yet processed batches
+        self._content_hashes: Dict[str, bytes] = {}
     
-    def extract_csv_attachments(
-        self,
-        email_message: email.message.Message
-    ) -> List[Dict[str, any]]:
+    def match_csv_attachment(self, filename: str) -> Optional[CsvAttachment]:
         """
-        Extract CSV attachments from email message.
+        Check an attachment filename against the batch CSV pattern.
+        
+        Called before the attachment is downloaded, so only unprocessed
+        batch CSVs are fetched from the mail server.
         
         Args:
-            email_message: Parsed email message
+            filename: Attachment filename
         
         Returns:
-            List of CSV attachment info:
-            {
-                "filename": str,
-                "batch_id": str,
-                "timestamp": datetime,
-                "content": bytes
-            }
+            CSV attachment, or None if the file is not a new batch CSV
         """
-        csv_attachments = []
+        # Check if matches CSV pattern
+        if len(filename) < self.CSV_MIN_LENGTH or filename[:6].lower() != self.CSV_PREFIX:
+            return None
+        match = self.CSV_PATTERN.match(filename)
+        if not match:
+            return None
         
-        for part in email_message.walk():
-            if part.get_content_disposition() == 'attachment':
-                filename = part.get_filename()
-                if not filename:
-                    continue
-                
-                # Check if matches CSV pattern
-                match = self.CSV_PATTERN.match(filename)
-                if match:
-                    batch_id = match.group(1)
-                    timestamp_str = match.group(2)
-                    
-                    # Parse timestamp
-                    try:
-                        timestamp = datetime.strptime(timestamp_str, "%Y%m%d%H%M%S")
-                    except ValueError:
-                        logger.warning("invalid_timestamp", filename=filename)
-                        continue
-                    
-                    # Skip if already processed
-                    if batch_id in self.processed_files:
-                        logger.info("batch_already_processed", batch_id=batch_id)
-                        continue
-                    
-                    # Extract content
-                    content = part.get_payload(decode=True)
-                    if content:
-                        csv_attachments.append({
-                            "filename": filename,
-                            "batch_id": batch_id,
-                            "timestamp": timestamp,
-                            "content": content
-                        })
+        batch_id = match.group(1)
+        timestamp_str = match.group(2)
         
-        return csv_attachments
+        # Parse timestamp; the pattern guarantees 14 digits, so slice
+        # instead of interpreting a strptime format on every call
+        try:
+            timestamp = datetime(
+                int(timestamp_str[0:4]),
+                int(timestamp_str[4:6]),
+                int(timestamp_str[6:8]),
+                int(timestamp_str[8:10]),
+                int(timestamp_str[10:12]),
+                int(timestamp_str[12:14])
+            )
+        except ValueError:
+            logger.warning("invalid_timestamp", filename=filename)
+            return None
+        
+        # Skip if already processed
+        if self.is_processed(batch_id):
+            logger.info("batch_already_processed", batch_id=batch_id)
+            return None
+        
+        return CsvAttachment(filename, batch_id, timestamp)
     
     def save_csv_file(
         self,
-        csv_data: Dict[str, any]
-    ) -> Path:
+        attachment: CsvAttachment,
+        payload: bytes,
+        transfer_encoding: str = "7bit"
+    ) -> Optional[Path]:
         """
         Save CSV attachment to disk.
         
+        The payload is decoded and hashed chunk by chunk while it is written,
+        so the decoded file is never held in memory.
+        
         Args:
-            csv_data: CSV attachment data from extract_csv_attachments
+            attachment: CSV attachment from match_csv_attachment; its
+                file_path is set once saved
+            payload: Encoded part body
+            transfer_encoding: Part Content-Transfer-Encoding
         
         Returns:
-            Path to saved file
+            Path to saved file, or None if it was empty or a processed batch
+            had identical content
         """
-        filename = csv_data["filename"]
-        file_path = self.download_dir / filename
+        file_path = self.download_dir / attachment.filename
+        tmp_path = file_path.with_name(file_path.name + ".part")
         
-        with open(file_path, 'wb') as f:
-            f.write(csv_data["content"])
+        sha256 = hashlib.sha256()
+        size = 0
+        with open(tmp_path, 'wb') as f:
+            for chunk in _iter_decoded(payload, transfer_encoding):
+                sha256.update(chunk)
+                f.write(chunk)
+                size += len(chunk)
+        if not size:
+            tmp_path.unlink()
+            return None
         
-        logger.info("csv_file_saved", file_path=str(file_path), batch_id=csv_data["batch_id"])
+        digest = sha256.digest()
+        with self._db_lock:
+            duplicate = self._db.execute(
+                "SELECT batch_id FROM processed_batches WHERE content_sha256 = ?",
+                (digest,)
+            ).fetchone()
+        if duplicate:
+            tmp_path.unlink()
+            logger.info("duplicate_csv_content", batch_id=attachment.batch_id, processed_batch_id=duplicate[0])
+            return None
+        self._content_hashes[attachment.batch_id] = digest
+        
+        tmp_path.replace(file_path)
+        attachment.file_path = file_path
+        logger.info("csv_file_saved", file_path=str(file_path), batch_id=attachment.batch_id)
         return file_path
     
     def mark_processed(self, batch_id: str):
         """Mark batch as processed."""
-        self.processed_files.add(batch_id)
+        with self._db_lock:
+            self._db.execute(
+                "INSERT OR IGNORE INTO processed_batches (batch_id, processed_at, content_sha256) VALUES (?, ?, ?)",
+                (int(batch_id), datetime.now().isoformat(), self._content_hashes.pop(batch_id, None))
+            )
         logger.info("batch_marked_processed", batch_id=batch_id)
     
     def is_processed(self, batch_id: str) -> bool:
         """Check if batch has been processed."""
-        return batch_id in self.processed_files
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT 1 FROM processed_batches WHERE batch_id = ?",
+                (int(batch_id),)
+            ).fetchone()
+        return row is not None
+    
+    def close(self):
+        """Close the processed-batches database."""
+        with self._db_lock:
+            self._db.close()
 
 
@@ -16,6 +16,8 @@ Design decisions:
 - Centralized _request method for DRY principle
 """
 
+from collections.abc import Sequence
+from datetime import date
 from typing import Any
 
 import httpx
@@ -415,7 +417,7 @@ class FontisClient:
         self,
         customer_id: str,
         invoice_key: str,
-        invoice_date: str,
+        invoice_date: date,
         include_signature: bool = False,
         include_payments: bool = False
     ) -> dict[str, Any]:
@@ -428,7 +430,7 @@ class FontisClient:
         Args:
             customer_id: Customer account number
             invoice_key: Invoice identifier
-            invoice_date: Invoice date (YYYY-MM-DD)
+            invoice_date: Invoice date (sent to Fontis as YYYY-MM-DD)
             include_signature: Include customer signature (default: False)
             include_payments: Include related payments (default: False)
         
@@ -444,7 +446,7 @@ class FontisClient:
             - Refer to customer service for PDF requests
         """
         payload = {
-            "invoiceDate": invoice_date,
+            "invoiceDate": invoice_date.isoformat(),
             "includeSignature": include_signature,
             "includePayments": include_payments
         }
@@ -663,7 +665,7 @@ class FontisClient:
         delivery_id: str,
         postal_code: str,
         internet_only: bool = True,
-        categories: list[str] | None = None,
+        categories: Sequence[str] | None = None,
         default_products: bool = False,
         offset: int = 0,
         take: int = 25
@@ -706,7 +708,7 @@ class FontisClient:
             "deliveryId": delivery_id,
             "internetOnly": internet_only,
             "includeInactive": False,
-            "categories": categories or [],
+            "categories": list(categories) if categories else [],
             "webProspect": "",
             "webProspectCatalogState": 0,
             "postalCode": postal_code,
@@ -995,7 +997,7 @@ class FontisClient:
     async def get_route_stops(
         self,
         route: str,
-        route_date: str,
+        route_date: date,
         account_number: str | None = None
     ) -> dict[str, Any]:
         """
@@ -1006,7 +1008,7 @@ class FontisClient:
         
         Args:
             route: Route code (e.g., "19")
-            route_date: Route date (YYYY-MM-DD)
+            route_date: Route date (sent to Fontis as YYYY-MM-DD)
             account_number: Optional - filter to specific customer
         
         Returns:
@@ -1031,7 +1033,7 @@ class FontisClient:
             - skipReason indicates why delivery was not completed
         """
         payload = {
-            "routeDate": route_date,
+            "routeDate": route_date.isoformat(),
             "route": route
         }
         
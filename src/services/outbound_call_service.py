@@ -27,34 +27,40 @@ class OutboundCallService:
         }
         self._phone_number_id: Optional[str] = None
         self.twilio_service = TwilioService()
+        
+        # Shared client so keep-alive connections are reused across calls
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self.headers,
+            timeout=httpx.Timeout(10.0),
+            limits=httpx.Limits(max_keepalive_connections=20)
+        )
     
     async def _get_phone_number_id(self) -> str:
         """Get Vapi phone number ID (cached)."""
         if self._phone_number_id:
             return self._phone_number_id
         
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                f"{self.base_url}/phone-number",
-                headers=self.headers
+        response = await self.client.get(
+            "/phone-number"
+        )
+        
+        if response.status_code != 200:
+            raise VapiError(
+                message="Failed to get phone number",
+                error_code=ErrorCode.VAPI_CALL_FAILED
             )
-            
-            if response.status_code != 200:
-                raise VapiError(
-                    message="Failed to get phone number",
-                    error_code=ErrorCode.VAPI_CALL_FAILED
-                )
-            
-            phones = response.json()
-            if not phones:
-                raise VapiError(
-                    message="No phone number found in Vapi account",
-                    error_code=ErrorCode.VAPI_CALL_FAILED
-                )
-            
-            self._phone_number_id = phones[0]["id"]
-            logger.info("phone_number_cached", phone_id=self._phone_number_id)
-            return self._phone_number_id
+        
+        phones = response.json()
+        if not phones:
+            raise VapiError(
+                message="No phone number found in Vapi account",
+                error_code=ErrorCode.VAPI_CALL_FAILED
+            )
+        
+        self._phone_number_id = phones[0]["id"]
+        logger.info("phone_number_cached", phone_id=self._phone_number_id)
+        return self._phone_number_id
     
     async def initiate_call(
         self,
@@ -321,53 +327,50 @@ class OutboundCallService:
             customer_id=customer_data.get("customer_id")
         )
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                f"{self.base_url}/call/phone",
-                headers=self.headers,
-                json=assistant_config
+        response = await self.client.post(
+            "/call/phone",
+            json=assistant_config,
+            timeout=30.0
+        )
+        
+        if response.status_code not in [200, 201]:
+            error_text = response.text
+            logger.error(
+                "outbound_call_failed",
+                status=response.status_code,
+                error=error_text,
+                call_type=call_type
             )
-            
-            if response.status_code not in [200, 201]:
-                error_text = response.text
-                logger.error(
-                    "outbound_call_failed",
-                    status=response.status_code,
-                    error=error_text,
-                    call_type=call_type
-                )
-                raise VapiError(
-                    message=f"Failed to initiate call: {error_text}",
-                    error_code=ErrorCode.VAPI_CALL_FAILED
-                )
-            
-            call_data = response.json()
-            call_id = call_data.get("id")
-            
-            logger.info(
-                "outbound_call_initiated",
-                call_id=call_id,
-                call_type=call_type,
-                status=call_data.get("status")
+            raise VapiError(
+                message=f"Failed to initiate call: {error_text}",
+                error_code=ErrorCode.VAPI_CALL_FAILED
             )
-            
-            return call_data
+        
+        call_data = response.json()
+        call_id = call_data.get("id")
+        
+        logger.info(
+            "outbound_call_initiated",
+            call_id=call_id,
+            call_type=call_type,
+            status=call_data.get("status")
+        )
+        
+        return call_data
     
     async def get_call_status(self, call_id: str) -> Dict[str, Any]:
         """Get call status and details."""
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                f"{self.base_url}/call/{call_id}",
-                headers=self.headers
+        response = await self.client.get(
+            f"/call/{call_id}"
+        )
+        
+        if response.status_code != 200:
+            raise VapiError(
+                message="Failed to get call status",
+                error_code=ErrorCode.VAPI_CALL_FAILED
             )
-            
-            if response.status_code != 200:
-                raise VapiError(
-                    message="Failed to get call status",
-                    error_code=ErrorCode.VAPI_CALL_FAILED
-                )
-            
-            return response.json()
+        
+        return response.json()
     
     def _build_sms_body_from_metadata(self, metadata: Dict[str, Any]) -> str:
         """
@@ -483,6 +486,10 @@ class OutboundCallService:
             "phone": customer_phone,
             "message": "SMS sent successfully"
         }
+    
+    async def close(self) -> None:
+        """Close the HTTP client and release pooled connections."""
+        await self.client.aclose()
 
 
 # Singleton instance
@@ -496,3 +503,10 @@ def get_outbound_service() -> OutboundCallService:
         _outbound_service = OutboundCallService()
     return _outbound_service
 
+
+async def close_outbound_service() -> None:
+    """Close the outbound call service singleton on application shutdown."""
+    global _outbound_service
+    if _outbound_service is not None:
+        await _outbound_service.close()
+        _outbound_service = None
@@ -0,0 +1,203 @@
+"""Tests for the batch tracking database."""
+
+from __future__ import annotations
+
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from src.services import batch_database
+from src.services.batch_database import SCHEMA_VERSION, BatchDatabase, close_batch_database, get_batch_database
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = BatchDatabase(tmp_path / "batch_tracking.db")
+    yield database
+    database.close()
+
+
+def test_pooled_connections_use_wal(db):
+    """Connections come from the pool with WAL enabled and go back after use."""
+    with db._get_connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.in_transaction
+        assert db._pool.qsize() == 3
+
+    assert not conn.in_transaction
+    assert db._pool.qsize() == 4
+
+
+def test_failed_write_is_rolled_back(db):
+    """An exception inside the connection block rolls back and returns the connection."""
+    with pytest.raises(RuntimeError):
+        with db._get_connection() as conn:
+            conn.execute(
+                "INSERT INTO processed_batches VALUES ('B1', '2025-01-01', 1, 1, 1, 1, 'b1.csv')"
+            )
+            raise RuntimeError("boom")
+
+    assert not db.is_batch_processed("B1")
+    assert db._pool.qsize() == 4
+
+
+def test_customer_decline_and_outreach_round_trip(db):
+    """Declines and outreach are persisted and visible to later reads."""
+    db.record_batch_processed("B1", 10, 2, 2, 2, "b1.csv")
+    db.record_customer_decline("C1", "B1", 45.99, "medium")
+    outreach_id = db.record_outreach("C1", "B1", "sms", "medium", sms_id="sms-1")
+
+    active = db.get_active_declined_customers(batch_id="B1")
+    assert [row["customer_id"] for row in active] == ["C1"]
+    assert active[0]["last_outreach_type"] == "sms"
+
+    history = db.get_customer_outreach_history("C1")
+    assert len(history) == 1
+    assert history[0]["sms_id"] == "sms-1"
+    assert history[0]["id"] == outreach_id
+
+
+def test_bulk_record_outreach_writes_all_rows(db):
+    """Bulk outreach writes every history row and updates each customer once."""
+    db.record_batch_processed("B1", 10, 2, 2, 2, "b1.csv")
+    db.record_customer_decline("C1", "B1", 10.0, "medium")
+    db.record_customer_decline("C2", "B1", 20.0, "medium")
+
+    db.bulk_record_outreach([
+        ("C1", "B1", "call", "high", "call-1", None, True, None),
+        ("C2", "B1", "sms", "medium", None, None, False, "undeliverable"),
+    ])
+
+    active = {row["customer_id"]: row for row in db.get_active_declined_customers("B1")}
+    assert active["C1"]["current_priority"] == "high"
+    assert active["C1"]["last_outreach_type"] == "call"
+    assert active["C2"]["last_outreach_type"] == "sms"
+
+    failed = db.get_customer_outreach_history("C2")
+    assert failed[0]["success"] == 0
+    assert failed[0]["error_message"] == "undeliverable"
+
+
+def test_prior_decline_counts_feed_bulk_declines(db):
+    """Repeat counts come from other batches and carry into the bulk insert."""
+    db.record_batch_processed("B1", 10, 1, 1, 1, "b1.csv")
+    db.record_batch_processed("B2", 10, 2, 2, 2, "b2.csv")
+    db.record_customer_decline("C1", "B1", 10.0, "medium")
+
+    prior = db.get_prior_decline_counts(["C1", "C2"], exclude_batch_id="B2")
+    assert prior == {"C1": 0}
+
+    db.bulk_record_customer_declines("B2", [
+        {"customer_id": "C1", "declined_amount": 12.0, "priority": "high", "repeat_decline_count": 1},
+        {"customer_id": "C2", "declined_amount": 30.0, "priority": "medium", "repeat_decline_count": 0},
+    ])
+
+    active = {row["customer_id"]: row for row in db.get_active_declined_customers("B2")}
+    assert active["C1"]["repeat_decline_count"] == 1
+    assert active["C1"]["current_priority"] == "high"
+    assert active["C2"]["repeat_decline_count"] == 0
+
+
+def test_active_customers_query_uses_covering_index(db):
+    """The per-batch active customer query is served by idx_co_active without a sort."""
+    with db._get_connection() as conn:
+        plan = " ".join(
+            row["detail"]
+            for row in conn.execute("""
+                EXPLAIN QUERY PLAN
+                SELECT * FROM customer_outreach
+                WHERE batch_id = ? AND is_resolved = 0
+                ORDER BY current_priority DESC, first_declined_at ASC
+            """, ("B1",))
+        )
+
+    assert "idx_co_active" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_timestamps_are_stored_as_unix_seconds(db):
+    """New rows store INTEGER unix timestamps."""
+    db.record_batch_processed("B1", 10, 1, 1, 1, "b1.csv")
+    db.record_customer_decline("C1", "B1", 10.0, "medium")
+    db.record_outreach("C1", "B1", "sms", "medium")
+
+    row = db.get_active_declined_customers("B1")[0]
+    assert isinstance(row["first_declined_at"], int)
+    assert isinstance(row["last_outreach_at"], int)
+    assert isinstance(db.get_customer_outreach_history("C1")[0]["outreach_date"], int)
+
+
+def test_legacy_text_timestamps_are_migrated(tmp_path):
+    """Databases created with ISO-8601 TEXT timestamps are converted once."""
+    path = tmp_path / "legacy.db"
+    declined_at = "2025-01-02T03:04:05.678901"
+    with sqlite3.connect(path) as conn:
+        conn.execute("""
+            CREATE TABLE processed_batches (
+                batch_id TEXT PRIMARY KEY, processed_at TEXT NOT NULL,
+                total_records INTEGER NOT NULL, declined_count INTEGER NOT NULL,
+                matched_count INTEGER NOT NULL, sms_sent INTEGER NOT NULL,
+                csv_filename TEXT NOT NULL
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE customer_outreach (
+                customer_id TEXT NOT NULL, batch_id TEXT NOT NULL,
+                declined_amount REAL NOT NULL, first_declined_at TEXT NOT NULL,
+                last_outreach_at TEXT, last_outreach_type TEXT,
+                current_priority TEXT NOT NULL, is_resolved INTEGER NOT NULL DEFAULT 0,
+                repeat_decline_count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (customer_id, batch_id)
+            )
+        """)
+        conn.execute(
+            "INSERT INTO processed_batches VALUES ('B1', ?, 1, 1, 1, 1, 'b1.csv')",
+            (declined_at,),
+        )
+        conn.execute(
+            "INSERT INTO customer_outreach VALUES ('C1', 'B1', 10.0, ?, NULL, NULL, 'medium', 0, 0)",
+            (declined_at,),
+        )
+
+    db = BatchDatabase(path)
+    try:
+        row = db.get_active_declined_customers("B1")[0]
+        assert row["first_declined_at"] == int(datetime.fromisoformat(declined_at).timestamp())
+        assert row["last_outreach_at"] is None
+        with db._get_connection() as conn:
+            assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+            tables = {r["name"] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        assert not any(name.endswith("_v0") for name in tables)
+    finally:
+        db.close()
+
+
+def test_re_recorded_decline_keeps_outreach_state(db):
+    """Recording the same decline again updates it without wiping outreach columns."""
+    db.record_batch_processed("B1", 10, 1, 1, 1, "b1.csv")
+    db.record_customer_decline("C1", "B1", 10.0, "medium")
+    db.record_outreach("C1", "B1", "sms", "medium")
+    first = db.get_active_declined_customers("B1")[0]
+
+    db.record_customer_decline("C1", "B1", 15.0, "high")
+
+    row = db.get_active_declined_customers("B1")[0]
+    assert row["declined_amount"] == 15.0
+    assert row["current_priority"] == "high"
+    assert row["last_outreach_type"] == "sms"
+    assert row["first_declined_at"] == first["first_declined_at"]
+
+
+def test_shared_database_is_reused_until_closed(tmp_path, monkeypatch):
+    """Every caller gets the same pool; closing it lets the next caller start fresh."""
+    monkeypatch.chdir(tmp_path)
+
+    first = get_batch_database()
+    assert get_batch_database() is first
+
+    close_batch_database()
+    assert batch_database._batch_database is None
+    second = get_batch_database()
+    assert second is not first
+    close_batch_database()
@@ -0,0 +1,207 @@
+"""Tests for the declined payment batch orchestrator."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.services import batch_orchestrator
+from src.services.batch_orchestrator import BatchOrchestrator
+from src.services.priority_calculator import OutreachPriority, PriorityCalculationResult
+
+
+@pytest.fixture
+def orchestrator(tmp_path):
+    fontis = MagicMock()
+    fontis.get_customer_details = AsyncMock(
+        side_effect=lambda customer_id: {
+            "success": True,
+            "data": {"name": f"Customer {customer_id}", "contact": {"phoneNumber": "+16785550100"}},
+        }
+    )
+    orch = BatchOrchestrator(fontis, db_path=tmp_path / "batch_tracking.db")
+    orch.priority_calc._get_primary_delivery_id = AsyncMock(return_value="D1")
+    yield orch
+    orch.db.close()
+
+
+@pytest.mark.asyncio
+async def test_daily_outreach_records_each_customer(orchestrator):
+    """Every active customer is processed and their outreach is written in bulk."""
+    db = orchestrator.db
+    db.record_batch_processed("B1", 3, 3, 3, 3, "b1.csv")
+    for customer_id in ("C1", "C2", "C3"):
+        db.record_customer_decline(customer_id, "B1", 25.0, "medium")
+
+    orchestrator.process_customer_outreach = AsyncMock(
+        side_effect=lambda **kwargs: {
+            "customer_id": kwargs["customer_id"],
+            "action": "sms_sent",
+            "sms_id": f"sms-{kwargs['customer_id']}",
+            "priority": "medium",
+        }
+    )
+
+    results = await orchestrator.process_daily_outreach(batch_id="B1")
+
+    assert results["total_processed"] == 3
+    assert results["medium_priority"]["sms_sent"] == 3
+    for customer_id in ("C1", "C2", "C3"):
+        history = db.get_customer_outreach_history(customer_id, "B1")
+        assert [row["sms_id"] for row in history] == [f"sms-{customer_id}"]
+
+
+@pytest.mark.asyncio
+async def test_daily_outreach_isolates_customer_failures(orchestrator):
+    """One customer's lookup failure does not stop the rest of the run."""
+    db = orchestrator.db
+    db.record_batch_processed("B1", 2, 2, 2, 2, "b1.csv")
+    db.record_customer_decline("C1", "B1", 25.0, "medium")
+    db.record_customer_decline("C2", "B1", 25.0, "medium")
+
+    async def outreach(**kwargs):
+        if kwargs["customer_id"] == "C1":
+            raise RuntimeError("Fontis unavailable")
+        return {"customer_id": kwargs["customer_id"], "action": "call_initiated", "call_id": "call-2"}
+
+    orchestrator.process_customer_outreach = AsyncMock(side_effect=outreach)
+
+    results = await orchestrator.process_daily_outreach(batch_id="B1")
+
+    assert results["total_processed"] == 1
+    assert results["high_priority"]["calls_initiated"] == 1
+    assert db.get_customer_outreach_history("C1") == []
+
+
+@pytest.mark.asyncio
+async def test_daily_outreach_fetches_each_customer_once(orchestrator):
+    """A customer active in several batches is looked up once per run."""
+    db = orchestrator.db
+    for batch_id in ("B1", "B2"):
+        db.record_batch_processed(batch_id, 1, 1, 1, 1, f"{batch_id}.csv")
+        db.record_customer_decline("C1", batch_id, 25.0, "medium")
+
+    orchestrator.process_customer_outreach = AsyncMock(
+        return_value={"customer_id": "C1", "action": "email_queued"}
+    )
+
+    results = await orchestrator.process_daily_outreach()
+
+    assert results["total_processed"] == 2
+    orchestrator.fontis.get_customer_details.assert_awaited_once_with("C1")
+    orchestrator.priority_calc._get_primary_delivery_id.assert_awaited_once_with("C1")
+
+
+@pytest.mark.asyncio
+async def test_paid_customers_are_resolved_in_bulk(orchestrator):
+    """Customers who already paid are marked resolved and leave the active list."""
+    db = orchestrator.db
+    db.record_batch_processed("B1", 2, 2, 2, 2, "b1.csv")
+    db.record_customer_decline("C1", "B1", 25.0, "medium")
+    db.record_customer_decline("C2", "B1", 25.0, "medium")
+
+    async def outreach(**kwargs):
+        if kwargs["customer_id"] == "C1":
+            return {"customer_id": "C1", "action": "skipped", "reason": "payment_already_received"}
+        return {"customer_id": "C2", "action": "email_queued"}
+
+    orchestrator.process_customer_outreach = AsyncMock(side_effect=outreach)
+
+    results = await orchestrator.process_daily_outreach(batch_id="B1")
+
+    assert results["high_priority"]["skipped_paid"] == 1
+    assert [row["customer_id"] for row in db.get_active_declined_customers("B1")] == ["C2"]
+
+
+@pytest.mark.asyncio
+async def test_failed_outreach_is_recorded_with_error(orchestrator):
+    """Failed actions map to an unsuccessful history row at the fixed priority."""
+    db = orchestrator.db
+    db.record_batch_processed("B1", 1, 1, 1, 1, "b1.csv")
+    db.record_customer_decline("C1", "B1", 25.0, "medium")
+
+    orchestrator.process_customer_outreach = AsyncMock(
+        return_value={"customer_id": "C1", "action": "call_failed", "error": "busy", "priority": "low"}
+    )
+
+    results = await orchestrator.process_daily_outreach(batch_id="B1")
+
+    assert results["high_priority"]["calls_failed"] == 1
+    row = db.get_customer_outreach_history("C1", "B1")[0]
+    assert (row["outreach_type"], row["priority"], row["success"], row["error_message"]) == ("call", "high", 0, "busy")
+
+
+@pytest.mark.asyncio
+async def test_initiated_call_is_recorded_once(orchestrator):
+    """A placed call is reported as initiated and written to history exactly once."""
+    db = orchestrator.db
+    db.record_batch_processed("B1", 1, 1, 1, 1, "b1.csv")
+    db.record_customer_decline("C1", "B1", 25.0, "medium")
+
+    orchestrator.priority_calc.calculate_priority = AsyncMock(
+        return_value=PriorityCalculationResult(priority=OutreachPriority.HIGH, total_due=40.0)
+    )
+    orchestrator.outbound_service = MagicMock()
+    orchestrator.outbound_service.initiate_call = AsyncMock(return_value={"id": "call-1", "status": "queued"})
+
+    results = await orchestrator.process_daily_outreach(batch_id="B1")
+
+    assert results["high_priority"]["calls_initiated"] == 1
+    history = db.get_customer_outreach_history("C1", "B1")
+    assert [(row["outreach_type"], row["call_id"]) for row in history] == [("call", "call-1")]
+
+
+@pytest.mark.asyncio
+async def test_finished_outreach_is_recorded_before_the_run_ends(orchestrator, monkeypatch):
+    """Completed customers are written while others are still in flight, and on cancel."""
+    monkeypatch.setattr(batch_orchestrator, "OUTREACH_FLUSH_SIZE", 1)
+    db = orchestrator.db
+    db.record_batch_processed("B1", 2, 2, 2, 2, "b1.csv")
+    db.record_customer_decline("C1", "B1", 25.0, "medium")
+    db.record_customer_decline("C2", "B1", 25.0, "medium")
+    stuck = asyncio.Event()
+
+    async def outreach(**kwargs):
+        if kwargs["customer_id"] == "C2":
+            stuck.set()
+            await asyncio.Event().wait()  # never finishes
+        return {"customer_id": kwargs["customer_id"], "action": "sms_sent", "sms_id": "sms-1"}
+
+    orchestrator.process_customer_outreach = AsyncMock(side_effect=outreach)
+
+    run = asyncio.create_task(orchestrator.process_daily_outreach(batch_id="B1"))
+    await stuck.wait()
+    for _ in range(5):
+        await asyncio.sleep(0)
+    assert [row["sms_id"] for row in db.get_customer_outreach_history("C1", "B1")] == ["sms-1"]
+
+    run.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await run
+    assert db.get_customer_outreach_history("C2", "B1") == []
+
+
+@pytest.mark.asyncio
+async def test_single_customer_outreach_is_recorded(orchestrator):
+    """Outreach outside a daily run writes history, and a paid customer is resolved."""
+    db = orchestrator.db
+    db.record_batch_processed("B1", 1, 1, 1, 1, "b1.csv")
+    db.record_customer_decline("C1", "B1", 25.0, "medium")
+
+    orchestrator.priority_calc.calculate_priority = AsyncMock(
+        return_value=PriorityCalculationResult(priority=OutreachPriority.HIGH, total_due=40.0)
+    )
+    orchestrator.outbound_service = MagicMock()
+    orchestrator.outbound_service.initiate_call = AsyncMock(return_value={"id": "call-1", "status": "queued"})
+
+    result = await orchestrator.process_customer_outreach("C1", "D1", 25.0, "Customer C1", "+16785550100")
+    orchestrator.record_outreach_result("C1", "unknown", result)
+
+    history = db.get_customer_outreach_history("C1", "unknown")
+    assert [(row["outreach_type"], row["call_id"]) for row in history] == [("call", "call-1")]
+
+    assert [row["customer_id"] for row in db.get_active_declined_customers()] == ["C1"]
+    orchestrator.record_outreach_result("C1", "B1", {"action": "skipped", "reason": "payment_already_received"})
+    assert [row["customer_id"] for row in db.get_active_declined_customers()] == []
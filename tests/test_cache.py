@@ -0,0 +1,133 @@
+"""Tests for the in-memory TTL cache."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.services import cache as cache_module
+from src.services.cache import SimpleCache
+
+
+def test_set_and_get_round_trip():
+    """Stored values are returned until cleared."""
+    cache = SimpleCache(ttl_seconds=60)
+    cache.set("search:jamie", {"result": "ok"})
+
+    assert cache.get("search:jamie") == {"result": "ok"}
+    assert cache.size() == 1
+
+    cache.clear()
+    assert cache.get("search:jamie") is None
+
+
+def test_negative_entries_are_distinguishable_from_misses():
+    """A negative entry reads as None but is reported as known-missing."""
+    cache = SimpleCache(ttl_seconds=60)
+    cache.set_negative("match:+16785550000")
+
+    assert cache.get("match:+16785550000") is None
+    assert cache.is_negative("match:+16785550000")
+    assert not cache.is_negative("match:+16785550001")
+
+
+@pytest.mark.asyncio
+async def test_get_or_compute_coalesces_concurrent_misses():
+    """Concurrent lookups for one key share a single fetch."""
+    cache = SimpleCache(ttl_seconds=60)
+
+    async def fetch():
+        await asyncio.sleep(0)
+        return {"success": True}
+
+    factory = AsyncMock(side_effect=fetch)
+    results = await asyncio.gather(*(cache.get_or_compute("k", factory) for _ in range(5)))
+
+    assert results == [{"success": True}] * 5
+    assert factory.await_count == 1
+    assert await cache.get_or_compute("k", factory) == {"success": True}
+    assert factory.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_the_shared_fetch():
+    """Other waiters still get the value, and it is cached, when the first caller is cancelled."""
+    cache = SimpleCache(ttl_seconds=60)
+    release = asyncio.Event()
+
+    async def fetch():
+        await release.wait()
+        return {"success": True}
+
+    factory = AsyncMock(side_effect=fetch)
+    first = asyncio.ensure_future(cache.get_or_compute("k", factory))
+    second = asyncio.ensure_future(cache.get_or_compute("k", factory))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    release.set()
+
+    assert await second == {"success": True}
+    assert first.cancelled()
+    assert cache.get("k") == {"success": True}
+    assert factory.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_get_or_compute_caches_negative_results_but_not_errors():
+    """Negative results are remembered; exceptions are retried on the next call."""
+    cache = SimpleCache(ttl_seconds=60)
+    not_found = AsyncMock(return_value={"success": False})
+    is_negative = lambda response: not response["success"]
+
+    assert await cache.get_or_compute("bad", not_found, is_negative) is None
+    assert await cache.get_or_compute("bad", not_found, is_negative) is None
+    assert not_found.await_count == 1
+    assert cache.is_negative("bad")
+
+    failing = AsyncMock(side_effect=[RuntimeError("timeout"), {"success": True}])
+    with pytest.raises(RuntimeError):
+        await cache.get_or_compute("flaky", failing, is_negative)
+    assert await cache.get_or_compute("flaky", failing, is_negative) == {"success": True}
+
+
+def test_expired_one_shot_keys_are_evicted_without_being_read(monkeypatch):
+    """Entries nobody reads again are dropped once their TTL passes."""
+    now = [0]
+    monkeypatch.setattr(cache_module, "time", SimpleNamespace(monotonic_ns=lambda: now[0]))
+    cache = SimpleCache(ttl_seconds=5)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    now[0] = 10 * cache_module.NS_PER_SECOND
+    cache.set("c", 3)
+
+    assert cache.size() == 1
+    assert cache.get("c") == 3
+
+
+def test_concurrent_threads_can_expire_and_rewrite_keys():
+    """Writers and expiring readers on other threads never corrupt the cache."""
+    cache = SimpleCache(ttl_seconds=0)
+    errors = []
+
+    def churn():
+        try:
+            for i in range(2000):
+                key = f"k{i % 8}"
+                cache.set(key, i)
+                cache.get(key)
+        except Exception as exc:  # pragma: no cover - only reached on a race
+            errors.append(exc)
+
+    threads = [threading.Thread(target=churn) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
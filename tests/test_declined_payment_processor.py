@@ -0,0 +1,240 @@
+"""Tests for declined payment CSV processing and customer matching."""
+
+from __future__ import annotations
+
+import csv
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.services.cache import SimpleCache
+from src.services.declined_payment_processor import (
+    CustomerMatchResult,
+    DeclinedPaymentProcessor,
+    DeclinedPaymentRecord,
+)
+
+CSV_FIELDS = [
+    "id",
+    "amount",
+    "status",
+    "response_code",
+    "billing_first_name",
+    "billing_last_name",
+    "billing_phone",
+    "billing_email",
+]
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
+
+
+def declined_row(transaction_id, phone, amount="25.00"):
+    return {
+        "id": transaction_id,
+        "amount": amount,
+        "status": "declined",
+        "response_code": "200",
+        "billing_first_name": "Jamie",
+        "billing_last_name": "Carroll",
+        "billing_phone": phone,
+        "billing_email": "",
+    }
+
+
+@pytest.fixture
+def fontis():
+    client = MagicMock()
+    client.search_customers = AsyncMock(
+        side_effect=lambda term: {
+            "success": True,
+            "data": {"data": [{"customerId": f"C{term[-4:]}", "name": "Jamie Carroll"}]},
+        }
+    )
+    client.get_account_balances = AsyncMock(
+        return_value={"success": True, "data": {"totalDueBalance": 40.0}}
+    )
+    client.get_delivery_stops = AsyncMock(
+        return_value={"success": True, "data": {"deliveryStops": [{"deliveryId": "D1"}]}}
+    )
+    return client
+
+
+@pytest.fixture
+def processor(fontis):
+    proc = DeclinedPaymentProcessor(fontis)
+    proc.search_cache = SimpleCache(ttl_seconds=60)
+    proc.outbound_service = MagicMock()
+    proc.outbound_service.send_sms = AsyncMock(return_value={"id": "sms-1", "status": "sent"})
+    return proc
+
+
+@pytest.mark.asyncio
+async def test_process_csv_matches_records_and_sends_day_zero_sms(processor, tmp_path):
+    """Every declined record is matched and receives exactly one Day 0 SMS."""
+    csv_path = write_csv(
+        tmp_path / "batch.csv",
+        [
+            declined_row("T1", "(678) 555-0001"),
+            {**declined_row("T3", "(678) 555-0003"), "status": "approved", "response_code": "100"},
+            declined_row("T2", "(678) 555-0002"),
+        ],
+    )
+
+    result = await processor.process_csv_file(csv_path, "B1")
+
+    assert result["total_records"] == 3
+    assert result["declined_count"] == 2
+    assert result["matched_count"] == 2
+    assert result["unmatched_count"] == 0
+    assert [m["customer_id"] for m in result["matched_customers"]] == ["C0001", "C0002"]
+    assert result["sms_sent"] == 2
+    assert result["sms_failed"] == 0
+    assert processor.outbound_service.send_sms.await_count == 2
+    message = processor.outbound_service.send_sms.await_args_list[0].kwargs["message"]
+    assert message.startswith("Hi Jamie Carroll, this is Fontis Water. ")
+    assert "payment of $25.00. Your current balance is $40.00." in message
+
+
+@pytest.mark.asyncio
+async def test_day_zero_sms_failures_are_counted(processor, tmp_path):
+    """A failed SMS is counted without stopping the other sends."""
+    processor.outbound_service.send_sms = AsyncMock(
+        side_effect=[RuntimeError("carrier down"), {"id": "sms-2", "status": "sent"}]
+    )
+    csv_path = write_csv(
+        tmp_path / "batch.csv",
+        [declined_row("T1", "(678) 555-0001"), declined_row("T2", "(678) 555-0002")],
+    )
+
+    result = await processor.process_csv_file(csv_path, "B1")
+
+    assert result["sms_sent"] == 1
+    assert result["sms_failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_repeat_customer_lookups_are_shared_within_a_file(processor, fontis, tmp_path):
+    """Records that share a phone reuse one search, balance and delivery lookup."""
+    csv_path = write_csv(
+        tmp_path / "batch.csv",
+        [declined_row(f"T{i}", "(678) 555-0001") for i in range(3)],
+    )
+
+    processor.search_cache = SimpleCache(ttl_seconds=-1)  # every shared-cache entry is stale
+
+    result = await processor.process_csv_file(csv_path, "B1")
+
+    assert result["matched_count"] == 3
+    assert fontis.search_customers.await_count == 1
+    assert fontis.get_account_balances.await_count == 1
+    assert fontis.get_delivery_stops.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_searches_are_not_repeated_within_a_file(processor, fontis, tmp_path):
+    """A phone that finds no customer is searched once even when it repeats."""
+    fontis.search_customers = AsyncMock(return_value={"success": True, "data": {"data": []}})
+    csv_path = write_csv(
+        tmp_path / "batch.csv",
+        [declined_row(f"T{i}", "(678) 555-0009") for i in range(3)],
+    )
+
+    result = await processor.process_csv_file(csv_path, "B1")
+
+    assert result["unmatched_count"] == 3
+    assert fontis.search_customers.await_count == 1
+
+
+def test_records_and_match_results_have_no_instance_dict():
+    """Per-row objects use slots so large CSVs don't carry a __dict__ per record."""
+    record = DeclinedPaymentRecord(declined_row("T1", "(678) 555-0001"))
+
+    assert not hasattr(record, "__dict__")
+    assert not hasattr(CustomerMatchResult(matched=False), "__dict__")
+    assert record.billing_phone == "+16785550001"
+    assert record.full_name == "Jamie Carroll"
+
+
+def test_full_address_skips_blank_parts():
+    """The derived address joins only the populated billing fields."""
+    record = DeclinedPaymentRecord(
+        {**declined_row("T1", ""), "billing_address_line_1": " 592 Shannon Dr ", "billing_state": "GA"}
+    )
+
+    assert record.full_address == "592 Shannon Dr, GA"
+
+
+def test_parse_csv_tolerates_missing_columns_and_ragged_rows(processor, tmp_path):
+    """Absent columns read as blank, short rows are padded and blank lines skipped."""
+    csv_path = tmp_path / "batch.csv"
+    csv_path.write_text(
+        "id,amount,status,response_code,billing_phone\n"
+        "T1,25.00,declined,200,678-555-0001\n"
+        "\n"
+        "T2,10.00\n",
+        encoding="utf-8",
+    )
+
+    records = list(processor._parse_csv(csv_path, "B1"))
+
+    assert [r.transaction_id for r in records] == ["T1", "T2"]
+    assert records[0].is_declined()
+    assert records[0].billing_phone == "+16785550001"
+    assert records[0].billing_email == ""
+    assert records[0].batch_id == "B1"
+    assert records[1].status == ""
+    assert records[1].amount == 10.0
+
+
+@pytest.mark.asyncio
+async def test_name_address_match_filters_candidates_by_name(processor, fontis):
+    """Address search candidates must contain every significant part of the CSV name."""
+    fontis.search_customers = AsyncMock(
+        return_value={
+            "success": True,
+            "data": {
+                "data": [
+                    {"customerId": "C1", "name": "Morgan Smith", "contact": {"phoneNumber": "+16785550101"}},
+                    {"customerId": "C2", "name": "CARROLL, JAMIE J", "contact": {"phoneNumber": "+16785550102"}},
+                ]
+            },
+        }
+    )
+    record = DeclinedPaymentRecord(
+        {**declined_row("T1", ""), "billing_address_line_1": "592 Shannon Dr", "billing_city": "Marietta"}
+    )
+
+    match = await processor._match_customer(record)
+
+    assert match.matched
+    assert (match.customer_id, match.match_method, match.confidence) == ("C2", "name_address", "medium")
+    assert match.customer_phone == "+16785550102"
+    fontis.search_customers.assert_awaited_once_with("592 Shannon Dr, Marietta")
+
+
+@pytest.mark.asyncio
+async def test_unexpected_sms_errors_do_not_cancel_other_sends(processor):
+    """An error outside the per-send handler is counted as a failure, not raised."""
+    def item(index, total_due):
+        match = CustomerMatchResult(
+            matched=True,
+            customer_id=f"C{index}",
+            customer_name="Jamie",
+            customer_phone="+16785550001",
+            total_due=total_due,
+        )
+        return {"record": DeclinedPaymentRecord(declined_row(f"T{index}", "")), "match": match}
+
+    # A missing balance makes the message template raise before the send
+    items = [item(0, None), item(1, 40.0), item(2, 40.0)]
+
+    result = await processor._send_day_zero_sms(items)
+
+    assert result == {"sent": 2, "failed": 1}
+    assert processor.outbound_service.send_sms.await_count == 2
@@ -0,0 +1,598 @@
+"""Tests for IMAP CSV batch detection."""
+
+from __future__ import annotations
+
+import asyncio
+import imaplib
+import socket
+import threading
+from datetime import datetime
+from email.message import EmailMessage
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.services import email_integration
+from src.services.email_integration import EmailIntegrationService, ImapConnectionPool
+
+
+def batch_email(batch_id: str, body: bytes | None = None) -> EmailMessage:
+    if body is None:
+        body = b"id,amount\n%s,25.00\n" % batch_id.encode()
+    message = EmailMessage()
+    message["Subject"] = f"Batch {batch_id}"
+    message.set_content("Batch results attached.")
+    message.add_attachment(
+        body,
+        maintype="text",
+        subtype="csv",
+        filename=f"Batch_{batch_id}_20250930181935_result.csv",
+    )
+    return message
+
+
+def body_structure(message: EmailMessage) -> bytes:
+    """Render the BODYSTRUCTURE of a multipart/mixed message of leaf parts."""
+    parts = []
+    for part in message.iter_parts():
+        maintype, subtype = part.get_content_type().upper().split("/")
+        payload = part.get_payload().encode()
+        disposition = b"NIL"
+        if part.get_filename():
+            disposition = b'("attachment" ("filename" "%s"))' % part.get_filename().encode()
+        parts.append(
+            b'("%s" "%s" ("charset" "utf-8") NIL NIL "%s" %d %d NIL %s NIL)'
+            % (
+                maintype.encode(),
+                subtype.encode(),
+                part["Content-Transfer-Encoding"].upper().encode(),
+                len(payload),
+                payload.count(b"\n"),
+                disposition,
+            )
+        )
+    return b"(%s \"MIXED\" (\"boundary\" \"x\") NIL NIL)" % b"".join(parts)
+
+
+class FakeIMAP:
+    """Minimal imaplib.IMAP4_SSL stand-in serving canned messages."""
+
+    def __init__(self, messages: dict[bytes, EmailMessage], capabilities=("IMAP4REV1",)):
+        self.messages = messages  # keyed by UID
+        self.capabilities = capabilities
+        self.uid_validity = b"1"
+        self.commands: list[tuple] = []
+        self.sock = SimpleNamespace(shutdown=lambda how: self.commands.append(("shutdown",)))
+
+    def select(self, folder):
+        self.commands.append(("select", folder))
+        return "OK", [str(len(self.messages)).encode()]
+
+    def response(self, code):
+        return code, [self.uid_validity]
+
+    def uid(self, command, *args):
+        return getattr(self, command.lower())(*args)
+
+    def search(self, charset, *criteria):
+        self.commands.append(("search", criteria))
+        uids = list(self.messages)
+        if criteria[:1] == ("UID",):
+            low = int(criteria[1].split(":")[0])
+            # Like a real server, "n:*" still matches the highest UID
+            uids = [uid for uid in uids if int(uid) >= low] or uids[-1:]
+        return "OK", [b" ".join(uids)]
+
+    def fetch(self, message_set, spec):
+        if isinstance(message_set, str):
+            message_set = message_set.encode()
+        self.commands.append(("fetch", message_set, spec))
+        data = []
+        for uid in message_set.split(b","):
+            message = self.messages[uid]
+            seq = b"%d" % (list(self.messages).index(uid) + 1)
+            if spec == "(BODYSTRUCTURE)":
+                data.append(seq + b" (UID %s BODYSTRUCTURE %s)" % (uid, body_structure(message)))
+                continue
+            part = list(message.iter_parts())[int(spec[len("(BODY.PEEK["):-2]) - 1]
+            raw = part.get_payload().encode()
+            data.append((seq + b" (UID %s BODY[%s] {%d}" % (uid, spec[11:-2].encode(), len(raw)), raw))
+            data.append(b")")
+        return "OK", data
+
+    def noop(self):
+        self.commands.append(("noop",))
+        if getattr(self, "dropped", False):
+            raise OSError("connection reset")
+        return "OK", []
+
+    def store(self, message_set, command, flags):
+        self.commands.append(("store", message_set, command, flags))
+        return "OK", []
+
+    def move(self, message_set, destination):
+        self.commands.append(("move", message_set, destination))
+        return "OK", []
+
+    def copy(self, message_set, destination):
+        self.commands.append(("copy", message_set, destination))
+        return "OK", []
+
+    def expunge(self, *message_set):
+        self.commands.append(("expunge", *message_set))
+        return "OK", []
+
+    def close(self):
+        pass
+
+    def logout(self):
+        self.commands.append(("logout",))
+
+
+def make_pool(size=4):
+    pool = ImapConnectionPool("imap.example.com", 993, "batches@example.com", "secret", size=size)
+    pool.opened = []
+    pool.messages = {}
+
+    def open_connection():
+        pool.opened.append(FakeIMAP(pool.messages))
+        return pool.opened[-1]
+
+    pool._open = open_connection
+    return pool
+
+
+def use(service, imap):
+    """Make imap the service's connection; pooled extras serve the same mailbox."""
+    service._imap_connection = imap
+    service.pool.messages = imap.messages
+    service.pool._opened = 1
+    return imap
+
+
+@pytest.fixture
+def service(tmp_path):
+    return EmailIntegrationService(
+        imap_server="imap.example.com",
+        imap_port=993,
+        email_address="batches@example.com",
+        email_password="secret",
+        download_dir=tmp_path,
+        pool=make_pool(),
+    )
+
+
+@pytest.mark.asyncio
+async def test_connections_are_reused_across_connects(service):
+    """disconnect() hands the logged-in connection back instead of logging out."""
+    assert await service.connect()
+    first = service._imap_connection
+    service.disconnect()
+    assert await service.connect()
+
+    assert service._imap_connection is first
+    assert service.pool.opened == [first]
+    assert ("logout",) not in first.commands
+
+
+@pytest.mark.asyncio
+async def test_stale_connections_are_checked_and_replaced(monkeypatch):
+    """A connection idle past the keepalive window is NOOP-checked; dead ones are reopened."""
+    pool = make_pool()
+    healthy = await pool.acquire()
+    dropped = await pool.acquire()
+    dropped.dropped = True
+    pool.release(dropped)
+    pool.release(healthy)
+    monkeypatch.setattr(email_integration, "IMAP_KEEPALIVE_SECONDS", 0)
+
+    assert await pool.acquire() is healthy
+    assert ("logout",) in dropped.commands
+    assert await pool.acquire() is pool.opened[2]
+    assert pool._opened == 2
+
+
+@pytest.mark.asyncio
+async def test_check_for_new_csvs_fetches_only_the_csv_parts(service, tmp_path):
+    """Structures are fetched together, then just the CSV parts, without setting \\Seen."""
+    imap = FakeIMAP({b"1": batch_email("20000"), b"2": batch_email("20001")})
+    use(service, imap)
+
+    csv_files = await service.check_for_new_csvs()
+
+    assert [f.batch_id for f in csv_files] == ["20000", "20001"]
+    assert [f.email_id for f in csv_files] == ["1", "2"]
+    assert (tmp_path / "Batch_20000_20250930181935_result.csv").read_bytes() == b"id,amount\n20000,25.00\n"
+    fetches = [c for c in imap.commands if c[0] == "fetch"]
+    assert fetches == [
+        ("fetch", b"1,2", "(BODYSTRUCTURE)"),
+        ("fetch", b"1,2", "(BODY.PEEK[2])"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_check_for_new_csvs_splits_chunks_across_pooled_connections(service, monkeypatch):
+    """Chunks beyond the first are fetched concurrently on another pooled connection."""
+    monkeypatch.setattr("src.services.email_integration.FETCH_CHUNK_SIZE", 2)
+    imap = FakeIMAP({str(n).encode(): batch_email(f"2000{n}") for n in range(1, 4)})
+    use(service, imap)
+
+    csv_files = await service.check_for_new_csvs()
+
+    assert len(csv_files) == 3
+    # Whichever connection is free takes the next chunk; each chunk is fetched once
+    extra = service.pool.opened[0]
+    fetched = [c[1] for conn in (imap, extra) for c in conn.commands if c[2:] == ("(BODYSTRUCTURE)",)]
+    assert sorted(fetched) == [b"1,2", b"3"]
+    assert ("select", "INBOX") in extra.commands
+    assert service.pool._idle.qsize() == 1
+
+
+@pytest.mark.asyncio
+async def test_chunks_fall_back_to_one_connection_when_pool_is_busy(service, monkeypatch):
+    """Without a free pooled connection every chunk runs on the current one, in order."""
+    monkeypatch.setattr("src.services.email_integration.FETCH_CHUNK_SIZE", 1)
+    imap = use(service, FakeIMAP({str(n).encode(): batch_email(f"2000{n}") for n in range(1, 4)}))
+    service.pool.size = 1
+
+    csv_files = await service.check_for_new_csvs()
+
+    assert [f.batch_id for f in csv_files] == ["20001", "20002", "20003"]
+    assert [c[1] for c in imap.commands if c[0] == "fetch" and c[2] == "(BODYSTRUCTURE)"] == [b"1", b"2", b"3"]
+    assert service.pool.opened == []
+
+
+@pytest.mark.asyncio
+async def test_chunks_of_a_broken_connection_go_to_the_other_workers(service, monkeypatch):
+    """A dropped connection hands its chunk back, is discarded, and the rest finish elsewhere."""
+    monkeypatch.setattr("src.services.email_integration.FETCH_CHUNK_SIZE", 1)
+    imap = use(service, FakeIMAP({str(n).encode(): batch_email(f"2000{n}") for n in range(1, 4)}))
+    service.pool.size = 2
+
+    def dropped(message_set, spec):
+        raise imaplib.IMAP4.abort("socket error: EOF")
+
+    imap.fetch = dropped
+
+    csv_files = await service.check_for_new_csvs()
+
+    assert [f.batch_id for f in csv_files] == ["20001", "20002", "20003"]
+    assert service._imap_connection is None
+    assert ("logout",) in imap.commands
+    assert service.pool._idle.qsize() == 1
+
+
+@pytest.mark.asyncio
+async def test_chunks_left_without_a_connection_count_as_unread(service, monkeypatch):
+    """When every connection breaks, the untouched chunks keep the cursor back."""
+    monkeypatch.setattr("src.services.email_integration.FETCH_CHUNK_SIZE", 1)
+    imap = use(service, FakeIMAP({str(n).encode(): batch_email(f"2000{n}") for n in range(1, 4)}))
+    service.pool.size = 1
+    original_fetch = imap.fetch
+
+    def fetch(message_set, spec):
+        if message_set == b"2":
+            raise OSError("connection reset")
+        return original_fetch(message_set, spec)
+
+    imap.fetch = fetch
+
+    csv_files = await service.check_for_new_csvs()
+
+    assert [f.batch_id for f in csv_files] == ["20001"]
+    # Message 3 was never tried on the dead connection, so it stays unsettled
+    assert [c[1] for c in imap.commands if c[0] == "fetch" and c[2] == "(BODYSTRUCTURE)"] == [b"1"]
+    assert "INBOX" not in service._load_uid_state()
+    assert service._imap_connection is None
+
+
+@pytest.mark.asyncio
+async def test_processed_and_foreign_attachments_are_not_downloaded(service):
+    """Only unprocessed batch CSVs reach the part download."""
+    other = EmailMessage()
+    other.set_content("Invoice attached.")
+    other.add_attachment(b"%PDF", maintype="application", subtype="pdf", filename="invoice.pdf")
+    imap = FakeIMAP({b"1": batch_email("20000"), b"2": other, b"3": batch_email("20002")})
+    use(service, imap)
+    service.monitor.mark_processed("20002")
+
+    csv_files = await service.check_for_new_csvs()
+
+    assert [f.batch_id for f in csv_files] == ["20000"]
+    fetches = [c[1:] for c in imap.commands if c[0] == "fetch"]
+    assert fetches == [(b"1,2,3", "(BODYSTRUCTURE)"), (b"1", "(BODY.PEEK[2])")]
+
+
+@pytest.mark.asyncio
+async def test_search_is_narrowed_to_multipart_mail_since_date(service):
+    """The server filters out non-multipart mail and anything before since_date."""
+    imap = FakeIMAP({b"1": batch_email("20000")})
+    use(service, imap)
+
+    await service.check_for_new_csvs(since_date=datetime(2025, 9, 23))
+
+    searches = [c[1] for c in imap.commands if c[0] == "search"]
+    assert searches == [("HEADER", "Content-Type", "multipart", "SINCE", '"23-Sep-2025"')]
+
+
+async def run_until_second_batch(service, **kwargs):
+    """Run idle_loop, stopping when the callback receives its second batch."""
+    seen = []
+
+    async def on_csvs(csv_files):
+        for f in csv_files:
+            seen.append(f.batch_id)
+            service.monitor.mark_processed(f.batch_id)
+        if len(seen) > 1:
+            raise asyncio.CancelledError
+
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(service.idle_loop(on_csvs, **kwargs), timeout=5)
+    return seen
+
+
+def idle_socket(imap, on_idle=b""):
+    """Give imap a real socket; on_idle is what the server sends after IDLE."""
+    imap.sock, server_end = socket.socketpair()
+    imap.file = imap.sock.makefile("rb")
+    imap._new_tag = lambda: b"A1"
+    imap.readline = lambda: imap.file.readline()
+
+    def send(data):
+        imap.commands.append(("send", data))
+        if data == b"A1 IDLE\r\n":
+            server_end.sendall(b"+ idling\r\n" + on_idle)
+        elif data == b"DONE\r\n":
+            server_end.sendall(b"A1 OK IDLE terminated\r\n")
+
+    imap.send = send
+    return server_end
+
+
+@pytest.mark.asyncio
+async def test_idle_loop_checks_again_when_server_pushes_exists(service):
+    """New mail is picked up from an IDLE push instead of a timer."""
+    imap = FakeIMAP({b"1": batch_email("20000")}, capabilities=("IMAP4REV1", "IDLE"))
+    # The push arrives with the continuation, so it is already buffered
+    server_end = idle_socket(imap, on_idle=b"* 2 EXISTS\r\n")
+    original_send = imap.send
+
+    def send(data):
+        if data.endswith(b" IDLE\r\n"):
+            imap.messages[b"2"] = batch_email("20001")
+        original_send(data)
+
+    imap.send = send
+    use(service, imap)
+
+    try:
+        seen = await run_until_second_batch(service)
+        assert imap.sock.gettimeout() is None
+    finally:
+        imap.file.close()
+        imap.sock.close()
+        server_end.close()
+
+    assert seen == ["20000", "20001"]
+    assert [c[1] for c in imap.commands if c[0] == "send"] == [b"A1 IDLE\r\n", b"DONE\r\n"]
+
+
+@pytest.mark.asyncio
+async def test_cancelling_idle_loop_wakes_the_idle_thread_and_drops_the_connection(service):
+    """A connection left mid-IDLE is shut down and discarded, not pooled."""
+    imap = FakeIMAP({}, capabilities=("IMAP4REV1", "IDLE"))
+    server_end = idle_socket(imap)
+    use(service, imap)
+    idle = service._idle
+    idle_returned = threading.Event()
+
+    def tracked_idle(timeout):
+        try:
+            return idle(timeout)
+        finally:
+            idle_returned.set()
+
+    service._idle = tracked_idle
+    loop_task = asyncio.ensure_future(service.idle_loop(AsyncMock()))
+    try:
+        while not any(c[0] == "send" for c in imap.commands):
+            await asyncio.sleep(0.01)
+
+        loop_task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await loop_task
+
+        assert await asyncio.to_thread(idle_returned.wait, 5)
+    finally:
+        imap.file.close()
+        imap.sock.close()
+        server_end.close()
+
+    assert service._imap_connection is None
+    assert ("logout",) in imap.commands
+    assert service.pool._idle.qsize() == 0
+
+
+@pytest.mark.asyncio
+async def test_idle_loop_reconnects_at_once_after_a_broken_check(service):
+    """A connection dropped by the check is replaced without waiting a poll interval."""
+    broken = use(service, FakeIMAP({}, capabilities=("IMAP4REV1", "IDLE")))
+    broken.search = lambda charset, *criteria: (_ for _ in ()).throw(OSError("connection reset"))
+    service.pool.messages[b"1"] = batch_email("20000")
+    service.pool.messages[b"2"] = batch_email("20001")
+
+    seen = await run_until_second_batch(service, poll_interval=60)
+
+    assert seen == ["20000", "20001"]
+    assert ("logout",) in broken.commands
+
+
+def test_idle_times_out_and_leaves_the_connection_usable(service):
+    """A quiet IDLE ends with DONE, and the socket timeout is put back."""
+    imap = FakeIMAP({})
+    server_end = idle_socket(imap)
+    use(service, imap)
+
+    try:
+        assert service._idle(0.05) is False
+        assert imap.sock.gettimeout() is None
+        server_end.sendall(b"* OK still here\r\n")
+        assert imap.readline() == b"* OK still here\r\n"
+    finally:
+        imap.file.close()
+        imap.sock.close()
+        server_end.close()
+
+
+@pytest.mark.asyncio
+async def test_idle_loop_polls_when_server_lacks_idle(service):
+    """Without the IDLE capability the folder is re-checked on an interval."""
+    imap = FakeIMAP({b"1": batch_email("20000")})
+    use(service, imap)
+    original_search = imap.search
+
+    def search(charset, *criteria):
+        result = original_search(charset, *criteria)
+        imap.messages.setdefault(b"2", batch_email("20001"))
+        return result
+
+    imap.search = search
+
+    seen = await run_until_second_batch(service, poll_interval=0)
+
+    assert seen == ["20000", "20001"]
+
+
+@pytest.mark.asyncio
+async def test_next_check_only_searches_uids_above_the_last_seen(service, tmp_path):
+    """The settled UID is persisted and later searches start after it."""
+    imap = use(service, FakeIMAP({b"7": batch_email("20000")}))
+    await service.check_for_new_csvs()
+    service.monitor.mark_processed("20000")
+
+    imap.messages[b"9"] = batch_email("20001")
+    restarted = EmailIntegrationService("imap.example.com", 993, "batches@example.com", "secret", tmp_path, pool=make_pool())
+    use(restarted, imap)
+    csv_files = await restarted.check_for_new_csvs()
+
+    assert [f.email_id for f in csv_files] == ["9"]
+    # 7 was unsettled at the first check; now it is processed the cursor passes it
+    assert ("search", ("UID", "7:*", "HEADER", "Content-Type", "multipart")) in imap.commands
+    # 9 is not yet marked processed, so it is reported again
+    assert [f.email_id for f in await restarted.check_for_new_csvs()] == ["9"]
+    assert imap.commands[-3] == ("search", ("UID", "9:*", "HEADER", "Content-Type", "multipart"))
+    restarted.monitor.mark_processed("20001")
+    assert await restarted.check_for_new_csvs() == []
+
+    # Nothing new: the server's "10:*" -> highest-UID match is ignored
+    assert await restarted.check_for_new_csvs() == []
+    assert imap.commands[-1] == ("search", ("UID", "10:*", "HEADER", "Content-Type", "multipart"))
+
+
+@pytest.mark.asyncio
+async def test_unprocessed_batches_are_found_again(service):
+    """The cursor stops before a batch the caller has not marked processed."""
+    imap = use(service, FakeIMAP({b"7": batch_email("20000"), b"8": batch_email("20001")}))
+    await service.check_for_new_csvs()
+    service.monitor.mark_processed("20001")  # 20000 failed in the caller
+
+    csv_files = await service.check_for_new_csvs()
+
+    assert [f.batch_id for f in csv_files] == ["20000"]
+    assert [c[1] for c in imap.commands if c[0] == "search"][-1][:2] == ("UID", "7:*")
+
+
+@pytest.mark.asyncio
+async def test_consumers_keep_separate_cursors_and_processed_batches(service, tmp_path):
+    """Two callers sharing a download directory each see every new batch."""
+    imap = use(service, FakeIMAP({b"7": batch_email("20000")}))
+    await service.check_for_new_csvs()
+    service.monitor.mark_processed("20000")
+
+    other = EmailIntegrationService(
+        "imap.example.com", 993, "batches@example.com", "secret", tmp_path, pool=make_pool(), consumer="sheet_ingest"
+    )
+    use(other, imap)
+
+    assert [f.batch_id for f in await other.check_for_new_csvs()] == ["20000"]
+
+
+@pytest.mark.asyncio
+async def test_changed_uidvalidity_resets_the_cursor(service):
+    """A rebuilt mailbox (new UIDVALIDITY) is searched from the start again."""
+    imap = use(service, FakeIMAP({b"7": batch_email("20000")}))
+    await service.check_for_new_csvs()
+    imap = use(service, FakeIMAP(imap.messages))  # new session
+    imap.uid_validity = b"2"
+
+    csv_files = await service.check_for_new_csvs()
+
+    assert [f.batch_id for f in csv_files] == ["20000"]
+    assert imap.commands[-3][1][0] == "HEADER"
+
+
+@pytest.mark.asyncio
+async def test_mark_emails_read_stores_flags_over_uid_sets(service, monkeypatch):
+    """One SELECT, then one STORE per chunk of UIDs rather than one per message."""
+    monkeypatch.setattr(email_integration, "UID_SET_CHUNK_SIZE", 2)
+    imap = use(service, FakeIMAP({}))
+
+    await service.mark_emails_read(["7", "8", "9"])
+
+    assert imap.commands == [
+        ("select", "INBOX"),
+        ("store", "7,8", "+FLAGS", "(\\Seen)"),
+        ("store", "9", "+FLAGS", "(\\Seen)"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_move_emails_uses_move_or_falls_back_to_copy_and_expunge(service):
+    """MOVE is used when advertised; otherwise COPY + \\Deleted + UID EXPUNGE."""
+    imap = use(service, FakeIMAP({}, capabilities=("IMAP4REV1", "MOVE")))
+    await service.move_emails(["7", "8"], "Processed")
+    assert imap.commands[1:] == [("move", "7,8", "Processed")]
+
+    imap = use(service, FakeIMAP({}, capabilities=("IMAP4REV1", "UIDPLUS")))
+    await service.move_emails(["7", "8"], "Processed")
+    assert imap.commands[1:] == [
+        ("copy", "7,8", "Processed"),
+        ("store", "7,8", "+FLAGS", "(\\Deleted)"),
+        ("expunge", "7,8"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_rejected_flag_update_stops_before_further_commands(service, monkeypatch):
+    """A NO from STORE ends the run: no more UID sets, and nothing is expunged."""
+    monkeypatch.setattr(email_integration, "UID_SET_CHUNK_SIZE", 2)
+    imap = use(service, FakeIMAP({}, capabilities=("IMAP4REV1", "UIDPLUS")))
+
+    def store(message_set, command, flags):
+        imap.commands.append(("store", message_set, command, flags))
+        return "NO", [b"[READ-ONLY] Mailbox is read-only"]
+
+    imap.store = store
+
+    await service.mark_emails_read(["7", "8", "9"])
+    await service.move_emails(["7", "8", "9"], "Processed")
+
+    assert imap.commands[1:] == [
+        ("store", "7,8", "+FLAGS", "(\\Seen)"),
+        ("copy", "7,8", "Processed"),
+        ("store", "7,8", "+FLAGS", "(\\Deleted)"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_selected_folder_is_reused_across_operations(service):
+    """Repeat checks and flag updates on one folder SELECT it only once per connection."""
+    imap = use(service, FakeIMAP({b"7": batch_email("20000")}))
+
+    await service.check_for_new_csvs()
+    await service.check_for_new_csvs()
+    await service.mark_emails_read(["7"])
+    await service.check_for_new_csvs(folder="Batches")
+
+    assert [c for c in imap.commands if c[0] == "select"] == [("select", "INBOX"), ("select", "Batches")]
@@ -0,0 +1,96 @@
+"""Tests for batch CSV attachment matching and dedup."""
+
+from __future__ import annotations
+
+import base64
+from datetime import datetime
+
+from src.services import email_monitor
+from src.services.email_monitor import CSVEmailMonitor
+
+FILENAME = "Batch_20000_20250930181935_result.csv"
+
+
+def test_processed_batches_survive_a_restart(tmp_path):
+    """A batch marked processed is still skipped by a new monitor instance."""
+    first = CSVEmailMonitor(tmp_path)
+    first.mark_processed("20000")
+    first.close()
+
+    monitor = CSVEmailMonitor(tmp_path)
+
+    assert monitor.is_processed("20000")
+    assert not hasattr(monitor.match_csv_attachment("Batch_20001_20250930181935_result.csv"), "__dict__")
+    assert monitor.match_csv_attachment(FILENAME) is None
+    assert monitor.match_csv_attachment("Batch_20001_20250930181935_result.csv").batch_id == "20001"
+
+
+def test_identical_content_under_a_new_batch_id_is_not_saved(tmp_path):
+    """Re-sent CSVs with the same bytes are dropped once the original is processed."""
+    monitor = CSVEmailMonitor(tmp_path)
+    content = b"id,amount\n1,25.00\n"
+    first = monitor.match_csv_attachment(FILENAME)
+    assert monitor.save_csv_file(first, content) == tmp_path / FILENAME
+    assert first.file_path == tmp_path / FILENAME
+    monitor.mark_processed("20000")
+
+    resent = monitor.match_csv_attachment("Batch_20001_20251001090000_result.csv")
+
+    assert CSVEmailMonitor(tmp_path).save_csv_file(resent, content) is None
+    assert monitor.save_csv_file(resent, b"id,amount\n2,10.00\n") is not None
+    assert sorted(p.name for p in tmp_path.iterdir() if p.suffix != ".db") == [
+        FILENAME,
+        "Batch_20001_20251001090000_result.csv",
+    ]
+
+
+def test_encoded_payload_is_decoded_in_chunks_while_saving(tmp_path, monkeypatch):
+    """Base64 parts spanning many chunks are written out byte-for-byte."""
+    monkeypatch.setattr(email_monitor, "SAVE_CHUNK_SIZE", 10)
+    content = b"".join(b"T%d,%d.00\r\n" % (i, i) for i in range(200))
+    monitor = CSVEmailMonitor(tmp_path)
+    attachment = monitor.match_csv_attachment(FILENAME)
+
+    file_path = monitor.save_csv_file(attachment, base64.encodebytes(content), "base64")
+
+    assert file_path.read_bytes() == content
+
+
+def test_unpadded_or_truncated_base64_tail_is_still_saved(tmp_path, monkeypatch):
+    """A missing "=" or a stray last character decodes like get_payload(decode=True)."""
+    monkeypatch.setattr(email_monitor, "SAVE_CHUNK_SIZE", 8)
+    content = b"id,amount\n20000,25.00\n"
+    encoded = base64.b64encode(content)
+    monitor = CSVEmailMonitor(tmp_path)
+
+    for payload in (encoded.rstrip(b"="), encoded + b"Q"):
+        decoded = b"".join(email_monitor._iter_decoded(payload, "base64"))
+        assert decoded == content
+
+    attachment = monitor.match_csv_attachment(FILENAME)
+    assert monitor.save_csv_file(attachment, encoded.rstrip(b"="), "base64").read_bytes() == content
+
+
+def test_prefix_guard_accepts_everything_the_pattern_does(tmp_path):
+    """The fast reject never drops a filename the regex would have matched."""
+    monitor = CSVEmailMonitor(tmp_path)
+    names = [
+        "invoice.pdf",
+        "Batch_.csv",
+        "BATCH_7_20250930181935_RESULT.CSV",
+        "batch_42_20250930181935_result (1).csv",
+        "Batch_1_2025093018193_result.csv",
+    ]
+
+    accepted = [name for name in names if monitor.match_csv_attachment(name)]
+
+    assert accepted == [name for name in names if CSVEmailMonitor.CSV_PATTERN.match(name)]
+    assert accepted == names[2:4]
+
+
+def test_timestamp_is_parsed_and_impossible_dates_rejected(tmp_path):
+    """The 14-digit stamp becomes a datetime; out-of-range fields skip the file."""
+    monitor = CSVEmailMonitor(tmp_path)
+
+    assert monitor.match_csv_attachment(FILENAME).timestamp == datetime(2025, 9, 30, 18, 19, 35)
+    assert monitor.match_csv_attachment("Batch_20000_20251330181935_result.csv") is None
@@ -217,3 +217,26 @@ def test_create_contract_link_without_email(client, auth_headers, dummy_jotform:
     assert len(dummy_jotform.email_calls) == 0
     assert len(dummy_jotform.link_calls) == 1
 
+
+
+def test_send_contract_rejects_invalid_email(client, auth_headers, dummy_jotform: DummyJotForm):
+    """Malformed email addresses are rejected before JotForm is contacted."""
+    payload = {
+        "customerName": "Jamie Carroll",
+        "email": "not-an-email",
+        "phone": "+17705551234",
+        "address": "592 Shannon Dr",
+        "city": "Marietta",
+        "state": "GA",
+        "postalCode": "30066",
+    }
+
+    response = client.post(
+        "/tools/onboarding/send-contract",
+        json=payload,
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 422
+    assert len(dummy_jotform.email_calls) == 0
+    assert len(dummy_jotform.link_calls) == 0
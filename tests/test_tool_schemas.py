@@ -0,0 +1,141 @@
+"""Tests for tool parameter schemas."""
+
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+from pydantic import BaseModel, ValidationError
+
+from src.schemas.tools import (
+    AliasedModel,
+    CustomerDeliveryRef,
+    CustomerDetailsTool,
+    CustomerOptionalDeliveryRef,
+    CustomerRef,
+    DeliveryScheduleTool,
+    DeliverySummaryTool,
+    InvoiceHistoryTool,
+    InvoiceDetailTool,
+    SendContractTool,
+    tool_adapter,
+    tool_json_schema,
+    tool_schema,
+)
+
+
+def test_camel_and_snake_case_inputs_are_accepted():
+    """Validation aliases accept both camelCase and snake_case keys."""
+    camel = CustomerDetailsTool.model_validate({"customerId": "002864"})
+    snake = CustomerDetailsTool.model_validate({"customer_id": "002864"})
+
+    assert camel.customer_id == snake.customer_id == "002864"
+
+
+def test_serialization_uses_camel_case_aliases():
+    """Dumping by alias emits the camelCase names Vapi sends."""
+    params = DeliverySummaryTool.model_validate(
+        {"customer_id": "002864", "includeDefaults": False}
+    )
+
+    dumped = params.model_dump(by_alias=True)
+    assert dumped["customerId"] == "002864"
+    assert dumped["includeDefaults"] is False
+
+
+def test_tool_adapter_is_cached_per_model():
+    """The same TypeAdapter instance is reused for a given model."""
+    adapter = tool_adapter(CustomerDetailsTool)
+
+    assert adapter is tool_adapter(CustomerDetailsTool)
+    params = adapter.validate_python({"customerId": "002864"})
+    assert isinstance(params, CustomerDetailsTool)
+    assert params.customer_id == "002864"
+
+
+def test_from_trusted_round_trips_a_validated_payload():
+    """Trusted construction rebuilds an equal model from its own dump."""
+    params = DeliverySummaryTool.model_validate({"customerId": "002864", "deliveryId": "002864000"})
+
+    rebuilt = DeliverySummaryTool.from_trusted(params.model_dump(by_alias=True))
+    assert rebuilt == params
+
+
+def test_tool_parameters_are_frozen():
+    """Validated tool parameters cannot be reassigned."""
+    params = CustomerDetailsTool.model_validate({"customerId": "002864"})
+
+    with pytest.raises(ValidationError):
+        params.customer_id = "999999"
+
+
+def test_invoice_date_is_parsed_to_a_date():
+    """Invoice dates are parsed once at the boundary, including datetime strings."""
+    params = InvoiceDetailTool.model_validate(
+        {"customerId": "002864", "invoiceKey": "RT__7AG12BXGH", "invoiceDate": "2025-09-30T00:00:00-04:00"}
+    )
+
+    assert params.invoice_date == date(2025, 9, 30)
+
+
+def test_tool_schema_is_cached_and_uses_aliases():
+    """JSON schemas are computed once per model and keyed by camelCase names."""
+    schema = tool_schema(InvoiceDetailTool)
+
+    assert schema is tool_schema(InvoiceDetailTool)
+    assert "invoiceDate" in schema["properties"]
+    assert schema["properties"]["invoiceDate"]["format"] == "date"
+
+
+def test_aliased_model_stays_a_flat_base():
+    """The shared base inherits BaseModel directly and declares no validators."""
+    assert AliasedModel.__bases__ == (BaseModel,)
+    decorators = AliasedModel.__pydantic_decorators__
+    assert not decorators.field_validators
+    assert not decorators.model_validators
+    assert not decorators.field_serializers
+    assert not decorators.model_serializers
+
+
+def test_send_contract_field_normalisers():
+    """Phone numbers gain a '+' prefix and product lists accept comma strings."""
+    params = SendContractTool.model_validate(
+        {
+            "customerName": "Jamie Carroll",
+            "email": "jamie@example.com",
+            "phone": "(770) 555-1234",
+            "address": "592 Shannon Dr",
+            "city": "Marietta",
+            "state": "GA",
+            "postal_code": "30066",
+            "products_of_interest": "5-Gallon Bottles, , Water Dispenser Rental",
+        }
+    )
+
+    assert params.phone == "+7705551234"
+    assert params.products_of_interest == ["5-Gallon Bottles", "Water Dispenser Rental"]
+
+
+def test_shared_bases_supply_customer_and_delivery_fields():
+    """Tools inherit the aliased customer/delivery fields from the shared bases."""
+    assert issubclass(CustomerDetailsTool, CustomerRef)
+    assert issubclass(DeliveryScheduleTool, CustomerOptionalDeliveryRef)
+    assert issubclass(InvoiceHistoryTool, CustomerDeliveryRef)
+
+    schedule = DeliveryScheduleTool.model_validate({"customer_id": "002864"})
+    assert schedule.delivery_id is None
+
+    with pytest.raises(ValidationError):
+        InvoiceHistoryTool.model_validate({"customerId": "002864"})
+    history = InvoiceHistoryTool.model_validate({"customerId": "002864", "delivery_id": "002864000"})
+    assert history.delivery_id == "002864000"
+
+
+def test_tool_json_schema_by_function_name():
+    """Function names resolve to the per-model cached schema."""
+    schema = tool_json_schema("invoice_detail")
+
+    assert schema is tool_schema(InvoiceDetailTool)
+    assert tool_json_schema("products") is tool_json_schema("products_catalog")
+    with pytest.raises(KeyError):
+        tool_json_schema("not_a_tool")
@@ -0,0 +1,59 @@
+"""Tests for Vapi function-call routing."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.api.vapi.webhooks_handler import (
+    FUNCTION_HANDLERS,
+    function_call_counts,
+    route_function_call,
+)
+from src.schemas.tools import TOOL_MODELS
+
+
+@pytest.mark.asyncio
+async def test_route_function_call_validates_and_dispatches():
+    """Parameters are validated with the routed model before the handler runs."""
+    fontis = MagicMock()
+    fontis.get_customer_details = AsyncMock(return_value={"success": True})
+    before = function_call_counts["customer_details"]
+
+    result = await route_function_call(
+        function_name="customer_details",
+        parameters={"customerId": "002864"},
+        call_id="call-1",
+        fontis=fontis,
+    )
+
+    assert result == {"success": True}
+    assert function_call_counts["customer_details"] == before + 1
+    fontis.get_customer_details.assert_awaited_once_with(
+        customer_id="002864",
+        include_inactive=False,
+    )
+
+
+@pytest.mark.asyncio
+async def test_route_function_call_rejects_unknown_function():
+    """Unknown function names raise instead of silently succeeding."""
+    with pytest.raises(ValueError, match="Unknown function"):
+        await route_function_call(
+            function_name="not_a_tool",
+            parameters={},
+            call_id="call-1",
+            fontis=MagicMock(),
+        )
+
+
+def test_every_handler_has_a_parameter_model():
+    """The handler table and the schema registry cover the same functions."""
+    assert FUNCTION_HANDLERS.keys() == TOOL_MODELS.keys()
+
+
+def test_products_aliases_share_a_route():
+    """Both product catalog names dispatch to the same model and handler."""
+    assert TOOL_MODELS["products"] is TOOL_MODELS["products_catalog"]
+    assert FUNCTION_HANDLERS["products"] is FUNCTION_HANDLERS["products_catalog"]
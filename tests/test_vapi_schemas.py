@@ -0,0 +1,53 @@
+"""Tests for Vapi webhook schemas."""
+
+from __future__ import annotations
+
+import pytest
+from pydantic import ValidationError
+
+from src.schemas.vapi import VapiToolCall, VapiWebhookEvent
+
+
+def test_call_payload_keeps_unknown_keys():
+    """Typed call fields validate while the rest of the Vapi payload passes through."""
+    event = VapiWebhookEvent.model_validate(
+        {
+            "type": "call-end",
+            "callId": "call-1",
+            "call": {
+                "id": "call-1",
+                "status": "ended",
+                "customer": {"number": "+16785550100"},
+                "costBreakdown": {"total": 0.12},
+            },
+        }
+    )
+
+    assert event.call["status"] == "ended"
+    assert event.call["customer"]["number"] == "+16785550100"
+    assert event.call["costBreakdown"] == {"total": 0.12}
+
+
+def test_event_keeps_top_level_metadata():
+    """Event-level metadata is an extra field the call handlers still read."""
+    event = VapiWebhookEvent.model_validate(
+        {"type": "call-start", "metadata": {"customer_id": "002864"}}
+    )
+
+    assert event.metadata == {"customer_id": "002864"}
+
+
+def test_tool_call_type_is_function_only():
+    """Tool calls accept only the "function" type."""
+    call = VapiToolCall.model_validate({"id": "tc-1", "function": {"name": "customer_details"}})
+    assert call.type == "function"
+
+    with pytest.raises(ValidationError):
+        VapiToolCall.model_validate({"id": "tc-1", "type": "other", "function": {}})
+
+
+def test_unrouted_event_types_still_validate():
+    """Event types outside the routed set parse instead of hitting the fallback path."""
+    event = VapiWebhookEvent.model_validate({"type": "status-update", "callId": "call-1"})
+
+    assert event.type == "status-update"